@@ -34,4 +34,5 @@ export const PROFESSORS_ENDPOINT = (department: string) =>
   `/professors?department=${encodeURIComponent(department)}`;
 
 // ============ CHATBOT ENDPOINTS ============
-export const CHATBOT_ENDPOINT = '/chat';
\ No newline at end of file
+export const CHATBOT_ENDPOINT = '/chat';
+export const CHATBOT_STREAM_ENDPOINT = '/chat/stream';
\ No newline at end of file
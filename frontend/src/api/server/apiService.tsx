@@ -1,4 +1,4 @@
-import { LOGIN_ENDPOINT, SIGNUP_ENDPOINT, GET_STUDENT_PROFILE_ENDPOINT, UPDATE_STUDENT_PROFILE_ENDPOINT, GET_SPECIALIZATIONS_ENDPOINT, GET_STUDY_YEARS_ENDPOINT, GET_GROUPS_ENDPOINT, GET_SUBGROUPS_ENDPOINT, GET_USER_SUBGROUP_GROUP_ENDPOINT, GET_COURSES_BY_STUDENT_ENDPOINT, GET_AVAILABLE_COURSES_ENDPOINT, GET_WANTED_COURSES_ENDPOINT, UPDATE_COURSE_SUBSCRIPTIONS_ENDPOINT, RESET_COURSE_SUBSCRIPTIONS_ENDPOINT, GET_ACADEMIC_SCHEDULE_ENDPOINT, GET_ROOMS_ENDPOINT, PROFESSORS_ENDPOINT, CHATBOT_ENDPOINT } from "../endpoints";
+import { LOGIN_ENDPOINT, SIGNUP_ENDPOINT, GET_STUDENT_PROFILE_ENDPOINT, UPDATE_STUDENT_PROFILE_ENDPOINT, GET_SPECIALIZATIONS_ENDPOINT, GET_STUDY_YEARS_ENDPOINT, GET_GROUPS_ENDPOINT, GET_SUBGROUPS_ENDPOINT, GET_USER_SUBGROUP_GROUP_ENDPOINT, GET_COURSES_BY_STUDENT_ENDPOINT, GET_AVAILABLE_COURSES_ENDPOINT, GET_WANTED_COURSES_ENDPOINT, UPDATE_COURSE_SUBSCRIPTIONS_ENDPOINT, RESET_COURSE_SUBSCRIPTIONS_ENDPOINT, GET_ACADEMIC_SCHEDULE_ENDPOINT, GET_ROOMS_ENDPOINT, PROFESSORS_ENDPOINT, CHATBOT_ENDPOINT, CHATBOT_STREAM_ENDPOINT } from "../endpoints";
 import { AcademicSchedule,Professor, CompleteStudentData, Course, Group, ResponseCache, Room, Student, StudyOptions, StudyYear, Subgroup } from "../../common";
 
 
@@ -604,6 +604,63 @@ async chatWithBot(message: string): Promise<string> {
     return 'Eroare la comunicarea cu serverul.';
   }
 }
+
+/**
+ * Trimite un mesaj către chatbot și primește răspunsul pe bucăți (Server-Sent Events)
+ * @param message - mesajul utilizatorului
+ * @param onDelta - apelată cu textul primit până acum, la fiecare fragment nou
+ * @returns răspunsul complet generat de AI
+ */
+async chatWithBotStream(message: string, onDelta: (text: string) => void): Promise<string> {
+  const response = await fetch(`${this.baseUrl}${CHATBOT_STREAM_ENDPOINT}`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+    body: JSON.stringify({ message })
+  });
+
+  const contentType = response.headers.get('Content-Type') || '';
+  if (!response.body || !contentType.includes('text/event-stream')) {
+    const data = await response.json();
+    throw new Error(data?.message || 'Chatbot: răspuns invalid');
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let reply = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    const events = buffer.split('\n\n');
+    buffer = events.pop() || '';
+
+    for (const rawEvent of events) {
+      let eventName = 'message';
+      let data = '';
+      for (const line of rawEvent.split('\n')) {
+        if (line.startsWith('event:')) eventName = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      }
+      const payload = data ? JSON.parse(data) : {};
+
+      if (eventName === 'error') {
+        throw new Error(payload.message || 'Eroare la generarea răspunsului');
+      }
+      if (eventName === 'done') {
+        return reply;
+      }
+      if (payload.delta) {
+        reply += payload.delta;
+        onDelta(reply);
+      }
+    }
+  }
+
+  return reply;
+}
 }
 
 // Create and export a singleton instance
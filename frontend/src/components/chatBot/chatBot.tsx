@@ -23,7 +23,10 @@ const ChatBot: React.FC = () => {
   setLoading(true);
 
   try {
-    const reply = await apiService.chatWithBot(input);
+    const reply = await apiService.chatWithBotStream(input, (partial) => {
+      setLoading(false);
+      setMessages([...newMessages, { sender: 'bot', text: partial }]);
+    });
     setMessages([...newMessages, { sender: 'bot', text: reply }]);
   } catch {
     setMessages([...newMessages, { sender: 'bot', text: 'Eroare la comunicarea cu serverul.' }]);
@@ -0,0 +1,125 @@
+"""
+Punct de intrare ASGI pentru server.
+Rutele care asteapta dupa servicii externe (/chat si /chat/stream, care apeleaza modelul de limbaj) sunt
+corutine Starlette: o cerere care asteapta modelul nu mai tine ocupat un fir de executie, deci un singur
+proces poate servi mult mai multe conversatii simultane. Toate celelalte rute sunt servite in continuare
+de aplicatia Flask, montata prin a2wsgi si rulata in pool-ul de fire al adaptorului.
+
+Utilizare (din directorul server/):
+    uvicorn server.asgi:app --host 0.0.0.0 --port 8000
+
+Modul WSGI (python -m server.run) ramane disponibil si are acelasi comportament.
+"""
+from contextlib import aclosing, asynccontextmanager
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+from server.app import app_manager
+from server.common.common_constants import HTTP_OK_CODE, HTTP_ERROR_CODE
+from server.common.logger import setup_logger
+from server.routes.chatbot_routes import build_chat_messages, chat_client, format_sse
+from server.services.async_chat_completion_client import AsyncChatCompletionClient
+from server.services.chat_response_cache import chat_response_cache
+
+logger = setup_logger(__name__)
+
+flask_app = app_manager.create_app()
+async_chat_client = AsyncChatCompletionClient(chat_client)
+
+
+def json_response(message, data=None, status_code=HTTP_OK_CODE) -> JSONResponse:
+    """
+    Acelasi format ca handle_response: {'message', 'data', 'status'}, cu HTTP 200.
+    """
+    return JSONResponse({'message': message, 'data': data, 'status': status_code})
+
+
+async def read_user_message(request) -> str:
+    try:
+        data = await request.json()
+    except ValueError:
+        return ""
+    return (data or {}).get("message", "").strip()
+
+
+async def chat_with_bot(request):
+    try:
+        user_message = await read_user_message(request)
+        if not user_message:
+            return json_response(message="Mesajul este gol", status_code=HTTP_ERROR_CODE)
+
+        reply = chat_response_cache.get(user_message)
+        if reply is None:
+            # Lista profesorilor este citita din baza de date doar la schimbarea versiunii datelor
+            messages = await run_in_threadpool(build_chat_messages, user_message, app_manager.Session)
+            reply = await async_chat_client.complete(messages, temperature=0.7)
+            chat_response_cache.put(user_message, reply)
+
+        return json_response(message="Raspuns generat cu succes", data={"reply": reply}, status_code=HTTP_OK_CODE)
+
+    except Exception as e:
+        logger.error(f"Eroare OpenAI Chatbot: {str(e)}")
+        return json_response(message=f"Eroare la generarea raspunsului: {str(e)}", status_code=HTTP_ERROR_CODE)
+
+
+async def chat_with_bot_stream(request):
+    try:
+        user_message = await read_user_message(request)
+        if not user_message:
+            return json_response(message="Mesajul este gol", status_code=HTTP_ERROR_CODE)
+
+        cached_reply = chat_response_cache.get(user_message)
+        messages = None
+        if cached_reply is None:
+            messages = await run_in_threadpool(build_chat_messages, user_message, app_manager.Session)
+
+    except Exception as e:
+        logger.error(f"Eroare OpenAI Chatbot: {str(e)}")
+        return json_response(message=f"Eroare la generarea raspunsului: {str(e)}", status_code=HTTP_ERROR_CODE)
+
+    async def generate():
+        if cached_reply is not None:
+            yield format_sse({"delta": cached_reply})
+            yield format_sse({}, event="done")
+            return
+        try:
+            reply = []
+            async with aclosing(async_chat_client.stream(messages, temperature=0.7)) as deltas:
+                async for delta in deltas:
+                    reply.append(delta)
+                    yield format_sse({"delta": delta})
+            chat_response_cache.put(user_message, "".join(reply).strip())
+            yield format_sse({}, event="done")
+        except Exception as e:
+            logger.error(f"Eroare OpenAI Chatbot (stream): {str(e)}")
+            yield format_sse({"message": f"Eroare la generarea raspunsului: {str(e)}"}, event="error")
+
+    return StreamingResponse(generate(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await async_chat_client.start()
+    logger.info("Aplicatia ASGI a pornit (rutele de chat sunt asincrone)")
+    try:
+        yield
+    finally:
+        await async_chat_client.aclose()
+
+
+app = Starlette(
+    routes=[
+        Route('/chat', chat_with_bot, methods=['POST']),
+        Route('/chat/stream', chat_with_bot_stream, methods=['POST']),
+        Mount('/', app=WSGIMiddleware(flask_app)),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])],
+    lifespan=lifespan,
+)
@@ -0,0 +1,94 @@
+"""
+Test de incarcare pentru ruta /chat: trimite cereri simultane si raporteaza debitul, latentele si erorile,
+pentru a compara cate conversatii poate servi un singur proces in modul WSGI si in modul ASGI.
+
+Fiecare cerere are cuvinte aleatorii in mesaj, ca raspunsurile sa nu vina din cache-ul chatbot-ului.
+Modelul este inlocuit de chat_stub_server, cu o latenta fixa; limita clientului de chat trebuie marita
+ca sa nu fie ea cea masurata.
+
+Utilizare (din directorul server/, fiecare comanda in alt terminal):
+    python -m server.benchmarks.chat_stub_server --latency 1
+    export OPENAI_API_URL=http://127.0.0.1:8099/v1/chat/completions CHATBOT_MAX_CONCURRENCY=512
+    # fara acces la site: (cd server/benchmarks/fixtures/site && python -m http.server 8098)
+    # export SCRAPER_BASE_URL=http://127.0.0.1:8098
+    gunicorn -w 1 --threads 8 -b 127.0.0.1:5000 'server.app:create_app()'      # WSGI, un proces
+    uvicorn server.asgi:app --workers 1 --port 8000                              # ASGI, un proces
+    python -m server.benchmarks.chat_load_test --url http://127.0.0.1:5000/chat \\
+        --url http://127.0.0.1:8000/chat [--concurrency 128] [--requests 512]
+"""
+import argparse
+import random
+import statistics
+import string
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MESSAGE = "Caut un coordonator pentru licenta in domeniul"
+
+
+def random_message() -> str:
+    words = ("".join(random.choices(string.ascii_lowercase, k=8)) for _ in range(4))
+    return f"{MESSAGE} {' '.join(words)}"
+
+
+def run(url, concurrency, total, timeout) -> dict:
+    http_session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    http_session.mount("http://", adapter)
+    http_session.mount("https://", adapter)
+
+    def send(_):
+        start = time.perf_counter()
+        try:
+            response = http_session.post(url, json={"message": random_message()}, timeout=timeout)
+            ok = response.status_code == 200 and response.json().get("status") == 200
+        except (requests.RequestException, ValueError):
+            ok = False
+        return ok, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(seconds for ok, seconds in results if ok)
+    errors = sum(1 for ok, _ in results if not ok)
+
+    def percentile(fraction):
+        return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] if latencies else 0.0
+
+    return {
+        "url": url,
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput": round((total - errors) / elapsed, 2),
+        "p50": round(statistics.median(latencies), 3) if latencies else 0.0,
+        "p95": round(percentile(0.95), 3),
+        "p99": round(percentile(0.99), 3),
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--url", action="append", required=True, help="URL-ul rutei /chat (se poate repeta)")
+    argument_parser.add_argument("--concurrency", type=int, default=128, help="numarul de cereri simultane")
+    argument_parser.add_argument("--requests", type=int, default=512, help="numarul total de cereri per URL")
+    argument_parser.add_argument("--timeout", type=float, default=120, help="timeout-ul unei cereri (s)")
+    args = argument_parser.parse_args()
+
+    reports = [run(url, args.concurrency, args.requests, args.timeout) for url in args.url]
+
+    print(f"{'url':<40}{'cereri/s':>10}{'p50 (s)':>10}{'p95 (s)':>10}{'p99 (s)':>10}{'erori':>8}")
+    for report in reports:
+        print(f"{report['url']:<40}{report['throughput']:>10.2f}{report['p50']:>10.3f}{report['p95']:>10.3f}"
+              f"{report['p99']:>10.3f}{report['errors']:>8}")
+    return 0 if all(report["errors"] == 0 for report in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
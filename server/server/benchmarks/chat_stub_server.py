@@ -0,0 +1,143 @@
+"""
+Server local care imita API-ul de chat completions folosit de ruta /chat, pentru dezvoltare si
+masuratori fara acces la OpenAI. Raspunde cu primii profesori din lista primita in prompt,
+deci permite si verificarea listei de candidati aleasa de ProfessorIndex.
+
+Utilizare (din directorul server/):
+    python -m server.benchmarks.chat_stub_server [--port 8099] [--latency 0.5] [--token-delay 0.05]
+        [--error-status 503 --error-rate 0.3] [--error-count 2] [--retry-after 1] [--stream-abort-after 3]
+
+Cererile cu "stream": true primesc raspunsul ca Server-Sent Events, cate un cuvant per eveniment.
+    OPENAI_API_URL=http://127.0.0.1:8099/v1/chat/completions flask --app server.app:create_app run
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROFESSORS_HEADER = "Profesori disponibili:"
+
+
+def build_reply(prompt: str) -> str:
+    lines = prompt.split(PROFESSORS_HEADER, 1)[-1].strip().splitlines()
+    names = [line.split("|")[0].strip() for line in lines if "|" in line][:3]
+    return "; ".join(f"{name} - potrivire dupa domenii si materii" for name in names) or "Nu am gasit profesori."
+
+
+class ChatStubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    token_delay = 0.0
+    error_status = 503
+    error_rate = 0.0
+    error_count = 0
+    retry_after = None
+    stream_abort_after = None
+    requests_served = 0
+    lock = threading.Lock()
+    # Daca este o lista, cererile primite sunt adaugate in ea (folosit de teste)
+    received = None
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.received is not None:
+            self.received.append(payload)
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        time.sleep(self.latency)
+
+        with self.lock:
+            position = type(self).requests_served
+            type(self).requests_served += 1
+        if position < self.error_count or random.random() < self.error_rate:
+            self.send_response(self.error_status)
+            if self.retry_after is not None:
+                self.send_header("Retry-After", str(self.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if payload.get("stream"):
+            self.stream_reply(payload.get("model"), build_reply(prompt))
+            return
+
+        body = json.dumps({
+            "object": "chat.completion",
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": build_reply(prompt)},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 0},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reply(self, model, reply):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        for position, word in enumerate(reply.split(" ")):
+            if position == self.stream_abort_after:
+                # Conexiunea se inchide fara [DONE] si fara chunk-ul final, ca la o cadere a serviciului
+                self.close_connection = True
+                return
+            chunk = {"object": "chat.completion.chunk", "model": model,
+                     "choices": [{"index": 0, "delta": {"content": word if position == 0 else f" {word}"}}]}
+            self.write_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            time.sleep(self.token_delay)
+        self.write_chunk(b"data: [DONE]\n\n")
+        self.write_chunk(b"")
+
+    def write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ChatStubServer(ThreadingHTTPServer):
+    # Coada implicita de conexiuni (5) pierde conexiuni cand testul de incarcare deschide sute deodata,
+    # iar stub-ul ar deveni el insusi limita masurata
+    request_queue_size = 1024
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=8099)
+    argument_parser.add_argument("--latency", type=float, default=0.0, help="intarziere simulata a modelului (s)")
+    argument_parser.add_argument("--token-delay", type=float, default=0.0,
+                                 help="intarzierea dintre fragmentele unui raspuns cu streaming (s)")
+    argument_parser.add_argument("--error-status", type=int, default=503, help="codul HTTP al raspunsurilor esuate")
+    argument_parser.add_argument("--error-rate", type=float, default=0.0, help="fractiunea de cereri care esueaza")
+    argument_parser.add_argument("--error-count", type=int, default=0, help="numarul primelor cereri care esueaza")
+    argument_parser.add_argument("--retry-after", help="valoarea header-ului Retry-After al raspunsurilor esuate")
+    argument_parser.add_argument("--stream-abort-after", type=int,
+                                 help="inchide raspunsurile cu streaming dupa acest numar de fragmente")
+    args = argument_parser.parse_args()
+
+    ChatStubHandler.latency = args.latency
+    ChatStubHandler.token_delay = args.token_delay
+    ChatStubHandler.error_status = args.error_status
+    ChatStubHandler.error_rate = args.error_rate
+    ChatStubHandler.error_count = args.error_count
+    ChatStubHandler.retry_after = args.retry_after
+    ChatStubHandler.stream_abort_after = args.stream_abort_after
+    server = ChatStubServer((args.host, args.port), ChatStubHandler)
+    print(f"Stub chat completions pe http://{args.host}:{args.port}/v1/chat/completions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
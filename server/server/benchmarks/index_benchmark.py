@@ -0,0 +1,149 @@
+"""
+Compara planurile de executie ale interogarilor frecvente pe courses, student_courses, subgroup_schedules
+si professors fara si cu indecsii adaugati de migrari (server/database_connection/migrations.py).
+
+Pentru varianta "fara indecsi", indecsii sunt stersi intr-o tranzactie care se anuleaza la final, deci
+baza de date ramane neschimbata; DROP INDEX blocheaza insa tabelele pe durata masuratorii, asa ca
+scriptul trebuie rulat doar pe o baza de date de test, populata (de exemplu dupa scraper_benchmark run).
+
+Utilizare (din directorul server/):
+    python -m server.benchmarks.index_benchmark --database-url postgresql://... [--verbose]
+"""
+import argparse
+import os
+import sys
+
+from sqlalchemy import create_engine, text
+
+INDEXES = [
+    "uq_courses_identity",
+    "ix_courses_study_year_id",
+    "ix_courses_subgroup_id",
+    "ix_courses_professor_id",
+    "ix_courses_group_id_without_subgroup",
+    "ix_courses_study_year_id_without_group",
+    "ix_student_courses_course_id",
+    "ix_subgroup_schedules_course_id",
+    "ix_professors_last_name_unaccent",
+]
+
+QUERIES = {
+    "cursuri subgrupa": "SELECT * FROM courses WHERE subgroup_id = :subgroup_id",
+    "cursuri grupa fara subgrupa": "SELECT * FROM courses WHERE group_id = :group_id AND subgroup_id IS NULL",
+    "cursuri an fara grupa": "SELECT * FROM courses WHERE study_year_id = :study_year_id AND group_id IS NULL",
+    "cursuri an de studiu": "SELECT * FROM courses WHERE study_year_id = :study_year_id",
+    "curs dupa identitate": """
+        SELECT * FROM courses
+        WHERE name = :name AND professor_id = :professor_id AND course_type = :course_type
+          AND coalesce(study_year_id, '00000000-0000-0000-0000-000000000000'::uuid)
+              = coalesce(:study_year_id, '00000000-0000-0000-0000-000000000000'::uuid)
+          AND coalesce(group_id, '00000000-0000-0000-0000-000000000000'::uuid)
+              = coalesce(:group_id, '00000000-0000-0000-0000-000000000000'::uuid)
+          AND coalesce(subgroup_id, '00000000-0000-0000-0000-000000000000'::uuid)
+              = coalesce(:subgroup_id, '00000000-0000-0000-0000-000000000000'::uuid)
+          AND coalesce(day, '') = coalesce(:day, '')
+          AND coalesce(start_time, '00:00'::time) = coalesce(:start_time, '00:00'::time)
+          AND coalesce(end_time, '00:00'::time) = coalesce(:end_time, '00:00'::time)
+          AND coalesce(room_id, '00000000-0000-0000-0000-000000000000'::uuid)
+              = coalesce(:room_id, '00000000-0000-0000-0000-000000000000'::uuid)
+          AND coalesce(frequency, -1) = coalesce(:frequency, -1)
+    """,
+    "materiile unui profesor": "SELECT DISTINCT name FROM courses WHERE professor_id = :professor_id",
+    "studenti pe curs": """
+        SELECT course_id, count(student_id) FROM student_courses
+        WHERE course_id = ANY(:course_ids) GROUP BY course_id
+    """,
+    "stergere orar pentru cursuri": "SELECT * FROM subgroup_schedules WHERE course_id = ANY(:course_ids)",
+    "profesor dupa nume": """
+        SELECT * FROM professors
+        WHERE f_unaccent(last_name) = f_unaccent(:last_name)
+          AND f_unaccent(first_name) ILIKE f_unaccent(:first_name || '%')
+    """,
+}
+
+
+def sample_parameters(connection) -> dict:
+    """
+    Alege valori reale din baza de date pentru parametrii interogarilor (un curs de seminar/laborator al unei subgrupe).
+    """
+    course = connection.execute(text(
+        "SELECT * FROM courses ORDER BY subgroup_id IS NULL, course_id LIMIT 1")).mappings().first()
+    if course is None:
+        raise Exception("Tabela courses este goala; populati baza de date de test inainte de masuratoare.")
+    group_id = course["group_id"] or connection.execute(text(
+        "SELECT group_id FROM groups WHERE study_year_id = :study_year_id LIMIT 1"),
+        {"study_year_id": course["study_year_id"]}).scalar()
+    course_ids = [row[0] for row in connection.execute(text("SELECT course_id FROM courses LIMIT 50"))]
+    professor = connection.execute(text(
+        "SELECT first_name, last_name FROM professors WHERE professor_id = :professor_id"),
+        {"professor_id": course["professor_id"]}).mappings().first()
+    return {**course, "group_id": group_id, "course_ids": course_ids, **professor}
+
+
+def explain(connection, parameters, verbose) -> dict:
+    results = {}
+    for label, query in QUERIES.items():
+        plan = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}"), parameters).scalar()[0]
+        results[label] = plan
+        if verbose:
+            for line in connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"), parameters):
+                print(f"    {line[0]}")
+    return results
+
+
+def plan_summary(plan) -> str:
+    node = plan["Plan"]
+    while node.get("Plans") and node["Node Type"] in ("Aggregate", "Unique", "Sort", "HashAggregate"):
+        node = node["Plans"][0]
+    index = f" ({node['Index Name']})" if "Index Name" in node else ""
+    return f"{node['Node Type']}{index}"
+
+
+def run(database_url, verbose=False) -> int:
+    engine = create_engine(database_url)
+    with engine.connect() as connection:
+        parameters = sample_parameters(connection)
+        existing = {row[0] for row in connection.execute(
+            text("SELECT indexname FROM pg_indexes WHERE indexname = ANY(:names)"), {"names": INDEXES})}
+        missing = [name for name in INDEXES if name not in existing]
+        if missing:
+            print(f"Lipsesc indecsii {missing}; porniti aplicatia o data (migrarile) inainte de masuratoare.")
+            return 1
+        connection.commit()
+
+        transaction = connection.begin()
+        try:
+            for name in INDEXES:
+                connection.execute(text(f"DROP INDEX {name}"))
+            connection.execute(text("ANALYZE courses, student_courses, subgroup_schedules, professors"))
+            if verbose:
+                print("Fara indecsi:")
+            before = explain(connection, parameters, verbose)
+        finally:
+            transaction.rollback()
+
+        with connection.begin():
+            connection.execute(text("ANALYZE courses, student_courses, subgroup_schedules, professors"))
+        if verbose:
+            print("Cu indecsi:")
+        after = explain(connection, parameters, verbose)
+
+    print(f"{'interogare':<32}{'fara indecsi':>40}{'ms':>10}{'cu indecsi':>52}{'ms':>10}")
+    for label in QUERIES:
+        print(f"{label:<32}{plan_summary(before[label]):>40}{before[label]['Execution Time']:>10.3f}"
+              f"{plan_summary(after[label]):>52}{after[label]['Execution Time']:>10.3f}")
+    return 0
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL"))
+    argument_parser.add_argument("--verbose", action="store_true", help="afiseaza planurile complete")
+    args = argument_parser.parse_args()
+    if not args.database_url:
+        argument_parser.error("este necesar --database-url sau BENCHMARK_DATABASE_URL (o baza de date de test)")
+    return run(args.database_url, args.verbose)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Compara backend-urile de parsare a paginilor cu orare (html.parser si lxml).
+
+Verifica mai intai ca ambele produc exact aceleasi randuri pentru fiecare pagina salvata,
+apoi masoara timpul mediu de parsare per pagina.
+
+Utilizare (din directorul server/):
+    python -m server.benchmarks.parser_benchmark [director_pagini] [--repeat N]
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+from server.scraper.course_scrapper import CourseScrapper
+from server.scraper.timetable_parser import LxmlTimetableParser, SoupTimetableParser, lxml
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "timetables")
+
+
+def load_pages(directory) -> dict[str, str]:
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, encoding="utf-8") as page_file:
+            pages[os.path.basename(path)] = page_file.read()
+    return pages
+
+
+def check_parity(scrapers, pages) -> bool:
+    reference_name, reference = scrapers[0]
+    ok = True
+    for page_name, html in pages.items():
+        expected = reference.parse_tables(html, page_name)
+        for name, scraper in scrapers[1:]:
+            actual = scraper.parse_tables(html, page_name)
+            if actual != expected:
+                print(f"DIFERENTA {page_name}: {reference_name} != {name}")
+                ok = False
+        print(f"{page_name}: {len(expected)} grupe, {sum(len(rows or []) for _, rows in expected)} randuri")
+    return ok
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("directory", nargs="?", default=DEFAULT_FIXTURES_DIR)
+    argument_parser.add_argument("--repeat", type=int, default=20)
+    args = argument_parser.parse_args()
+
+    pages = load_pages(args.directory)
+    if not pages:
+        print(f"Nu exista pagini .html in {args.directory}")
+        return 1
+
+    backends = [SoupTimetableParser()]
+    if lxml is not None:
+        backends.append(LxmlTimetableParser())
+    else:
+        print("lxml nu este instalat, se testeaza doar html.parser")
+    scrapers = [(backend.name, CourseScrapper(None, parser=backend)) for backend in backends]
+
+    if not check_parity(scrapers, pages):
+        return 1
+
+    results = {}
+    for name, scraper in scrapers:
+        elapsed = timeit.timeit(lambda: [scraper.parse_tables(html, page) for page, html in pages.items()],
+                                number=args.repeat)
+        results[name] = elapsed / (args.repeat * len(pages))
+        print(f"{name:12} {results[name] * 1000:8.2f} ms/pagina")
+
+    baseline = results[SoupTimetableParser.name]
+    for name, per_page in results.items():
+        if name != SoupTimetableParser.name:
+            print(f"{name} este de {baseline / per_page:.1f}x mai rapid decat {SoupTimetableParser.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
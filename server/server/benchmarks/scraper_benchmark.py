@@ -0,0 +1,245 @@
+"""
+Benchmark offline pentru actualizarea completa a bazei de date (ScrapperManager._full_semester_update).
+
+Paginile site-ului (structura anului, profesori, legenda salilor, indexul specializarilor si toate
+paginile cu orare) sunt servite dintr-o copie salvata, printr-un server HTTP local, iar scraping-ul
+real ruleaza pe o baza de date Postgres de test. Pentru fiecare etapa se raporteaza durata,
+numarul de interogari SQL si varful de memorie.
+
+In fixtures/site este inclusa o copie redusa a site-ului (10 pagini cu orare, 3 departamente, legenda
+salilor si structura anului), ca run sa functioneze fara acces la retea; record o inlocuieste cu paginile
+actuale de pe site.
+
+Utilizare (din directorul server/):
+    python -m server.benchmarks.scraper_benchmark record [--fixtures DIR]
+    python -m server.benchmarks.scraper_benchmark run --database-url postgresql://... [--fixtures DIR]
+        [--json rezultate.json] [--baseline rezultate_anterioare.json] [--tolerance 0.2]
+
+ATENTIE: comanda run sterge si recreeaza toate tabelele din baza de date primita.
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "site")
+
+
+def fixture_path(fixtures_dir, url) -> str:
+    path = urlsplit(url).path
+    if path.endswith("/"):
+        path += "index.html"
+    return os.path.join(fixtures_dir, *path.strip("/").split("/"))
+
+
+def record(fixtures_dir):
+    """
+    Salveaza paginile folosite de actualizarea completa, cu aceeasi structura de cai ca pe site.
+    """
+    from bs4 import BeautifulSoup
+    from server.common.common_constants import SCRAPER_PROFESSORS_URLS, SCRAPER_TIMETABLE_URL
+    from server.scraper.http_client import create_http_session, fetch_text
+    from server.scraper.room_scraper import RoomScrapper
+    from server.scraper.structure_of_schedule_scrapper import StructureOfScheduleScrapper
+
+    http_session = create_http_session()
+    index_url = f"{SCRAPER_TIMETABLE_URL}/tabelar/index.html"
+    urls = [StructureOfScheduleScrapper(None).url, RoomScrapper(None).url, *SCRAPER_PROFESSORS_URLS, index_url]
+
+    index_table = BeautifulSoup(fetch_text(index_url, http_session), "html.parser").find("table")
+    for row in index_table.find_all("tr")[1:-1]:
+        for column in row.find_all("td")[1:]:
+            link = column.find("a")
+            if link and link.get("href"):
+                urls.append(f"{SCRAPER_TIMETABLE_URL}/tabelar/{link['href']}")
+
+    for url in dict.fromkeys(urls):
+        path = fixture_path(fixtures_dir, url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as page_file:
+            page_file.write(fetch_text(url, http_session))
+        print(f"{url} -> {os.path.relpath(path, fixtures_dir)}")
+    return 0
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(fixtures_dir) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=fixtures_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class StageRecorder:
+    """
+    Colecteaza, pentru fiecare etapa raportata de ScrapperManager, numarul de interogari si varful de memorie.
+    Etapele independente ruleaza in paralel, fiecare in thread-ul ei, deci etapa curenta este retinuta per thread.
+    Varful de memorie este masurat pentru intregul proces, asa ca pentru etapele paralele este comun.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.queries = {}
+        self.peak_memory = {}
+        self.lock = threading.Lock()
+
+    def on_query(self, *args):
+        current = getattr(self.local, "current", None)
+        if current:
+            with self.lock:
+                self.queries[current] = self.queries.get(current, 0) + 1
+
+    def on_stage(self, name, event):
+        if event == "start":
+            self.local.current = name
+            with self.lock:
+                self.queries[name] = 0
+            tracemalloc.reset_peak()
+        else:
+            self.peak_memory[name] = tracemalloc.get_traced_memory()[1]
+            self.local.current = None
+
+
+def prepare_database(engine):
+    from sqlalchemy import text
+    from server.models.base import Base
+    import server.models.academic_holiday, server.models.academic_schedule, server.models.course  # noqa: F401
+    import server.models.domain, server.models.group, server.models.professor  # noqa: F401
+    import server.models.professor_domain, server.models.room, server.models.specialization  # noqa: F401
+    import server.models.student, server.models.student_courses, server.models.study_year  # noqa: F401
+    import server.models.subgroup, server.models.subgroup_schedule  # noqa: F401
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+    from server.database_connection.migrations import run_migrations
+
+    Base.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+
+
+def run(fixtures_dir, database_url, json_path=None, baseline_path=None, tolerance=0.2):
+    if not os.path.exists(os.path.join(fixtures_dir, "files")):
+        print(f"Nu exista pagini salvate in {fixtures_dir}; rulati intai comanda record.")
+        return 1
+
+    fixture_server = start_fixture_server(fixtures_dir)
+    # Constantele scraper-elor sunt citite la import, deci mediul trebuie setat inainte de importuri
+    os.environ["SCRAPER_BASE_URL"] = f"http://127.0.0.1:{fixture_server.server_port}"
+    os.environ["SCRAPER_PAGE_CACHE_DIR"] = tempfile.mkdtemp(prefix="page_cache_")
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+    from server.common.common_constants import DB_SCRAPER_STATEMENT_TIMEOUT
+    from server.database_connection.db_connection import create_db_engine, get_pool_metrics
+    from server.scraper.scrapper_manager import ScrapperManager
+
+    engine = create_db_engine(database_url, statement_timeout=DB_SCRAPER_STATEMENT_TIMEOUT)
+    prepare_database(engine)
+
+    recorder = StageRecorder()
+    event.listen(engine, "before_cursor_execute", recorder.on_query)
+    manager = ScrapperManager(sessionmaker(bind=engine))
+    manager.stage_listener = recorder.on_stage
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = manager._full_semester_update()
+    finally:
+        total = time.perf_counter() - start
+        tracemalloc.stop()
+        fixture_server.shutdown()
+
+    if result["status"] != "updated":
+        print(f"Actualizarea a esuat: {result}")
+        return 1
+
+    report = {
+        stage: {
+            "seconds": seconds,
+            "queries": recorder.queries.get(stage, 0),
+            "peak_mb": round(recorder.peak_memory.get(stage, 0) / 2 ** 20, 2),
+        }
+        for stage, seconds in manager.stage_timings.items()
+    }
+    report["total"] = {"seconds": round(total, 3), "queries": sum(recorder.queries.values()),
+                       "peak_mb": max((stage["peak_mb"] for stage in report.values()), default=0)}
+
+    print(f"{'etapa':<12}{'timp (s)':>10}{'interogari':>12}{'memorie (MB)':>14}")
+    for stage, values in report.items():
+        print(f"{stage:<12}{values['seconds']:>10.3f}{values['queries']:>12}{values['peak_mb']:>14.2f}")
+    print(f"Calea critica: {' -> '.join(result['critical_path']['stages'])} ({result['critical_path']['seconds']}s)")
+    print(f"Pagini cu orare: {result['timings']}")
+    print(f"Cursuri: {result['courses']}")
+    pool = get_pool_metrics(engine)
+    print(f"Pool: maxim {pool['peak_checked_out']} conexiuni folosite simultan (saturatie {pool['peak_saturation']}), "
+          f"{pool['checkouts']} preluari, asteptare totala {pool['checkout_wait']['sum']}s, {pool['timeouts']} timeout-uri")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as json_file:
+            json.dump(report, json_file, indent=2)
+
+    if baseline_path:
+        return compare(report, baseline_path, tolerance)
+    return 0
+
+
+def compare(report, baseline_path, tolerance) -> int:
+    """
+    Compara rezultatele cu o rulare anterioara; intoarce 1 daca o etapa a devenit mai lenta
+    sau face mai multe interogari decat permite toleranta.
+    """
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+
+    regressions = []
+    for stage, values in report.items():
+        previous = baseline.get(stage)
+        if not previous:
+            continue
+        for metric in ("seconds", "queries"):
+            if previous[metric] and values[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{stage}.{metric}: {previous[metric]} -> {values[metric]}")
+
+    for regression in regressions:
+        print(f"REGRESIE {regression}")
+    return 1 if regressions else 0
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = argument_parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subcommands.add_parser("record", help="salveaza paginile de pe site")
+    record_parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+
+    run_parser = subcommands.add_parser("run", help="ruleaza actualizarea completa pe paginile salvate")
+    run_parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    run_parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL"))
+    run_parser.add_argument("--json")
+    run_parser.add_argument("--baseline")
+    run_parser.add_argument("--tolerance", type=float, default=0.2)
+
+    args = argument_parser.parse_args()
+    if args.command == "record":
+        return record(args.fixtures)
+    if not args.database_url:
+        argument_parser.error("este necesar --database-url sau BENCHMARK_DATABASE_URL (o baza de date de test)")
+    return run(args.fixtures, args.database_url, args.json, args.baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
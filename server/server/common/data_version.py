@@ -0,0 +1,120 @@
+import threading
+import time
+import uuid
+
+from sqlalchemy import text
+
+from server.common.common_constants import DATA_VERSION_TTL
+from server.common.logger import setup_logger
+
+"""
+Versiunea datelor de referinta (specializari, ani de studiu, grupe, subgrupe, sali, profesori).
+Aceste date se schimba doar cand ruleaza ScrapperManager, care apeleaza bump_data_version() in aceeasi
+tranzactie in care scrie datele noi. Cache-urile compara versiunea lor cu get_data_version().
+
+Versiunea este randul unic din tabela data_version (migrarea 0006), deci este aceeasi in toate procesele
+care folosesc baza de date (workerii gunicorn/uvicorn, scheduler-ul). Fiecare proces o citeste cel mult o
+data la DATA_VERSION_TTL secunde (implicit 60), indiferent de numarul de cereri, inclusiv cele care primesc 304.
+Procesul care scrie datele (bump_data_version) isi invalideaza imediat versiunea; celelalte procese pot servi
+date vechi cel mult DATA_VERSION_TTL secunde dupa commit, la care se adauga REFERENCE_DATA_MAX_AGE in cache-ul
+clientilor. Datele se schimba doar la inceputul semestrelor sau la stergerea manuala, deci intervalul este acceptabil.
+Fara configure_data_version (scripturi, teste fara baza de date) versiunea ramane locala procesului.
+"""
+
+logger = setup_logger(__name__)
+
+SELECT_VERSION = text("SELECT version FROM data_version WHERE id = 1")
+BUMP_VERSION = text("UPDATE data_version SET version = version + 1, updated_at = now() WHERE id = 1 RETURNING version")
+
+_boot_id = uuid.uuid4().hex[:8]
+_counter = 0
+_lock = threading.Lock()
+_listeners = []
+_engine = None
+_ttl = DATA_VERSION_TTL
+_version = None
+_checked_at = 0.0
+
+
+def configure_data_version(engine, ttl: float = DATA_VERSION_TTL):
+    """
+    Citeste versiunea datelor din baza de date primita, in loc de contorul local procesului.
+    """
+    global _engine, _ttl, _version, _checked_at
+    with _lock:
+        _engine = engine
+        _ttl = ttl
+        _version = None
+        _checked_at = 0.0
+
+
+def get_data_version() -> str:
+    global _version, _checked_at
+    if _engine is None:
+        return f"{_boot_id}-{_counter}"
+
+    with _lock:
+        if _version is not None and time.monotonic() - _checked_at < _ttl:
+            return _version
+        previous = _version
+
+    try:
+        with _engine.connect() as connection:
+            version = str(connection.execute(SELECT_VERSION).scalar_one())
+    except Exception as e:
+        logger.error(f"Eroare la citirea versiunii datelor: {e}")
+        if previous is not None:
+            return previous
+        return f"{_boot_id}-{_counter}"
+
+    with _lock:
+        _version = version
+        _checked_at = time.monotonic()
+
+    if previous is not None and version != previous:
+        logger.info(f"Versiunea datelor de referinta a devenit {version}")
+        _notify(version)
+    return version
+
+
+def bump_data_version(connection=None) -> str:
+    """
+    Marcheaza datele de referinta ca modificate.
+
+    Argumente:
+        connection: Conexiunea sau sesiunea SQLAlchemy a tranzactiei care scrie datele noi; versiunea noua
+            devine vizibila odata cu ele, la commit. Fara conexiune se incrementeaza doar contorul local.
+
+    Returneaza:
+        Versiunea noua
+    """
+    global _counter, _checked_at
+    if connection is not None:
+        version = str(connection.execute(BUMP_VERSION).scalar_one())
+        with _lock:
+            # Urmatorul get_data_version citeste din nou tabela si anunta listener-ii
+            _checked_at = 0.0
+        if _engine is not None:
+            return version
+
+    with _lock:
+        _counter += 1
+        version = f"{_boot_id}-{_counter}"
+    logger.info(f"Versiunea datelor de referinta a devenit {version}")
+    _notify(version)
+    return version
+
+
+def on_data_version_bump(listener):
+    with _lock:
+        _listeners.append(listener)
+
+
+def _notify(version: str):
+    with _lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(version)
+        except Exception as e:
+            logger.error(f"Eroare in listener-ul de versiune a datelor: {e}")
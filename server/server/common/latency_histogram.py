@@ -0,0 +1,30 @@
+import threading
+
+
+class LatencyHistogram:
+    """
+    Histograma cumulativa a duratelor (in secunde), in stilul Prometheus: fiecare bucket numara
+    observatiile mai mici sau egale cu limita lui.
+    """
+    BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self.lock:
+            self.count += 1
+            self.sum += seconds
+            for position, limit in enumerate(self.buckets):
+                if seconds <= limit:
+                    self.counts[position] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            buckets = {f"le_{limit}": count for limit, count in zip(self.buckets, self.counts)}
+            buckets["le_inf"] = self.count
+            return {"buckets": buckets, "count": self.count, "sum": round(self.sum, 3)}
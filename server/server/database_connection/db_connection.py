@@ -1,18 +1,128 @@
 import threading
-from psycopg2 import connect
-from psycopg2.extensions import connection as Connection
-
-thread_local = threading.local()
-
-DB_PARAMS = {
-    "dbname": "planner4students",
-    "user": "postgres",
-    "password": "dinozaur123",
-    "host": "localhost",
-    "port": "5432"
-}
-
-def get_connection() -> Connection:
-    if not hasattr(thread_local, 'connection'):
-        thread_local.connection = connect(**DB_PARAMS)
-    return thread_local.connection
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from server.common.common_constants import (DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+                                            DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT,
+                                            DB_CONNECT_TIMEOUT)
+from server.common.latency_histogram import LatencyHistogram
+from server.common.logger import setup_logger
+
+"""
+Crearea engine-ului SQLAlchemy comun pentru toata aplicatia. Toate conexiunile la baza de date trec prin
+pool-ul acestui engine, configurat din variabilele de mediu (vezi DATABASE CONSTANTS in common_constants).
+"""
+
+logger = setup_logger(__name__)
+
+
+class PoolMetrics:
+    """
+    Metricile pool-ului de conexiuni: cat asteapta cererile dupa o conexiune libera, cate au renuntat
+    dupa DB_POOL_TIMEOUT si cat de aproape a fost pool-ul de limita (pool_size + max_overflow).
+    """
+    WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.checkout_wait = LatencyHistogram(self.WAIT_BUCKETS)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.lock = threading.Lock()
+
+    def record_checkout(self, pool, seconds: float):
+        self.checkout_wait.observe(seconds)
+        checked_out = pool.checkedout()
+        with self.lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self, seconds: float):
+        self.checkout_wait.observe(seconds)
+        with self.lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        checked_out = pool.checkedout()
+        with self.lock:
+            return {
+                "pool_size": pool.size(),
+                "max_overflow": self.capacity - pool.size(),
+                "checked_out": checked_out,
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "saturation": round(checked_out / self.capacity, 3) if self.capacity else 0,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_saturation": round(self.peak_checked_out / self.capacity, 3) if self.capacity else 0,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "checkout_wait": self.checkout_wait.snapshot(),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool care masoara timpul de asteptare la fiecare preluare a unei conexiuni din pool.
+    Metricile sunt pastrate si cand engine-ul recreeaza pool-ul (dispose, conexiuni invalidate).
+    """
+
+    def __init__(self, *args, metrics: PoolMetrics = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics(self.size() + max(self._max_overflow, 0))
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        self.metrics.record_checkout(self, time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def create_db_engine(database_url: str = None, statement_timeout: int = DB_STATEMENT_TIMEOUT):
+    """
+    Creeaza engine-ul aplicatiei cu pool-ul configurat din mediu.
+
+    Argumente:
+        database_url: URL-ul bazei de date; implicit DATABASE_URL
+        statement_timeout: Durata maxima a unei interogari (ms); 0 dezactiveaza limita
+
+    Returneaza:
+        Engine-ul SQLAlchemy
+    """
+    connect_args = {"connect_timeout": DB_CONNECT_TIMEOUT}
+    if statement_timeout:
+        connect_args["options"] = f"-c statement_timeout={statement_timeout}"
+
+    engine = create_engine(
+        database_url or DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    logger.info(f"Engine creat pentru {engine.url.render_as_string(hide_password=True)} "
+                f"(pool_size={DB_POOL_SIZE}, max_overflow={DB_MAX_OVERFLOW}, pool_timeout={DB_POOL_TIMEOUT}s, "
+                f"pool_recycle={DB_POOL_RECYCLE}s, statement_timeout={statement_timeout}ms)")
+    return engine
+
+
+def get_pool_metrics(engine) -> dict:
+    """
+    Returneaza metricile pool-ului de conexiuni al engine-ului.
+    """
+    return engine.pool.metrics.snapshot(engine.pool)
@@ -0,0 +1,181 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from server.common.logger import setup_logger
+from server.models.course import Course
+from server.models.student_courses import StudentCourses
+from server.models.subgroup_schedule import SubgroupSchedule
+
+"""
+Migrari de schema aplicate la pornirea aplicatiei.
+Fiecare migrare ruleaza o singura data, in propria tranzactie, iar versiunea ei este salvata in tabela
+schema_migrations. Migrarile noi se adauga la finalul listei MIGRATIONS, fara a le modifica pe cele existente.
+"""
+
+logger = setup_logger(__name__)
+
+# Cheie arbitrara pentru pg_advisory_xact_lock, ca doua procese pornite simultan sa nu aplice aceeasi migrare
+MIGRATIONS_LOCK_KEY = 4175020
+
+
+def _create_indexes(connection, table):
+    for index in sorted(table.indexes, key=lambda index: index.name):
+        index.create(connection, checkfirst=True)
+
+
+def create_subgroup_schedules(connection):
+    SubgroupSchedule.__table__.create(connection, checkfirst=True)
+
+
+def add_student_courses_unique(connection):
+    connection.execute(text(
+        "DELETE FROM student_courses a USING student_courses b "
+        "WHERE a.student_id = b.student_id AND a.course_id = b.course_id AND a.id > b.id"))
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_student_courses_student_course "
+        "ON student_courses (student_id, course_id)"))
+
+
+def _course_identity_index():
+    return next(index for index in Course.__table__.indexes if index.name == 'uq_courses_identity')
+
+
+def add_course_natural_key(connection):
+    """
+    Pastreaza un singur curs pentru fiecare identitate (Course.identity_key, aceeasi ca in get_course, deci
+    inclusiv profesorul: cursurile tinute de mai multi profesori in acelasi interval raman distincte);
+    alegerile studentilor si orarul precalculat care indicau spre dubluri sunt mutate pe cursul pastrat
+    inainte de crearea indexului unic. Fiecare rand eliminat este scris in log.
+    """
+    identity = ("name, professor_id, course_type, study_year_id, group_id, subgroup_id, day, start_time, "
+                "end_time, room_id, frequency")
+    connection.execute(text(f"""
+        CREATE TEMPORARY TABLE course_duplicates ON COMMIT DROP AS
+        SELECT course_id, kept_id FROM (
+            SELECT course_id,
+                   first_value(course_id) OVER (PARTITION BY {identity} ORDER BY course_id) AS kept_id
+            FROM courses
+        ) ranked
+        WHERE course_id <> kept_id
+    """))
+    merged = connection.execute(text("""
+        SELECT d.course_id, d.kept_id, c.name, c.course_type, c.day, c.start_time, c.professor_id
+        FROM course_duplicates d JOIN courses c ON c.course_id = d.course_id
+        ORDER BY c.name, d.course_id
+    """)).all()
+    for row in merged:
+        logger.warning(f"Cursul duplicat {row.course_id} ({row.name}, {row.course_type}, {row.day} {row.start_time}, "
+                       f"profesor {row.professor_id}) este unit cu {row.kept_id}")
+
+    connection.execute(text("""
+        DELETE FROM student_courses sc USING course_duplicates d
+        WHERE sc.course_id = d.course_id
+          AND EXISTS (SELECT 1 FROM student_courses k WHERE k.student_id = sc.student_id AND k.course_id = d.kept_id)
+    """))
+    connection.execute(text(
+        "UPDATE student_courses sc SET course_id = d.kept_id FROM course_duplicates d WHERE sc.course_id = d.course_id"))
+    connection.execute(text(
+        "DELETE FROM subgroup_schedules s USING course_duplicates d WHERE s.course_id = d.course_id"))
+    removed = connection.execute(text(
+        "DELETE FROM courses c USING course_duplicates d WHERE c.course_id = d.course_id")).rowcount
+    if removed:
+        logger.info(f"Au fost eliminate {removed} cursuri duplicate")
+
+    _course_identity_index().create(connection, checkfirst=True)
+
+
+def add_query_indexes(connection):
+    _create_indexes(connection, Course.__table__)
+    _create_indexes(connection, StudentCourses.__table__)
+    _create_indexes(connection, SubgroupSchedule.__table__)
+
+
+def add_professor_name_indexes(connection):
+    """
+    unaccent() este STABLE si nu poate fi folosita in indecsi; f_unaccent o fixeaza pe dictionarul implicit,
+    deci poate fi declarata IMMUTABLE. Numele de familie (egalitate) primeste un index B-tree, iar prenumele
+    (ILIKE 'prefix%') un index trigram, daca extensia pg_trgm este disponibila.
+    """
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+    connection.execute(text("""
+        CREATE OR REPLACE FUNCTION public.f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_professors_last_name_unaccent ON professors (public.f_unaccent(last_name))"))
+
+    try:
+        with connection.begin_nested():
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_professors_first_name_unaccent_trgm "
+                "ON professors USING gin (public.f_unaccent(first_name) gin_trgm_ops)"))
+    except Exception as e:
+        logger.warning(f"Indexul trigram pentru prenumele profesorilor nu a fost creat (pg_trgm indisponibil?): {e}")
+
+
+def create_data_version(connection):
+    """
+    Un singur rand cu versiunea datelor de referinta, comun tuturor proceselor (vezi server.common.data_version).
+    """
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS data_version ("
+        "id SMALLINT PRIMARY KEY CHECK (id = 1), version BIGINT NOT NULL, updated_at TIMESTAMP NOT NULL)"))
+    connection.execute(text(
+        "INSERT INTO data_version (id, version, updated_at) VALUES (1, 0, now()) ON CONFLICT (id) DO NOTHING"))
+
+
+MIGRATIONS = [
+    ("0001", "tabela subgroup_schedules", create_subgroup_schedules),
+    ("0002", "constrangere unica student_courses (student_id, course_id)", add_student_courses_unique),
+    ("0003", "cheie naturala unica pentru courses", add_course_natural_key),
+    ("0004", "indecsi pentru interogarile pe courses, student_courses si subgroup_schedules", add_query_indexes),
+    ("0005", "functia f_unaccent si indecsi pe numele profesorilor", add_professor_name_indexes),
+    ("0006", "tabela data_version", create_data_version),
+]
+
+
+def run_migrations(engine) -> list[str]:
+    """
+    Aplica migrarile care nu au fost inca aplicate pe baza de date.
+
+    Argumente:
+        engine: Engine-ul SQLAlchemy al bazei de date
+
+    Returneaza:
+        Lista versiunilor aplicate la aceasta rulare
+    """
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version VARCHAR(32) PRIMARY KEY, description VARCHAR(255) NOT NULL, applied_at TIMESTAMP NOT NULL)"))
+
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        with engine.begin() as connection:
+            # Migrarile (stergerea dublurilor, crearea indecsilor) pot depasi DB_STATEMENT_TIMEOUT
+            connection.execute(text("SET LOCAL statement_timeout = 0"))
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATIONS_LOCK_KEY})
+            already_applied = connection.execute(
+                text("SELECT 1 FROM schema_migrations WHERE version = :version"), {"version": version}).first()
+            if already_applied:
+                continue
+
+            logger.info(f"Se aplica migrarea {version}: {description}")
+            try:
+                migrate(connection)
+            except Exception as e:
+                error_msg = f"Migrarea {version} ({description}) a esuat: {e}"
+                logger.error(error_msg)
+                raise Exception(error_msg) from e
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) "
+                     "VALUES (:version, :description, :applied_at)"),
+                {"version": version, "description": description, "applied_at": datetime.now()})
+            applied.append(version)
+
+    if applied:
+        logger.info(f"Migrari aplicate: {', '.join(applied)}")
+    return applied
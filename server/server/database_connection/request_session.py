@@ -0,0 +1,58 @@
+from flask import current_app, g, request
+
+from server.common.common_constants import HTTP_OK_CODE, HTTP_ERROR_CODE
+from server.common.logger import setup_logger
+from server.utils.handle_response import handle_response
+
+
+class RequestSessionManager:
+    """
+    O singura sesiune SQLAlchemy, deci o singura tranzactie, pentru fiecare cerere HTTP.
+    Sesiunea este deschisa la primul apel get_request_session() din ruta. Dupa ruta, tranzactia este
+    confirmata daca raspunsul este reusit (status 200, inclusiv cel din corpul raspunsului) si anulata
+    in orice alt caz; la final sesiunea este inchisa. Repository-urile doar trimit modificarile (flush).
+    """
+    logger = setup_logger(__name__)
+
+    EXTENSION_NAME = "request_session"
+
+    def __init__(self, Session):
+        self.Session = Session
+
+    def init_app(self, app):
+        app.extensions[self.EXTENSION_NAME] = self
+        app.after_request(self._finish_transaction)
+        app.teardown_request(self._close_session)
+
+    def get(self):
+        if "db_session" not in g:
+            g.db_session = self.Session()
+        return g.db_session
+
+    def _finish_transaction(self, response):
+        session = g.get("db_session")
+        if session is None:
+            return response
+
+        if response.status_code == HTTP_OK_CODE and getattr(response, "payload_status", HTTP_OK_CODE) == HTTP_OK_CODE:
+            try:
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Eroare la confirmarea tranzactiei pentru {request.path}: {e}")
+                return handle_response(message=f"Eroare la salvarea datelor: {str(e)}", status_code=HTTP_ERROR_CODE)
+        else:
+            session.rollback()
+        return response
+
+    def _close_session(self, exception=None):
+        session = g.pop("db_session", None)
+        if session is not None:
+            session.close()
+
+
+def get_request_session():
+    """
+    Returneaza sesiunea cererii curente; trebuie apelata in contextul unei cereri.
+    """
+    return current_app.extensions[RequestSessionManager.EXTENSION_NAME].get()
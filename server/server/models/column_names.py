@@ -82,4 +82,8 @@ class StudentCoursesTableColumns(Enum):
 class ProfessorDomainsTableColumns(Enum):
     ID ="id"
     PROFESSOR_ID = "professor_id"
-    DOMAIN_ID = "domain_id"
\ No newline at end of file
+    DOMAIN_ID = "domain_id"
+
+class SubgroupScheduleTableColumns(Enum):
+    SUBGROUP_ID = "subgroup_id"
+    COURSE_ID = "course_id"
@@ -1,12 +1,33 @@
 
+import uuid
+from datetime import time
+
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String, Integer, ForeignKey,Time
+from sqlalchemy import Column, String, Integer, ForeignKey,Time, Index, func, literal_column
 from sqlalchemy import text
 from sqlalchemy.orm import relationship
 
 from server.models.column_names import CourseTableColumns
 from server.models.base import Base
 
+NULL_UUID = literal_column("'00000000-0000-0000-0000-000000000000'::uuid")
+
+# Coloanele care identifica un curs (aceleasi ca in CourseRepository.get_course). NULL-urile sunt inlocuite cu
+# valori santinela (expresia SQL din index si valoarea Python echivalenta), ca doua cursuri care difera doar
+# prin coloane NULL sa fie considerate identice de indexul unic uq_courses_identity.
+IDENTITY_COLUMNS = ('name', 'professor_id', 'course_type', 'study_year_id', 'group_id', 'subgroup_id', 'day',
+                    'start_time', 'end_time', 'room_id', 'frequency')
+IDENTITY_SENTINELS = {
+    'study_year_id': (NULL_UUID, uuid.UUID(int=0)),
+    'group_id': (NULL_UUID, uuid.UUID(int=0)),
+    'subgroup_id': (NULL_UUID, uuid.UUID(int=0)),
+    'day': (literal_column("''"), ''),
+    'start_time': (literal_column("'00:00'::time"), time(0, 0)),
+    'end_time': (literal_column("'00:00'::time"), time(0, 0)),
+    'room_id': (NULL_UUID, uuid.UUID(int=0)),
+    'frequency': (literal_column("-1"), -1),
+}
+
 class Course(Base):
     __tablename__ = 'courses'
 
@@ -23,6 +44,15 @@ class Course(Base):
     room_id = Column(CourseTableColumns.ROOM_ID.value,UUID(as_uuid=True),ForeignKey('rooms.room_id'),nullable=True)
     frequency = Column(CourseTableColumns.FREQUENCY.value,Integer)
 
+    __table_args__ = (
+        Index('ix_courses_study_year_id', study_year_id),
+        Index('ix_courses_subgroup_id', subgroup_id),
+        Index('ix_courses_professor_id', professor_id),
+        # Cursurile grupei fara subgrupa si cursurile anului fara grupa (vezi orarul implicit al subgrupei)
+        Index('ix_courses_group_id_without_subgroup', group_id, postgresql_where=subgroup_id.is_(None)),
+        Index('ix_courses_study_year_id_without_group', study_year_id, postgresql_where=group_id.is_(None)),
+    )
+
     professor = relationship("Professor", back_populates="courses")
     study_year = relationship("StudyYear", back_populates="courses")
     group = relationship("Group", back_populates="courses")
@@ -47,8 +77,42 @@ class Course(Base):
         self.room_id = room_id
         self.frequency = frequency
 
+    def natural_key(self) -> tuple:
+        """
+        Intervalul din orar (fara profesor); folosit de sincronizarea incrementala, care poate schimba
+        profesorul unui curs existent pe loc.
+        """
+        return (self.name, self.course_type, self.study_year_id, self.group_id, self.subgroup_id,
+                self.day, self.start_time, self.end_time, self.room_id, self.frequency)
+
+    def identity_key(self) -> tuple:
+        """
+        Identitatea completa a unui rand: intervalul plus profesorul. Doua cursuri tinute de profesori
+        diferiti in acelasi interval sunt randuri distincte (vezi indexul uq_courses_identity).
+        """
+        return self.natural_key() + (self.professor_id,)
+
+    @classmethod
+    def identity_expressions(cls) -> list:
+        columns = cls.__table__.c
+        return [func.coalesce(columns[name], IDENTITY_SENTINELS[name][0]) if name in IDENTITY_SENTINELS
+                else columns[name] for name in IDENTITY_COLUMNS]
+
+    @classmethod
+    def identity_filter(cls, **values) -> list:
+        """
+        Conditiile de egalitate pe expresiile indexului uq_courses_identity, astfel incat cautarea unui curs
+        dupa identitate (inclusiv cu valori NULL) poate folosi indexul.
+        """
+        return [expression == (values[name] if values[name] is not None or name not in IDENTITY_SENTINELS
+                               else IDENTITY_SENTINELS[name][1])
+                for name, expression in zip(IDENTITY_COLUMNS, cls.identity_expressions())]
+
     def __str__(self):
         return f'{self.name} - {self.course_type}'
 
     def __repr__(self):
-        return f"<Course(name='{self.name}', type='{self.course_type}', professor_id='{self.professor_id}')>"
\ No newline at end of file
+        return f"<Course(name='{self.name}', type='{self.course_type}', professor_id='{self.professor_id}')>"
+
+
+Index('uq_courses_identity', *Course.identity_expressions(), unique=True)
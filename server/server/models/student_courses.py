@@ -1,6 +1,6 @@
 
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String, Integer, ForeignKey,Time
+from sqlalchemy import Column, String, Integer, ForeignKey,Time, UniqueConstraint, Index
 from sqlalchemy import text
 from sqlalchemy.orm import relationship
 
@@ -14,6 +14,12 @@ class StudentCourses(Base):
     student_id = Column(StudentCoursesTableColumns.STUDENT_ID.value, UUID(as_uuid=True),ForeignKey('students.student_id'), nullable=False)
     course_id = Column(StudentCoursesTableColumns.COURSE_ID.value,UUID(as_uuid=True),ForeignKey('courses.course_id'))
 
+    __table_args__ = (
+        UniqueConstraint(StudentCoursesTableColumns.STUDENT_ID.value, StudentCoursesTableColumns.COURSE_ID.value,
+                         name='uq_student_courses_student_course'),
+        Index('ix_student_courses_course_id', StudentCoursesTableColumns.COURSE_ID.value),
+    )
+
 
     def __init__(self, student_id: UUID, course_id: UUID,):
         super().__init__()
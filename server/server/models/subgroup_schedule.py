@@ -0,0 +1,30 @@
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, Index
+
+from server.models.base import Base
+from server.models.column_names import SubgroupScheduleTableColumns
+
+
+class SubgroupSchedule(Base):
+    """
+    Orarul implicit al fiecarei subgrupe (cursurile subgrupei, ale grupei si ale anului de studiu),
+    precalculat la finalul fiecarei rulari de scraping.
+    """
+    __tablename__ = 'subgroup_schedules'
+
+    subgroup_id = Column(SubgroupScheduleTableColumns.SUBGROUP_ID.value, UUID(as_uuid=True),
+                         ForeignKey('subgroups.subgroup_id'), primary_key=True)
+    course_id = Column(SubgroupScheduleTableColumns.COURSE_ID.value, UUID(as_uuid=True),
+                       ForeignKey('courses.course_id'), primary_key=True)
+
+    __table_args__ = (
+        Index('ix_subgroup_schedules_course_id', SubgroupScheduleTableColumns.COURSE_ID.value),
+    )
+
+    def __init__(self, subgroup_id: UUID, course_id: UUID):
+        super().__init__()
+        self.subgroup_id = subgroup_id
+        self.course_id = course_id
+
+    def __repr__(self):
+        return f"<SubgroupSchedule(subgroup='{self.subgroup_id}', course='{self.course_id}')>"
@@ -13,7 +13,7 @@ class AcademicHolidayRepository:
 
     def add_holiday(self, holiday: AcademicHoliday) -> AcademicHoliday:
         self.session.add(holiday)
-        self.session.commit()
+        self.session.flush()
         return holiday
 
     def get_all_holidays(self) -> list[AcademicHoliday]:
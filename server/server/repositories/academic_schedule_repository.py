@@ -18,7 +18,7 @@ class AcademicScheduleRepository:
 
     def add_schedule(self, schedule: AcademicSchedule) -> AcademicSchedule:
         self.session.add(schedule)
-        self.session.commit()
+        self.session.flush()
         return schedule
 
     def get_semester_start_dates(self) -> dict:
@@ -1,11 +1,15 @@
+from collections import defaultdict
 from typing import Iterable
 
-from sqlalchemy import Time, or_, and_
+from sqlalchemy import Time, or_, and_, update, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import joinedload
 
 from server.models.course import Course
 from server.models.group import Group
+from server.models.student_courses import StudentCourses
 from server.models.subgroup import Subgroup
+from server.models.subgroup_schedule import SubgroupSchedule
 
 
 class CourseRepository:
@@ -13,7 +17,8 @@ class CourseRepository:
         self.session = sess
 
     def get_course(self,name:str,professor_id,course_type,study_year_id,group_id,subgroup_id,day:str,start_time:Time,end_time:Time,room_id,frequency) -> Course | None:
-        return self.session.query(Course).filter_by(
+        # Aceleasi expresii ca indexul unic uq_courses_identity, ca interogarea sa fie servita de index
+        return self.session.query(Course).filter(*Course.identity_filter(
             name=name,
             professor_id=professor_id,
             course_type=course_type,
@@ -25,15 +30,123 @@ class CourseRepository:
             end_time=end_time,
             room_id=room_id,
             frequency=frequency
-
-        ).first()
+        )).first()
 
     def add_course(self,course: Course ) -> Course:
         self.session.add(course)
-        self.session.commit()
+        self.session.flush()
         return course
 
+    NATURAL_KEY_COLUMNS = (Course.name, Course.course_type, Course.study_year_id, Course.group_id,
+                           Course.subgroup_id, Course.day, Course.start_time, Course.end_time,
+                           Course.room_id, Course.frequency)
+    IDENTITY_KEY_COLUMNS = NATURAL_KEY_COLUMNS + (Course.professor_id,)
+
+    @staticmethod
+    def _course_row(course: Course) -> dict:
+        return {
+            "name": course.name,
+            "professor_id": course.professor_id,
+            "course_type": course.course_type,
+            "study_year_id": course.study_year_id,
+            "group_id": course.group_id,
+            "subgroup_id": course.subgroup_id,
+            "day": course.day,
+            "start_time": course.start_time,
+            "end_time": course.end_time,
+            "room_id": course.room_id,
+            "frequency": course.frequency,
+        }
+
+    def get_course_keys(self) -> set[tuple]:
+        rows = self.session.query(*self.IDENTITY_KEY_COLUMNS).all()
+        return {tuple(row) for row in rows}
+
+    def add_courses(self, courses: list[Course]) -> dict:
+        unique_courses = {}
+        for course in courses:
+            unique_courses.setdefault(course.identity_key(), course)
+
+        if not unique_courses:
+            return {"inserted": 0, "duplicates": len(courses)}
+
+        rows = [self._course_row(course) for course in unique_courses.values()]
+        statement = insert(Course).values(rows).on_conflict_do_nothing().returning(Course.course_id)
+        inserted = len(self.session.execute(statement).all())
+        self.session.flush()
+        return {"inserted": inserted, "duplicates": len(courses) - inserted}
+
+    def sync_courses(self, courses: list[Course], study_year_ids: Iterable) -> dict:
+        """
+        Aduce cursurile anilor de studiu dati la continutul orarului extras, modificand doar randurile diferite.
+        Cursurile altor ani de studiu nu sunt atinse.
+        Cursurile sunt grupate pe cheia naturala (Course.natural_key, intervalul din orar); in fiecare interval,
+        randurile cu acelasi profesor raman neschimbate, iar profesorii inlocuiti sunt actualizati pe loc pe
+        randurile existente, care isi pastreaza course_id-ul (alegerile din student_courses raman valabile).
+        Profesorii in plus sunt inserati, cei disparuti sunt stersi, deci un interval tinut de mai multi
+        profesori pastreaza cate un rand pentru fiecare. Toate modificarile se fac intr-o singura tranzactie.
+        """
+        study_year_ids = list(study_year_ids)
+        if not study_year_ids:
+            return {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+        scraped = defaultdict(dict)
+        for course in courses:
+            scraped[course.natural_key()].setdefault(course.professor_id, course)
+
+        existing = defaultdict(dict)
+        to_delete = []
+        rows = self.session.query(Course.course_id, Course.professor_id, *self.NATURAL_KEY_COLUMNS).filter(
+            Course.study_year_id.in_(study_year_ids)).all()
+        for row in rows:
+            slot = existing[tuple(row[2:])]
+            if row.professor_id in slot:
+                to_delete.append(row.course_id)
+            else:
+                slot[row.professor_id] = row.course_id
+
+        to_insert = []
+        to_update = []
+        unchanged = 0
+        for key in scraped.keys() | existing.keys():
+            wanted = scraped.get(key, {})
+            current = existing.get(key, {})
+            unchanged += len(wanted.keys() & current.keys())
+            added = sorted(wanted.keys() - current.keys(), key=str)
+            removed = sorted(current.keys() - wanted.keys(), key=str)
+            to_update += [{"course_id": current[old_professor_id], "professor_id": professor_id}
+                          for professor_id, old_professor_id in zip(added, removed)]
+            to_insert += [self._course_row(wanted[professor_id]) for professor_id in added[len(removed):]]
+            to_delete += [current[professor_id] for professor_id in removed[len(added):]]
+
+        if to_delete:
+            self.session.execute(delete(StudentCourses).where(StudentCourses.course_id.in_(to_delete)))
+            self.session.execute(delete(SubgroupSchedule).where(SubgroupSchedule.course_id.in_(to_delete)))
+            self.session.execute(delete(Course).where(Course.course_id.in_(to_delete)))
+        if to_update:
+            self.session.execute(update(Course), to_update)
+        if to_insert:
+            self.session.execute(insert(Course).values(to_insert))
+        self.session.flush()
+
+        return {
+            "inserted": len(to_insert),
+            "updated": len(to_update),
+            "deleted": len(to_delete),
+            "unchanged": unchanged,
+        }
+
     def get_schedule_by_subgroup(self, subgroup: Subgroup, group: Group) -> list[Course]:
+        courses = self.session.query(Course).join(
+            SubgroupSchedule, SubgroupSchedule.course_id == Course.course_id
+        ).filter(SubgroupSchedule.subgroup_id == subgroup.subgroup_id).all()
+        if courses:
+            return courses
+
+        # Orarul precalculat nu exista inca (de exemplu inainte de prima rulare dupa actualizare)
+        return self._get_schedule_by_subgroup_union(subgroup, group)
+
+    def _get_schedule_by_subgroup_union(self, subgroup: Subgroup, group: Group) -> list[Course]:
         subgroup_courses = self.session.query(Course).filter(
             Course.subgroup_id == subgroup.subgroup_id,
         )
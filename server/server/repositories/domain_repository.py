@@ -22,7 +22,7 @@ class DomainRepository:
            name=name
         )
         self.session.add(domain)
-        self.session.commit()
+        self.session.flush()
         return domain
 
   
\ No newline at end of file
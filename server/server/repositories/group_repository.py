@@ -23,9 +23,13 @@ class GroupRepository:
             study_year_id=study_year.study_year_id
         )
         self.session.add(group)
-        self.session.commit()
+        self.session.flush()
         return group
 
 
     def get_all(self) -> list[Group]:
-        return self.session.query(Group).all()
\ No newline at end of file
+        return self.session.query(Group).all()
+
+    def get_group_ids_by_number(self) -> dict:
+        rows = self.session.query(Group.group_id, Group.study_year_id, Group.group_number).all()
+        return {(study_year_id, group_number): group_id for group_id, study_year_id, group_number in rows}
\ No newline at end of file
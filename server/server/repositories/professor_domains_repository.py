@@ -28,7 +28,7 @@ class ProfessorDomainsRepository:
         )
 
         self.session.add(professor_domain)
-        self.session.commit()
+        self.session.flush()
 
         return professor_domain
 
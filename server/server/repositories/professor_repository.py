@@ -1,10 +1,13 @@
 from typing import Iterable
 
-from sqlalchemy import func, and_, distinct
+from sqlalchemy import func, and_, distinct, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import joinedload
 
 from server.models.course import Course
+from server.models.domain import Domain
 from server.models.professor import Professor
+from server.models.professor_domain import ProfessorDomain
 from server.models.student import Student
 
 
@@ -15,9 +18,10 @@ class ProfessorRepository:
         self.session = sess
 
     def get_professor_by_name(self, first_name: str, last_name: str) -> Professor | None:
+        # f_unaccent este varianta IMMUTABLE a lui unaccent (migrarea 0005), indexabila pe ambele coloane
         return self.session.query(Professor).filter(
-            func.unaccent(Professor.last_name) == func.unaccent(last_name),
-            func.unaccent(Professor.first_name).ilike(func.unaccent(f"{first_name}%"))
+            func.f_unaccent(Professor.last_name) == func.f_unaccent(last_name),
+            func.f_unaccent(Professor.first_name).ilike(func.f_unaccent(f"{first_name}%"))
         ).first()
 
     def add_professor(self, first_name: str, last_name: str, title: str,email: str = None, web_page: str = None,image_url:str=None,department:str=None,details:str=None) -> Professor:
@@ -32,7 +36,7 @@ class ProfessorRepository:
             details =details
         )
         self.session.add(professor)
-        self.session.commit()
+        self.session.flush()
         return professor
 
     def get_professor_by_email(self, email: str) -> Professor | None:
@@ -55,7 +59,7 @@ class ProfessorRepository:
             existing_professor.department = professor.department
             existing_professor.details= professor.details
 
-            self.session.commit()
+            self.session.flush()
             return existing_professor
 
         return None
@@ -73,4 +77,53 @@ class ProfessorRepository:
         ).all()
         return [name for (name,) in results]
     def get_all_professors(self) -> list[Professor]:
-        return self.session.query(Professor).all()
\ No newline at end of file
+        return self.session.query(Professor).all()
+
+    def get_professor_name_keys(self) -> list[tuple]:
+        """
+        Numele tuturor profesorilor, normalizate de Postgres la fel ca in get_professor_by_name.
+
+        Returneaza:
+            Tupluri (professor_id, lower(f_unaccent(first_name)), f_unaccent(last_name))
+        """
+        return self.session.query(
+            Professor.professor_id,
+            func.lower(func.f_unaccent(Professor.first_name)),
+            func.f_unaccent(Professor.last_name)
+        ).all()
+
+    def get_name_normalization_rows(self) -> list[tuple]:
+        """
+        Caracterele pe care f_unaccent sau lower (folosit de ILIKE) le modifica, cu rezultatul fiecareia.
+
+        Returneaza:
+            Tupluri (caracter, f_unaccent(caracter), lower(caracter))
+        """
+        return self.session.execute(text("""
+            SELECT chr(code), public.f_unaccent(chr(code)), lower(chr(code))
+            FROM generate_series(1, 1114111) AS code
+            WHERE code NOT BETWEEN 55296 AND 57343
+              AND (public.f_unaccent(chr(code)) <> chr(code) OR lower(chr(code)) <> chr(code))
+        """)).all()
+
+    def get_professor_corpus_rows(self) -> list[tuple]:
+        """
+        Intoarce, printr-o singura interogare, numele fiecarui profesor impreuna cu domeniile
+        si materiile lui (agregate in liste sortate alfabetic).
+
+        Returneaza:
+            Lista de tupluri (professor_id, first_name, last_name, domains, subjects)
+        """
+        domains = select(func.array_agg(aggregate_order_by(distinct(Domain.name), Domain.name))) \
+            .join(ProfessorDomain, ProfessorDomain.domain_id == Domain.domain_id) \
+            .where(ProfessorDomain.professor_id == Professor.professor_id) \
+            .correlate(Professor) \
+            .scalar_subquery()
+        subjects = select(func.array_agg(aggregate_order_by(distinct(Course.name), Course.name))) \
+            .where(Course.professor_id == Professor.professor_id) \
+            .correlate(Professor) \
+            .scalar_subquery()
+
+        return self.session.query(
+            Professor.professor_id, Professor.first_name, Professor.last_name, domains, subjects
+        ).order_by(Professor.last_name, Professor.first_name).all()
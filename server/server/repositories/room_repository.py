@@ -29,14 +29,14 @@ class RoomRepository:
             google_maps_url=google_maps_url
         )
         self.session.add(room)
-        self.session.commit()
+        self.session.flush()
         return room
 
     def update_location_by_id(self, room_id: str, location: str) -> Room | None:
         room = self.session.query(Room).filter_by(room_id=room_id).first()
         if room:
             room.location = location
-            self.session.commit()
+            self.session.flush()
             return room
         return None
 
@@ -44,9 +44,12 @@ class RoomRepository:
         room = self.session.query(Room).filter_by(room_id=room_id).first()
         if room:
             room.google_maps_url = google_maps_url
-            self.session.commit()
+            self.session.flush()
             return room
         return None
 
     def get_all_rooms(self) -> list[Room]:
         return self.session.query(Room).all()
+
+    def get_room_ids_by_name(self) -> dict:
+        return {name: room_id for room_id, name in self.session.query(Room.room_id, Room.name).all()}
@@ -28,7 +28,7 @@ class SpecializationRepository:
             language=language
         )
         self.session.add(specialization)
-        self.session.commit()
+        self.session.flush()
         return specialization
 
     def get_all(self) -> list[Specialization]:
@@ -1,6 +1,8 @@
+import uuid
 from typing import Iterable
 
 from sqlalchemy import func, and_, UUID
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import joinedload
 
 from server.models.course import Course
@@ -30,12 +32,22 @@ class StudentCoursesRepository:
         ).first()
 
     def update_student_courses(self, student_id: UUID, new_courses) -> bool:
-        try:
-            self.session.query(StudentCourses).filter(
-                StudentCourses.student_id == student_id
-            ).delete()
+        """
+        Aduce cursurile studentului la lista primita, modificand doar diferenta: cursurile scoase
+        sunt sterse cu o singura instructiune DELETE, iar cele noi adaugate cu un singur INSERT.
+        Randul studentului este blocat (SELECT ... FOR UPDATE) pe durata tranzactiei, astfel incat
+        doua salvari simultane (de exemplu din doua tab-uri) sunt aplicate una dupa alta; INSERT-ul
+        ignora oricum perechile (student_id, course_id) deja existente.
 
+        Argumente:
+            student_id: UUID-ul studentului
+            new_courses: Lista completa de cursuri dorite (obiecte Course sau dict-uri cu 'course_id')
 
+        Returneaza:
+            True daca actualizarea a reusit, False altfel
+        """
+        try:
+            wanted_ids = set()
             for course in new_courses:
                 if hasattr(course, 'course_id'):
                     course_id = course.course_id
@@ -44,18 +56,39 @@ class StudentCoursesRepository:
                 else:
                     print(f"Formatul cursului nu este recunoscut: {course}")
                     continue
+                wanted_ids.add(course_id if isinstance(course_id, uuid.UUID) else uuid.UUID(str(course_id)))
+
+            self.session.query(Student.student_id).filter(
+                Student.student_id == student_id
+            ).with_for_update().first()
 
-                student_course = StudentCourses(
-                    student_id=student_id,
-                    course_id=course_id
+            existing_ids = {
+                course_id for (course_id,) in self.session.query(StudentCourses.course_id).filter(
+                    StudentCourses.student_id == student_id
                 )
-                self.session.add(student_course)
+            }
+
+            removed_ids = existing_ids - wanted_ids
+            added_ids = wanted_ids - existing_ids
+
+            if removed_ids:
+                self.session.query(StudentCourses).filter(
+                    StudentCourses.student_id == student_id,
+                    StudentCourses.course_id.in_(removed_ids)
+                ).delete(synchronize_session=False)
 
-            self.session.commit()
+            if added_ids:
+                self.session.execute(
+                    insert(StudentCourses)
+                    .values([{"student_id": student_id, "course_id": course_id} for course_id in added_ids])
+                    .on_conflict_do_nothing()
+                )
+
+            self.session.flush()
             return True
 
         except Exception as e:
-            self.session.rollback()
+            # Tranzactia este anulata de cel care detine sesiunea (cererea HTTP), nu aici
             print(f"Eroare la actualizarea cursurilor studentului: {str(e)}")
             return False
 
@@ -63,7 +96,7 @@ class StudentCoursesRepository:
         self.session.query(StudentCourses).filter(
             StudentCourses.student_id == student_id
         ).delete()
-        self.session.commit()
+        self.session.flush()
 
     def get_all_courses_for_a_student(self, student_id) -> list[Course]:
         return self.session.query(Course) \
@@ -78,4 +111,16 @@ class StudentCoursesRepository:
         count = self.session.query(func.count(StudentCourses.student_id)) \
             .filter(StudentCourses.course_id == course_id) \
             .scalar()
-        return count or 0
\ No newline at end of file
+        return count or 0
+
+    def get_no_students_for_courses(self, course_ids: Iterable) -> dict:
+        course_ids = list(course_ids)
+        if not course_ids:
+            return {}
+        rows = self.session.query(StudentCourses.course_id, func.count(StudentCourses.student_id)) \
+            .filter(StudentCourses.course_id.in_(course_ids)) \
+            .group_by(StudentCourses.course_id) \
+            .all()
+        counts = dict.fromkeys(course_ids, 0)
+        counts.update(rows)
+        return counts
\ No newline at end of file
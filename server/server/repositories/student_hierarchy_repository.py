@@ -0,0 +1,60 @@
+from typing import NamedTuple
+
+from server.models.group import Group
+from server.models.specialization import Specialization
+from server.models.student import Student
+from server.models.study_year import StudyYear
+from server.models.subgroup import Subgroup
+
+
+class StudentHierarchy(NamedTuple):
+    student: Student | None
+    subgroup: Subgroup | None
+    group: Group | None
+    study_year: StudyYear | None
+    specialization: Specialization | None
+
+
+class StudentHierarchyRepository:
+    """
+    Incarca studentul impreuna cu subgrupa, grupa, anul de studiu si specializarea lui printr-o singura interogare.
+    """
+
+    def __init__(self, sess):
+        self.session = sess
+
+    def _student_query(self):
+        return self.session.query(Student, Subgroup, Group, StudyYear, Specialization) \
+            .outerjoin(Subgroup, Subgroup.subgroup_id == Student.subgroup_id) \
+            .outerjoin(Group, Group.group_id == Subgroup.group_id) \
+            .outerjoin(StudyYear, StudyYear.study_year_id == Group.study_year_id) \
+            .outerjoin(Specialization, Specialization.specialization_id == StudyYear.specialization_id)
+
+    def _subgroup_query(self):
+        return self.session.query(Subgroup, Group, StudyYear, Specialization) \
+            .join(Group, Group.group_id == Subgroup.group_id) \
+            .join(StudyYear, StudyYear.study_year_id == Group.study_year_id) \
+            .join(Specialization, Specialization.specialization_id == StudyYear.specialization_id)
+
+    def get_by_student_id(self, student_id) -> StudentHierarchy | None:
+        row = self._student_query().filter(Student.student_id == student_id).first()
+        return StudentHierarchy(*row) if row else None
+
+    def get_by_student_email(self, email: str) -> StudentHierarchy | None:
+        row = self._student_query().filter(Student.email == email).first()
+        return StudentHierarchy(*row) if row else None
+
+    def get_by_subgroup_id(self, subgroup_id) -> StudentHierarchy | None:
+        row = self._subgroup_query().filter(Subgroup.subgroup_id == subgroup_id).first()
+        return StudentHierarchy(None, *row) if row else None
+
+    def get_by_numbers(self, specialization_name: str, specialization_language: str, year: int,
+                       group_number: int, subgroup_number: int) -> StudentHierarchy | None:
+        row = self._subgroup_query().filter(
+            Specialization.name == specialization_name,
+            Specialization.language == specialization_language,
+            StudyYear.year == year,
+            Group.group_number == group_number,
+            Subgroup.subgroup_number == subgroup_number
+        ).first()
+        return StudentHierarchy(None, *row) if row else None
@@ -21,13 +21,12 @@ class StudentRepository:
                 print(f"Student with ID {student.student_id} not found")
                 return None
 
-            self.session.commit()
+            self.session.flush()
 
             print(f"Student {student.student_id} updated successfully")
             return student
 
         except Exception as e:
-            self.session.rollback()
             print(f"Error updating Student: {e}")
             return None
     def get_student_by_email(self, email: str) -> Student or None:
@@ -43,10 +42,9 @@ class StudentRepository:
 
         try:
             self.session.add(new_student)
-            self.session.commit()
+            self.session.flush()
             return new_student
         except Exception as e:
-            self.session.rollback()
             print(f"Error adding Student: {e}")
             return None
 
@@ -35,8 +35,11 @@ class StudyYearRepository:
             specialization_id=specialization.specialization_id
         )
         self.session.add(study_year)
-        self.session.commit()
+        self.session.flush()
         return study_year
 
     def get_all(self) -> list[StudyYear]:
         return self.session.query(StudyYear).all()
+
+    def get_all_ids(self) -> set:
+        return {study_year_id for (study_year_id,) in self.session.query(StudyYear.study_year_id)}
@@ -31,8 +31,12 @@ class SubgroupRepository:
             group_id=group.group_id
         )
         self.session.add(subgroup)
-        self.session.commit()
+        self.session.flush()
         return subgroup
 
     def get_all(self) ->list[Subgroup]:
-        return self.session.query(Subgroup).all()
\ No newline at end of file
+        return self.session.query(Subgroup).all()
+
+    def get_subgroup_ids_by_number(self) -> dict:
+        rows = self.session.query(Subgroup.subgroup_id, Subgroup.group_id, Subgroup.subgroup_number).all()
+        return {(group_id, subgroup_number): subgroup_id for subgroup_id, group_id, subgroup_number in rows}
\ No newline at end of file
@@ -0,0 +1,31 @@
+from sqlalchemy import select, union, delete, insert, func
+
+from server.models.course import Course
+from server.models.group import Group
+from server.models.subgroup import Subgroup
+from server.models.subgroup_schedule import SubgroupSchedule
+
+
+class SubgroupScheduleRepository:
+    def __init__(self, sess):
+        self.session = sess
+
+    def rebuild(self) -> int:
+        """
+        Recalculeaza orarul implicit al tuturor subgrupelor intr-o singura tranzactie:
+        cursurile subgrupei, cursurile grupei fara subgrupa si cursurile anului de studiu fara grupa.
+        """
+        subgroup_courses = select(Subgroup.subgroup_id, Course.course_id).join(
+            Course, Course.subgroup_id == Subgroup.subgroup_id)
+        group_courses = select(Subgroup.subgroup_id, Course.course_id).join(
+            Course, (Course.group_id == Subgroup.group_id) & Course.subgroup_id.is_(None))
+        year_courses = select(Subgroup.subgroup_id, Course.course_id).join(
+            Group, Group.group_id == Subgroup.group_id).join(
+            Course, (Course.study_year_id == Group.study_year_id) & Course.group_id.is_(None))
+
+        self.session.execute(delete(SubgroupSchedule))
+        self.session.execute(insert(SubgroupSchedule).from_select(
+            ["subgroup_id", "course_id"], union(subgroup_courses, group_courses, year_courses)))
+        rows = self.session.query(func.count()).select_from(SubgroupSchedule).scalar()
+        self.session.flush()
+        return rows
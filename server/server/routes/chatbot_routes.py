@@ -1,13 +1,16 @@
-from flask import Blueprint, request
+from contextlib import closing
+
+from flask import Blueprint, Response, request, stream_with_context
 from dotenv import load_dotenv
-import os
-import requests
 import json
+import os
 
 from server.utils.handle_response import handle_response
 from server.common.logger import setup_logger
-from server.common.common_constants import HTTP_OK_CODE, HTTP_ERROR_CODE
-from server.services.professor_service import ProfessorService
+from server.common.common_constants import HTTP_OK_CODE, HTTP_ERROR_CODE, CHATBOT_TOP_K, DATA_MESSAGE
+from server.services.chat_completion_client import ChatCompletionClient
+from server.services.chat_response_cache import chat_response_cache
+from server.services.professor_corpus_service import professor_corpus
 
 chatbot_bp = Blueprint('chatbot', __name__)
 logger = setup_logger(__name__)
@@ -17,35 +20,19 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_API_URL = os.getenv("OPENAI_API_URL")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL")
 
-def register_routes_chatbot(app, Session):
-    logger.info("Inregistrare rute pentru chatbot")
-
-    @chatbot_bp.route('/chat', methods=['POST'])
-    def chat_with_bot():
-        session = Session()
-        try:
-            data = request.get_json()
-            user_message = data.get("message", "").strip()
-
-            if not user_message:
-                return handle_response(message="Mesajul este gol", status_code=HTTP_ERROR_CODE)
-
-            professor_service = ProfessorService(session)
-            professors = professor_service.get_all_professors()
+chat_client = ChatCompletionClient(OPENAI_API_URL, OPENAI_API_KEY, OPENAI_MODEL)
 
-            formatted_professors = []
-            for p in professors:
-                prof = professor_service.serialize_professor(p)
-                subjects = professor_service.get_professor_subjects(p.professor_id)
-                domains = ', '.join(prof.get('domains', [])) or 'N/A'
-                subjects_str = ', '.join(subjects) or 'N/A'
-                name = f"{prof['first_name']} {prof['last_name']}"
-                line = f"{name} | {domains} | {subjects_str}"
-                formatted_professors.append(line)
 
-            professors_text = "\n".join(formatted_professors)
-
-            prompt = f"""
+def build_chat_messages(user_message: str, Session) -> list[dict]:
+    """
+    Construieste conversatia trimisa modelului: instructiunile, profesorii cei mai relevanti
+    pentru mesajul studentului (cel mult CHATBOT_TOP_K) si mesajul in sine. Daca mesajul nu are
+    termeni comuni cu lista profesorilor, nu se trimite nicio lista, iar modelul cere detalii studentului.
+    """
+    candidates = professor_corpus.search(Session, user_message, CHATBOT_TOP_K)
+    if candidates:
+        professors_text = "\n".join(candidate.line for candidate in candidates)
+        prompt = f"""
 Esti un asistent care ajuta studentii sa isi aleaga coordonatorul pentru lucrarea de licenta.Cand primesti lista de profesori si mesajul studentului raspunde **exclusiv** cu 2-3 nume de profesori recomandati si o justificare foarte scurta (1 propozitie).
 Lista profesorilor este in formatul: Nume | Domenii | Materii.
 
@@ -56,24 +43,43 @@ Mesajul studentului:
 "{user_message}"
 
 """
+    else:
+        logger.info("Mesajul nu are termeni comuni cu lista profesorilor, se cer detalii studentului")
+        prompt = f"""
+Esti un asistent care ajuta studentii sa isi aleaga coordonatorul pentru lucrarea de licenta.Mesajul studentului nu se potriveste cu domeniile sau materiile niciunui profesor, asa ca nu recomanda niciun nume: cere-i, intr-o singura propozitie, sa precizeze domeniul, tema sau materiile care il intereseaza.
 
-            headers = {
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json"
-            }
+Mesajul studentului:
+"{user_message}"
+
+"""
 
-            payload = {
-                "model": OPENAI_MODEL,
-                "messages": [
-                    {"role": "system", "content": "Esti un asistent academic."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.7
-            }
+    return [
+        {"role": "system", "content": "Esti un asistent academic."},
+        {"role": "user", "content": prompt}
+    ]
 
-            response = requests.post(OPENAI_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
-            reply = response.json()["choices"][0]["message"]["content"].strip()
+
+def format_sse(payload: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def register_routes_chatbot(app, Session):
+    logger.info("Inregistrare rute pentru chatbot")
+
+    @chatbot_bp.route('/chat', methods=['POST'])
+    def chat_with_bot():
+        try:
+            data = request.get_json()
+            user_message = data.get("message", "").strip()
+
+            if not user_message:
+                return handle_response(message="Mesajul este gol", status_code=HTTP_ERROR_CODE)
+
+            reply = chat_response_cache.get(user_message)
+            if reply is None:
+                reply = chat_client.complete(build_chat_messages(user_message, Session), temperature=0.7)
+                chat_response_cache.put(user_message, reply)
 
             return handle_response(
                 message="Raspuns generat cu succes",
@@ -87,7 +93,58 @@ Mesajul studentului:
                 message=f"Eroare la generarea raspunsului: {str(e)}",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
+
+    @chatbot_bp.route('/chat/stream', methods=['POST'])
+    def chat_with_bot_stream():
+        """
+        Varianta cu streaming a rutei /chat: raspunsul este trimis ca Server-Sent Events, cate un
+        eveniment {"delta": ...} pentru fiecare fragment, urmat de evenimentul 'done' sau 'error'.
+        """
+        try:
+            data = request.get_json()
+            user_message = data.get("message", "").strip()
+
+            if not user_message:
+                return handle_response(message="Mesajul este gol", status_code=HTTP_ERROR_CODE)
+
+            cached_reply = chat_response_cache.get(user_message)
+            messages = build_chat_messages(user_message, Session) if cached_reply is None else None
+
+        except Exception as e:
+            logger.error(f"Eroare OpenAI Chatbot: {str(e)}")
+            return handle_response(
+                message=f"Eroare la generarea raspunsului: {str(e)}",
+                status_code=HTTP_ERROR_CODE
+            )
+
+        def generate():
+            if cached_reply is not None:
+                yield format_sse({"delta": cached_reply})
+                yield format_sse({}, event="done")
+                return
+            try:
+                reply = []
+                # closing: la deconectarea clientului generatorul clientului de chat este inchis imediat,
+                # deci locul ocupat este eliberat si proba circuit breaker-ului nu ramane fara rezultat
+                with closing(chat_client.stream(messages, temperature=0.7)) as deltas:
+                    for delta in deltas:
+                        reply.append(delta)
+                        yield format_sse({"delta": delta})
+                chat_response_cache.put(user_message, "".join(reply).strip())
+                yield format_sse({}, event="done")
+            except Exception as e:
+                logger.error(f"Eroare OpenAI Chatbot (stream): {str(e)}")
+                yield format_sse({"message": f"Eroare la generarea raspunsului: {str(e)}"}, event="error")
+
+        return Response(stream_with_context(generate()), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @chatbot_bp.route('/chat/metrics', methods=['GET'])
+    def get_chat_metrics():
+        return handle_response(
+            message=DATA_MESSAGE,
+            data={**chat_client.metrics(), "cache": chat_response_cache.metrics()},
+            status_code=HTTP_OK_CODE
+        )
 
     app.register_blueprint(chatbot_bp)
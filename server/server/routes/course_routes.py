@@ -7,16 +7,14 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from server.models.course import Course
 from server.services.course_service import CourseService
 from server.services.student_courses_service import StudentCoursesService
+from server.database_connection.request_session import get_request_session
 from server.utils.handle_response import handle_response
 from server.common.common_constants import HTTP_BAD_REQUEST_CODE, HTTP_OK_CODE, HTTP_ERROR_CODE, \
     STUDENT_NOT_FOUND_ERROR, DATA_MESSAGE, HTTP_NOT_FOUND_CODE
 from server.common.logger import setup_logger
 from server.models.column_names import StudentTableColumns
 from server.models.student import Student
-from server.services.group_service import GroupService
-from server.services.student_service import StudentService
-from server.services.study_year_service import StudyYearService
-from server.services.subgroup_service import SubgroupService
+from server.services.student_hierarchy_service import StudentHierarchyService
 
 courses_bp = Blueprint('courses', __name__)
 logger = setup_logger(__name__)
@@ -27,7 +25,7 @@ def register_routes_course(app, Session):
 
     @courses_bp.route('/courses/by-student-id', methods=['GET'])
     def get_courses_for_student():
-        session = Session()
+        session = get_request_session()
         try:
             student_courses_service = StudentCoursesService(session)
             course_service = CourseService(session)
@@ -43,10 +41,12 @@ def register_routes_course(app, Session):
             logger.info(f"Se obtin datele orarului pentru studentul cu ID-ul {student_id}")
             courses: list[Course] = student_courses_service.get_all_courses_for_a_student(student_uuid)
 
+            student_counts = student_courses_service.get_no_students_for_courses(
+                course.course_id for course in courses)
             serialized_courses = [
                 {
                     **course_service.serialize_course(course),
-                    "student_count": student_courses_service.get_no_students(course.course_id)
+                    "student_count": student_counts[course.course_id]
                 }
                 for course in courses
             ]
@@ -64,23 +64,17 @@ def register_routes_course(app, Session):
                 data="Null",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     @courses_bp.route('/filtered-courses', methods=['GET'])
     def get_available_courses():
-        session = Session()
+        session = get_request_session()
         try:
-            subgroup_service = SubgroupService(session)
-            group_service = GroupService(session)
-            study_year_service = StudyYearService(session)
+            student_hierarchy_service = StudentHierarchyService(session)
             course_service = CourseService(session)
 
             subgroup_id = request.args.get('subgroup_id', '')
             subgroup_UUID = UUID(subgroup_id)
-            subgroup = subgroup_service.get_subgroup_by_id(subgroup_UUID)
-            group = group_service.get_group_by_id(subgroup.group_id)
-            study_year = study_year_service.get_study_year_by_id(group.study_year_id)
+            study_year = student_hierarchy_service.get_by_subgroup_id(subgroup_UUID).study_year
             filtered_courses = course_service.search_unique_names_courses(study_year.study_year_id)
 
             return handle_response(
@@ -96,15 +90,12 @@ def register_routes_course(app, Session):
                 data=[],
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     @courses_bp.route('/wanted-courses', methods=['GET'])
     def get_wanted_courses():
-        session = Session()
+        session = get_request_session()
         try:
-            subgroup_service = SubgroupService(session)
-            group_service = GroupService(session)
+            student_hierarchy_service = StudentHierarchyService(session)
             course_service = CourseService(session)
             student_courses_service = StudentCoursesService(session)
 
@@ -120,14 +111,16 @@ def register_routes_course(app, Session):
                 )
             subgroup_UUID = UUID(subgroup_id)
             logger.info(f"Cautare cursuri dupa nume='{name}', tip='{course_type}', grupa='{subgroup_UUID}'")
-            subgroup = subgroup_service.get_subgroup_by_id(subgroup_UUID)
-            group = group_service.get_group_by_id(subgroup.group_id)
-            filtered_courses = course_service.search_courses_by_name_and_type(group.group_id, name, course_type)
+            study_year = student_hierarchy_service.get_by_subgroup_id(subgroup_UUID).study_year
+            filtered_courses = course_service.search_courses_by_name_and_type(study_year.study_year_id, name,
+                                                                              course_type)
 
+            student_counts = student_courses_service.get_no_students_for_courses(
+                course.course_id for course in filtered_courses)
             serialized_courses = [
                 {
                     **course_service.serialize_course(course),
-                    "student_count": student_courses_service.get_no_students(course.course_id)
+                    "student_count": student_counts[course.course_id]
                 }
                 for course in filtered_courses
             ]
@@ -145,12 +138,10 @@ def register_routes_course(app, Session):
                 data=[],
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     @courses_bp.route('/delete-courses', methods=['DELETE'])
     def delete_courses_for_student():
-        session = Session()
+        session = get_request_session()
         try:
             student_courses_service = StudentCoursesService(session)
             data = request.get_json()
@@ -195,16 +186,12 @@ def register_routes_course(app, Session):
                 data="Null",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     @courses_bp.route('/reset-courses', methods=['POST'])
     def reset_courses_for_student():
-        session = Session()
+        session = get_request_session()
         try:
-            student_service = StudentService(session)
-            subgroup_service = SubgroupService(session)
-            group_service = GroupService(session)
+            student_hierarchy_service = StudentHierarchyService(session)
             course_service = CourseService(session)
             student_courses_service = StudentCoursesService(session)
             data = request.get_json()
@@ -226,26 +213,27 @@ def register_routes_course(app, Session):
                     status_code=400
                 )
 
-            student = student_service.get_student_by_id(student_UUID)
+            hierarchy = student_hierarchy_service.get_by_student_id(student_UUID)
 
-            if not student:
+            if not hierarchy:
                 return handle_response(
                     message=STUDENT_NOT_FOUND_ERROR,
                     data="Null",
                     status_code=HTTP_NOT_FOUND_CODE
                 )
 
-            subgroup = subgroup_service.get_subgroup_by_id(student.subgroup_id)
-            group = group_service.get_group_by_id(subgroup.group_id)
+            student, subgroup, group = hierarchy.student, hierarchy.subgroup, hierarchy.group
             logger.info(f"Se insereaza datele orarului pentru studentul din subgrupa {subgroup.subgroup_id}")
             courses: list[Course] = course_service.get_schedule_by_subgroup(subgroup, group)
             student_courses_service.update_student_courses(student.student_id, courses)
             courses = student_courses_service.get_all_courses_for_a_student(student_UUID)
 
+            student_counts = student_courses_service.get_no_students_for_courses(
+                course.course_id for course in courses)
             serialized_courses = [
                 {
                     **course_service.serialize_course(course),
-                    "student_count": student_courses_service.get_no_students(course.course_id)
+                    "student_count": student_counts[course.course_id]
                 }
                 for course in courses
             ]
@@ -263,8 +251,6 @@ def register_routes_course(app, Session):
                 data="Null",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     app.register_blueprint(courses_bp)
     logger.info("Rutele pentru cursuri au fost inregistrate cu succes")
@@ -0,0 +1,29 @@
+from flask import Blueprint
+
+from server.common.common_constants import DATA_MESSAGE, HTTP_OK_CODE, DB_METRICS_ENABLED
+from server.common.logger import setup_logger
+from server.database_connection.db_connection import get_pool_metrics
+from server.utils.handle_response import handle_response
+
+database_bp = Blueprint('database', __name__)
+logger = setup_logger(__name__)
+
+
+def register_routes_database(app, engine, enabled: bool = DB_METRICS_ENABLED):
+    """
+    Inregistreaza /db/metrics doar daca enabled (DB_METRICS_ENABLED); ruta nu are autentificare.
+    """
+    if not enabled:
+        logger.info("Rutele pentru baza de date sunt dezactivate (DB_METRICS_ENABLED)")
+        return
+    logger.info("Inregistrare rute pentru baza de date")
+
+    @database_bp.route('/db/metrics', methods=['GET'])
+    def get_database_metrics():
+        return handle_response(
+            message=DATA_MESSAGE,
+            data={"pool": get_pool_metrics(engine)},
+            status_code=HTTP_OK_CODE
+        )
+
+    app.register_blueprint(database_bp)
@@ -1,9 +1,10 @@
 from flask import Blueprint, request
 from werkzeug.security import generate_password_hash, check_password_hash
 
-from server.utils.handle_response import handle_response
-from server.common.common_constants import HTTP_BAD_REQUEST_CODE, HTTP_OK_CODE, HTTP_ERROR_CODE, \
-    STUDENT_NOT_FOUND_ERROR, DATA_MESSAGE, HTTP_NOT_FOUND_CODE
+from server.utils.handle_response import handle_response, handle_cached_response, versioned_response
+from server.utils.reference_data_cache import reference_data_cache
+from server.common.common_constants import HTTP_BAD_REQUEST_CODE, HTTP_ERROR_CODE, \
+    STUDENT_NOT_FOUND_ERROR, HTTP_NOT_FOUND_CODE
 from server.common.logger import setup_logger
 from server.models.column_names import StudentTableColumns
 from server.models.student import Student
@@ -18,29 +19,29 @@ logger = setup_logger(__name__)
 def register_routes_group(app, Session):
     logger.info("Inregistrare rute pentru grupe")
 
-    @groups_bp.route('/groups', methods=['GET'])
-    def get_all_groups():
-        session = Session()
-        try:
-            group_service = GroupService(session)
-            groups = group_service.get_all_groups()
+    def load_groups(session):
+        group_service = GroupService(session)
+        groups = group_service.get_all_groups()
 
-            serialized_groups = [
-                {
-                    "group_id": group.group_id,
-                    "group_number": group.group_number,
-                    "study_year_id": group.study_year_id
-                }
-                for group in groups
-            ]
+        serialized_groups = [
+            {
+                "group_id": group.group_id,
+                "group_number": group.group_number,
+                "study_year_id": group.study_year_id
+            }
+            for group in groups
+        ]
 
-            logger.info(f"S-au preluat {len(serialized_groups)} grupe")
+        logger.info(f"S-au preluat {len(serialized_groups)} grupe")
+        return serialized_groups
 
-            return handle_response(
-                message=DATA_MESSAGE,
-                data=serialized_groups,
-                status_code=HTTP_OK_CODE
-            )
+    reference_data_cache.register("groups", load_groups)
+
+    @groups_bp.route('/groups', methods=['GET'])
+    @versioned_response
+    def get_all_groups():
+        try:
+            return handle_cached_response(reference_data_cache.get("groups", Session))
 
         except Exception as e:
             logger.error(f"Eroare la preluarea grupelor: {str(e)}")
@@ -48,8 +49,6 @@ def register_routes_group(app, Session):
                 message=f"Nu s-au putut prelua grupele: {str(e)}",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     app.register_blueprint(groups_bp)
     logger.info("Rutele pentru grupe au fost inregistrate cu succes")
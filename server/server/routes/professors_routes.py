@@ -1,6 +1,7 @@
 from flask import Blueprint, request
 from server.services.professor_service import ProfessorService
-from server.utils.handle_response import handle_response
+from server.database_connection.request_session import get_request_session
+from server.utils.handle_response import handle_response, versioned_response
 from server.common.common_constants import HTTP_OK_CODE, HTTP_ERROR_CODE, DATA_MESSAGE, HTTP_BAD_REQUEST_CODE
 from server.common.logger import setup_logger
 
@@ -11,6 +12,7 @@ def register_routes_professor(app, Session):
     logger.info("Inregistrare rute pentru profesori")
 
     @professor_bp.route('/professors', methods=['GET'])
+    @versioned_response
     def get_professors_by_department():
         department = request.args.get('department')
         if not department:
@@ -19,7 +21,7 @@ def register_routes_professor(app, Session):
                 message="Parametrul 'department' lipseste"
             )
 
-        session = Session()
+        session = get_request_session()
         try:
             professor_service = ProfessorService(session)
             professors = professor_service.get_all_professors_from_department(department)
@@ -37,8 +39,6 @@ def register_routes_professor(app, Session):
                 status_code=HTTP_ERROR_CODE,
                 message=f"Eroare la obtinerea profesorilor: {str(e)}"
             )
-        finally:
-            session.close()
 
     app.register_blueprint(professor_bp)
     logger.info("Rutele pentru profesori au fost inregistrate cu succes")
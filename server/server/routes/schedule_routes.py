@@ -5,15 +5,13 @@ from flask import Blueprint, request
 from sqlalchemy import UUID
 
 from server.services.academic_schedule_service import AcademicScheduleService
-from server.utils.handle_response import handle_response
+from server.database_connection.request_session import get_request_session
+from server.utils.handle_response import handle_response, versioned_response
 from server.common.common_constants import HTTP_BAD_REQUEST_CODE, HTTP_OK_CODE, HTTP_ERROR_CODE, \
     STUDENT_NOT_FOUND_ERROR, DATA_MESSAGE, HTTP_NOT_FOUND_CODE
 from server.common.logger import setup_logger
-from server.services.group_service import GroupService
-from server.services.specialization_service import SpecializationService
-from server.services.student_service import StudentService
+from server.services.student_hierarchy_service import StudentHierarchyService
 from server.services.study_year_service import StudyYearService
-from server.services.subgroup_service import SubgroupService
 
 schedule_bp = Blueprint('academic_schedule', __name__)
 logger = setup_logger(__name__)
@@ -22,19 +20,17 @@ def register_routes_schedule(app, Session):
     logger.info("Inregistrare rute pentru orar academic")
 
     @schedule_bp.route('/schedule', methods=['GET'])
+    @versioned_response
     def get_schedule():
-        session = Session()
+        session = get_request_session()
         try:
             academic_schedule_service = AcademicScheduleService(session)
-            subgroup_service = SubgroupService(session)
-            group_service = GroupService(session)
+            student_hierarchy_service = StudentHierarchyService(session)
             study_year_service = StudyYearService(session)
 
             subgroup_id = request.args.get('subgroup_id')
             subgroup_UUID = uuid.UUID(subgroup_id)
-            subgroup = subgroup_service.get_subgroup_by_id(subgroup_UUID)
-            group = group_service.get_group_by_id(subgroup.group_id)
-            study_year = study_year_service.get_study_year_by_id(group.study_year_id)
+            study_year = student_hierarchy_service.get_by_subgroup_id(subgroup_UUID).study_year
             is_terminal = study_year_service.find_is_last_year(study_year.study_year_id)
             logger.info(f"Studentul este in an terminal: {is_terminal}")
 
@@ -106,8 +102,6 @@ def register_routes_schedule(app, Session):
                 status_code=HTTP_ERROR_CODE,
                 message=f"Eroare la obtinerea orarului academic: {str(e)}"
             )
-        finally:
-            session.close()
 
     app.register_blueprint(schedule_bp)
     logger.info("Rutele pentru orar academic au fost inregistrate cu succes")
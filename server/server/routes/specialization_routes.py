@@ -1,9 +1,10 @@
 from flask import Blueprint, request
 from werkzeug.security import generate_password_hash, check_password_hash
 
-from server.utils.handle_response import handle_response
-from server.common.common_constants import HTTP_BAD_REQUEST_CODE, HTTP_OK_CODE, HTTP_ERROR_CODE, \
-    STUDENT_NOT_FOUND_ERROR, DATA_MESSAGE, HTTP_NOT_FOUND_CODE
+from server.utils.handle_response import handle_response, handle_cached_response, versioned_response
+from server.utils.reference_data_cache import reference_data_cache
+from server.common.common_constants import HTTP_BAD_REQUEST_CODE, HTTP_ERROR_CODE, \
+    STUDENT_NOT_FOUND_ERROR, HTTP_NOT_FOUND_CODE
 from server.common.logger import setup_logger
 from server.models.column_names import StudentTableColumns
 from server.models.student import Student
@@ -19,29 +20,29 @@ logger = setup_logger(__name__)
 def register_routes_specialization(app, Session):
     logger.info("Inregistrare rute pentru specializari")
 
-    @specializations_bp.route('/specializations', methods=['GET'])
-    def get_all_specializations():
-        session = Session()
-        try:
-            specialization_service = SpecializationService(session)
-            specializations = specialization_service.get_all_specializations()
+    def load_specializations(session):
+        specialization_service = SpecializationService(session)
+        specializations = specialization_service.get_all_specializations()
 
-            serialized_specializations = [
-                {
-                    "specialization_id": spec.specialization_id,
-                    "name": spec.name,
-                    "language": spec.language
-                }
-                for spec in specializations
-            ]
+        serialized_specializations = [
+            {
+                "specialization_id": spec.specialization_id,
+                "name": spec.name,
+                "language": spec.language
+            }
+            for spec in specializations
+        ]
 
-            logger.info(f"S-au preluat {len(serialized_specializations)} specializari")
+        logger.info(f"S-au preluat {len(serialized_specializations)} specializari")
+        return serialized_specializations
 
-            return handle_response(
-                message=DATA_MESSAGE,
-                data=serialized_specializations,
-                status_code=HTTP_OK_CODE
-            )
+    reference_data_cache.register("specializations", load_specializations)
+
+    @specializations_bp.route('/specializations', methods=['GET'])
+    @versioned_response
+    def get_all_specializations():
+        try:
+            return handle_cached_response(reference_data_cache.get("specializations", Session))
 
         except Exception as e:
             logger.error(f"Eroare la preluarea specializarilor: {str(e)}")
@@ -49,8 +50,6 @@ def register_routes_specialization(app, Session):
                 message=f"Nu s-au putut prelua specializarile: {str(e)}",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     app.register_blueprint(specializations_bp)
     logger.info("Rutele pentru specializari au fost inregistrate cu succes")
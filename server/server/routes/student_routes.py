@@ -5,6 +5,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from server.models.course import Course
 from server.services.course_service import CourseService
 from server.services.student_courses_service import StudentCoursesService
+from server.database_connection.request_session import get_request_session
 from server.utils.handle_response import handle_response
 from server.common.common_constants import HTTP_BAD_REQUEST_CODE, HTTP_OK_CODE, HTTP_ERROR_CODE, \
     STUDENT_NOT_FOUND_ERROR, DATA_MESSAGE, HTTP_NOT_FOUND_CODE
@@ -12,9 +13,8 @@ from server.common.logger import setup_logger
 from server.models.column_names import StudentTableColumns
 from server.models.student import Student
 from server.services.group_service import GroupService
-from server.services.specialization_service import SpecializationService
+from server.services.student_hierarchy_service import StudentHierarchyService
 from server.services.student_service import StudentService
-from server.services.study_year_service import StudyYearService
 from server.services.subgroup_service import SubgroupService
 
 students_bp = Blueprint('students', __name__)
@@ -25,7 +25,7 @@ def register_routes_student(app, Session):
 
     @students_bp.route('/user-subgroup-group', methods=['GET'])
     def get_user_subgroup_and_group():
-        session = Session()
+        session = get_request_session()
         try:
             subgroup_service = SubgroupService(session)
             group_service = GroupService(session)
@@ -57,17 +57,14 @@ def register_routes_student(app, Session):
                 message=f'Eroare de server: {str(e)}',
                 data=None
             )
-        finally:
-            session.close()
 
     @students_bp.route('/login', methods=['POST'])
     def get_student_by_email_and_password():
-        session = Session()
+        session = get_request_session()
         try:
             student_service = StudentService(session)
+            student_hierarchy_service = StudentHierarchyService(session)
             student_courses_service = StudentCoursesService(session)
-            subgroup_service = SubgroupService(session)
-            group_service = GroupService(session)
             course_service = CourseService(session)
 
             data = request.json
@@ -76,7 +73,8 @@ def register_routes_student(app, Session):
 
             logger.info(f"Tentativa de autentificare cu email-ul: {email}")
 
-            student = student_service.get_student_by_email(email)
+            hierarchy = student_hierarchy_service.get_by_student_email(email)
+            student = hierarchy.student if hierarchy else None
             if not student:
                 logger.warning(f"Student negasit pentru email-ul: {email}")
                 return handle_response(STUDENT_NOT_FOUND_ERROR, status_code=HTTP_NOT_FOUND_CODE)
@@ -93,14 +91,15 @@ def register_routes_student(app, Session):
             if not existing_courses:
                 logger.info(f"Studentul {student.student_id} nu are cursuri. Se adauga orarul.")
                 try:
-                    subgroup = subgroup_service.get_subgroup_by_id(student.subgroup_id)
-                    group = group_service.get_group_by_id(subgroup.group_id)
-                    courses = course_service.get_schedule_by_subgroup(subgroup, group)
-                    if courses:
-                        student_courses_service.update_student_courses(student.student_id, courses)
-                        logger.info(f"Adaugate {len(courses)} cursuri pentru studentul {student.student_id}")
+                    if hierarchy.subgroup is None:
+                        logger.warning(f"Studentul {student.student_id} nu are o subgrupa asociata")
                     else:
-                        logger.warning(f"Nu s-au gasit cursuri pentru subgrupa {subgroup.subgroup_id}")
+                        courses = course_service.get_schedule_by_subgroup(hierarchy.subgroup, hierarchy.group)
+                        if courses:
+                            student_courses_service.update_student_courses(student.student_id, courses)
+                            logger.info(f"Adaugate {len(courses)} cursuri pentru studentul {student.student_id}")
+                        else:
+                            logger.warning(f"Nu s-au gasit cursuri pentru subgrupa {hierarchy.subgroup.subgroup_id}")
                 except Exception as e:
                     logger.error(f"Eroare la adaugarea cursurilor: {str(e)}")
 
@@ -121,18 +120,13 @@ def register_routes_student(app, Session):
                 message="A aparut o eroare neasteptata in timpul autentificarii",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     @students_bp.route('/signup', methods=['POST'])
     def sign_up_student():
-        session = Session()
+        session = get_request_session()
         try:
             student_service = StudentService(session)
-            specialization_service = SpecializationService(session)
-            study_year_service = StudyYearService(session)
-            subgroup_service = SubgroupService(session)
-            group_service = GroupService(session)
+            student_hierarchy_service = StudentHierarchyService(session)
             course_service = CourseService(session)
             student_courses_service = StudentCoursesService(session)
 
@@ -148,13 +142,9 @@ def register_routes_student(app, Session):
             password = data.get(StudentTableColumns.PASSWORD.value)
             specialization_name = data.get("specialization_name")
             specialization_language = data.get("specialization_language")
-            specialization = specialization_service.get_specialization_by_name_and_language(specialization_name, specialization_language)
             study_year_number = data.get("study_year")
-            study_year = study_year_service.get_study_year(study_year_number, specialization)
             group_number = data.get("group_number")
             subgroup_number = data.get("subgroup_number")
-            group = group_service.get_group(group_number, study_year)
-            subgroup_id = subgroup_service.get_subgroup(subgroup_number, group).subgroup_id
 
             missing_fields = []
             for field, value in [('first_name', first_name), ('last_name', last_name), ('email', email),
@@ -169,8 +159,13 @@ def register_routes_student(app, Session):
                 missing = ', '.join(missing_fields)
                 return handle_response(message=f"Lipsesc campurile obligatorii: {missing}", status_code=HTTP_BAD_REQUEST_CODE)
 
+            hierarchy = student_hierarchy_service.get_by_numbers(specialization_name, specialization_language,
+                                                                 study_year_number, group_number, subgroup_number)
+            if not hierarchy:
+                return handle_response(message="Subgrupa nu a fost gasita", status_code=HTTP_BAD_REQUEST_CODE)
+
             new_student = Student(first_name=first_name, last_name=last_name, email=email,
-                                  password=password, subgroup_id=subgroup_id)
+                                  password=password, subgroup_id=hierarchy.subgroup.subgroup_id)
 
             if student_service.get_student_by_email(email):
                 return handle_response(message='Acest email este deja folosit', status_code=HTTP_ERROR_CODE)
@@ -180,9 +175,7 @@ def register_routes_student(app, Session):
             if student:
                 serialized_user = student_service.serialize_student(student)
                 token = student_service.generate_jwt(student)
-                subgroup = subgroup_service.get_subgroup_by_id(student.subgroup_id)
-                group = group_service.get_group_by_id(subgroup.group_id)
-                courses = course_service.get_schedule_by_subgroup(subgroup, group)
+                courses = course_service.get_schedule_by_subgroup(hierarchy.subgroup, hierarchy.group)
                 if courses:
                     student_courses_service.update_student_courses(student.student_id, courses)
                 return handle_response(
@@ -199,27 +192,20 @@ def register_routes_student(app, Session):
                 message="A aparut o eroare neasteptata in timpul inregistrarii",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     @students_bp.route('/student-profile/<student_id>', methods=['GET'])
     def get_complete_student_profile(student_id):
-        session = Session()
+        session = get_request_session()
         try:
-            student_service = StudentService(session)
-            specialization_service = SpecializationService(session)
-            study_year_service = StudyYearService(session)
-            subgroup_service = SubgroupService(session)
-            group_service = GroupService(session)
+            student_hierarchy_service = StudentHierarchyService(session)
 
-            student = student_service.get_student_by_id(student_id)
-            if not student:
+            hierarchy = student_hierarchy_service.get_by_student_id(student_id)
+            if not hierarchy:
                 return handle_response(message="Studentul nu a fost gasit", status_code=HTTP_NOT_FOUND_CODE)
+            if hierarchy.subgroup is None:
+                return handle_response(message="Studentul nu are o subgrupa asociata", status_code=HTTP_ERROR_CODE)
 
-            subgroup = subgroup_service.get_subgroup_by_id(student.subgroup_id)
-            group = group_service.get_group_by_id(subgroup.group_id)
-            study_year = study_year_service.get_study_year_by_id(group.study_year_id)
-            specialization = specialization_service.get_specialization_by_id(study_year.specialization_id)
+            student, subgroup, group, study_year, specialization = hierarchy
 
             complete_profile = {
                 'student_id': str(student.student_id),
@@ -246,16 +232,13 @@ def register_routes_student(app, Session):
                 message="Eroare de server",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     @students_bp.route('/update-student-profile', methods=['PUT'])
     def update_student_profile():
-        session = Session()
+        session = get_request_session()
         try:
             student_service = StudentService(session)
-            subgroup_service = SubgroupService(session)
-            group_service = GroupService(session)
+            student_hierarchy_service = StudentHierarchyService(session)
             course_service = CourseService(session)
             student_courses_service = StudentCoursesService(session)
 
@@ -276,8 +259,8 @@ def register_routes_student(app, Session):
             if not student:
                 return handle_response(message="Studentul nu a fost gasit", status_code=HTTP_NOT_FOUND_CODE)
 
-            subgroup = subgroup_service.get_subgroup_by_id(subgroup_id)
-            if not subgroup:
+            hierarchy = student_hierarchy_service.get_by_subgroup_id(subgroup_id)
+            if not hierarchy:
                 return handle_response(message="Subgrupa nu a fost gasita", status_code=HTTP_BAD_REQUEST_CODE)
 
             student.first_name = first_name.strip()
@@ -289,10 +272,8 @@ def register_routes_student(app, Session):
             updated_student = student_service.update_student(student)
 
             if updated_student and old_subgroup_id != updated_student.subgroup_id:
-                group = group_service.get_group_by_id(subgroup.group_id)
-                if group:
-                    courses = course_service.get_schedule_by_subgroup(subgroup, group)
-                    student_courses_service.update_student_courses(student.student_id, courses)
+                courses = course_service.get_schedule_by_subgroup(hierarchy.subgroup, hierarchy.group)
+                student_courses_service.update_student_courses(student.student_id, courses)
 
             serialized_student = student_service.serialize_student(updated_student)
             return handle_response(
@@ -307,8 +288,6 @@ def register_routes_student(app, Session):
                 message="A aparut o eroare neasteptata in timpul actualizarii profilului",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     app.register_blueprint(students_bp)
     logger.info("Rutele pentru studenti au fost inregistrate cu succes")
@@ -3,8 +3,9 @@ from flask import Blueprint
 from server.common.logger import setup_logger
 from server.services.group_service import GroupService
 from server.services.subgroup_service import SubgroupService
-from server.utils.handle_response import handle_response
-from server.common.common_constants import HTTP_OK_CODE, HTTP_ERROR_CODE, DATA_MESSAGE
+from server.utils.handle_response import handle_response, handle_cached_response, versioned_response
+from server.utils.reference_data_cache import reference_data_cache
+from server.common.common_constants import HTTP_ERROR_CODE
 from server.services.study_year_service import StudyYearService
 
 subgroups_bp = Blueprint('subgroups', __name__)
@@ -13,29 +14,29 @@ logger = setup_logger(__name__)
 def register_routes_subgroup(app, Session):
     logger.info("Inregistrare rute pentru subgrupe")
 
-    @subgroups_bp.route('/subgroups', methods=['GET'])
-    def get_all_subgroups():
-        session = Session()
-        try:
-            subgroup_service = SubgroupService(session)
-            subgroups = subgroup_service.get_all_subgroups()
+    def load_subgroups(session):
+        subgroup_service = SubgroupService(session)
+        subgroups = subgroup_service.get_all_subgroups()
 
-            serialized_subgroups = [
-                {
-                    "subgroup_id": subgroup.subgroup_id,
-                    "subgroup_number": subgroup.subgroup_number,
-                    "group_id": subgroup.group_id
-                }
-                for subgroup in subgroups
-            ]
+        serialized_subgroups = [
+            {
+                "subgroup_id": subgroup.subgroup_id,
+                "subgroup_number": subgroup.subgroup_number,
+                "group_id": subgroup.group_id
+            }
+            for subgroup in subgroups
+        ]
 
-            logger.info(f"S-au preluat {len(serialized_subgroups)} subgrupe")
+        logger.info(f"S-au preluat {len(serialized_subgroups)} subgrupe")
+        return serialized_subgroups
 
-            return handle_response(
-                message=DATA_MESSAGE,
-                data=serialized_subgroups,
-                status_code=HTTP_OK_CODE
-            )
+    reference_data_cache.register("subgroups", load_subgroups)
+
+    @subgroups_bp.route('/subgroups', methods=['GET'])
+    @versioned_response
+    def get_all_subgroups():
+        try:
+            return handle_cached_response(reference_data_cache.get("subgroups", Session))
 
         except Exception as e:
             logger.error(f"Eroare la preluarea subgrupelor: {str(e)}")
@@ -43,8 +44,6 @@ def register_routes_subgroup(app, Session):
                 message=f"Nu s-au putut prelua subgrupele: {str(e)}",
                 status_code=HTTP_ERROR_CODE
             )
-        finally:
-            session.close()
 
     app.register_blueprint(subgroups_bp)
     logger.info("Rutele pentru subgrupe au fost inregistrate cu succes")
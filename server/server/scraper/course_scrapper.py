@@ -1,7 +1,7 @@
 from typing import Tuple
 from datetime import time
+import time as timer
 import requests
-from bs4 import BeautifulSoup
 import re
 
 from sqlalchemy import text
@@ -19,6 +19,9 @@ from server.repositories.room_repository import RoomRepository
 from server.repositories.specialization_repository import SpecializationRepository
 from server.repositories.study_year_repository import StudyYearRepository
 from server.repositories.subgroup_repository import SubgroupRepository
+from server.scraper.http_client import fetch_text
+from server.scraper.lookup_cache import LookupCache
+from server.scraper.timetable_parser import get_timetable_parser
 
 
 class CourseScrapper:
@@ -28,13 +31,23 @@ class CourseScrapper:
     """
     logger = setup_logger(__name__)
 
-    def __init__(self, session):
+    def __init__(self, session, http_session=None, incremental=False, page_cache=None, parser=None):
         """
         Initializeaza obiectul CourseScrapper cu sesiunea bazei de date.
         Argumente:
             session: Sesiunea SQLAlchemy pentru operatiuni cu baza de date
+            http_session: Sesiunea HTTP partajata (optional); implicit se foloseste requests direct
+            incremental: Daca True, cursurile nu sunt inserate pe pagina, ci colectate pentru sync_scraped_courses
+            page_cache: Cache-ul de pagini al rularii curente (optional)
+            parser: Backend-ul de parsare a paginilor cu orare (optional); implicit cel din SCRAPER_HTML_PARSER
         """
         self.session = session
+        self.http_session = http_session
+        self.page_cache = page_cache
+        self.parser = parser or get_timetable_parser()
+        self.incremental = incremental
+        self.scraped_courses = []
+        self.skipped_study_year_ids = set()
         self.professorRepository = ProfessorRepository(session)
         self.specializationRepository = SpecializationRepository(session)
         self.studyYearRepository = StudyYearRepository(session)
@@ -42,39 +55,81 @@ class CourseScrapper:
         self.subgroupRepository = SubgroupRepository(session)
         self.roomRepository = RoomRepository(session)
         self.courseRepository = CourseRepository(session)
+        self.cache = LookupCache()
+        self.course_counts = {"inserted": 0, "duplicates": 0}
+        self.timings = {"fetch": 0.0, "parse": 0.0, "write": 0.0}
 
-    def scrape_tables(self, url, study_year):
+    def preload_cache(self):
         """
-        Extrage datele din toate tabelele de pe o pagina web si proceseaza continutul fiecarui element.
-        Parseza tabelele cu orare si salveaza cursurile in baza de date.
+        Incarca in bloc cache-ul de sali, profesori, grupe si subgrupe la inceputul unei rulari.
+        """
+        self.cache.preload(self.session, include_courses=not self.incremental)
+
+    def fetch_page(self, url) -> str:
+        """
+        Descarca pagina cu orarul. Nu foloseste sesiunea bazei de date, deci poate fi
+        apelata in paralel din mai multe thread-uri.
 
         Argumente:
             url: URL-ul paginii web de unde se extrag datele
-            study_year: Obiectul StudyYear pentru care se proceseaza cursurile
+
+        Returneaza:
+            Continutul HTML al paginii
         """
         try:
-            response = requests.get(url, timeout=30)
-            response.encoding = 'utf-8'
-            response.raise_for_status()
+            return fetch_text(url, self.http_session, self.page_cache)
         except requests.RequestException as e:
             error_msg = f"Eroare la accesarea URL-ului {url}: {e}"
             self.logger.error(error_msg)
             raise Exception(error_msg) from e
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        tables = soup.find_all('table')
-        if not tables:
+    def scrape_tables(self, url, study_year, html=None):
+        """
+        Extrage datele din toate tabelele de pe o pagina web si proceseaza continutul fiecarui element.
+        Parseza tabelele cu orare si salveaza cursurile in baza de date.
+
+        Argumente:
+            url: URL-ul paginii web de unde se extrag datele
+            study_year: Obiectul StudyYear pentru care se proceseaza cursurile
+            html: Continutul paginii, daca a fost deja descarcat (altfel se descarca acum)
+        """
+        if html is None:
+            start = timer.perf_counter()
+            html = self.fetch_page(url)
+            self.timings["fetch"] += timer.perf_counter() - start
+
+        start = timer.perf_counter()
+        groups = self.parse_tables(html, url)
+        self.timings["parse"] += timer.perf_counter() - start
+
+        start = timer.perf_counter()
+        self.save_groups(groups, study_year, url)
+        self.timings["write"] += timer.perf_counter() - start
+
+    def parse_tables(self, html, url) -> list[tuple[str, list[tuple[int, dict]] | None]]:
+        """
+        Parseaza pagina cu orarul fara a accesa baza de date.
+
+        Argumente:
+            html: Continutul HTML al paginii
+            url: URL-ul paginii (folosit in mesajele de eroare)
+
+        Returneaza:
+            Lista de perechi (numar_grupa, randuri), unde randuri este lista de (index_rand, dict_coloane)
+            sau None daca tabelul grupei nu a putut fi citit
+        """
+        has_tables, group_tables = self.parser.extract(html)
+        if not has_tables:
             self.logger.warning(f"Nu s-au gasit tabele in pagina {url}. Se omite procesarea acestei pagini.")
-            return
-        group_headers = soup.find_all('h1', string=re.compile(r'Grupa \d+'))
-        if not group_headers:
+            return []
+        if not group_tables:
             error_msg = f"Nu s-au gasit headerele de grupa in pagina {url}. Structura paginii s-a schimbat?"
             self.logger.error(error_msg)
             raise Exception(error_msg)
 
+        groups = []
         try:
-            for group_header in group_headers:
-                group_name = group_header.text.strip()
+            for group_name, table in group_tables:
 
                 group_match = re.search(r'Grupa (\d+)', group_name)
                 if not group_match:
@@ -84,50 +139,76 @@ class CourseScrapper:
 
                 group_number = group_match.group(1)
 
-                try:
-                    group = self.parse_group(group_number, study_year)
-                    if not group:
-                        self.logger.warning(f"Nu s-a putut parsa grupa {group_number}, se omite.")
-                        continue
-                except Exception as e:
-                    error_msg = f"Eroare la parsarea grupei {group_number}: {e}"
-                    self.logger.error(error_msg)
-                    raise Exception(error_msg) from e
-
-                table = group_header.find_next('table')
-                if not table:
+                if table is None:
                     self.logger.warning(f"Nu s-a gasit tabelul pentru grupa {group_number}, se omite.")
+                    groups.append((group_number, None))
                     continue
 
-                header_row = table.find('tr')
-                if not header_row:
+                if not table:
                     self.logger.warning(f"Nu s-a gasit randul de header pentru grupa {group_number}, se omite.")
+                    groups.append((group_number, None))
                     continue
 
-                headers = []
-                for th in header_row.find_all('th'):
-                    headers.append(th.text.strip())
-
+                headers = table[0][0]
                 if not headers:
                     self.logger.warning(f"Nu s-au gasit headerele pentru grupa {group_number}, se omite.")
+                    groups.append((group_number, None))
                     continue
 
-                for row_idx, row in enumerate(table.find_all('tr')[1:], 1):
-                    cells = row.find_all('td')
+                rows = []
+                for row_idx, (_, cells) in enumerate(table[1:], 1):
                     if not cells:
                         continue
+                    rows.append((row_idx, {headers[i]: cells[i] for i in range(len(cells)) if i < len(headers)}))
 
-                    try:
-                        row_dict = {headers[i]: cells[i].text.strip() for i in range(len(cells)) if i < len(headers)}
+                groups.append((group_number, rows))
 
-                        professor = self.parse_professor_name(row_dict.get("Cadrul didactic"))
-                        if not professor:
+        except Exception as e:
+            if "raise Exception(error_msg) from e" in str(e):
+                raise
+            error_msg = f"Eroare neasteptata la procesarea grupelor din {url}: {e}"
+            self.logger.error(error_msg)
+            raise Exception(error_msg) from e
+
+        return groups
+
+    def save_groups(self, groups, study_year, url):
+        """
+        Salveaza in baza de date grupele si cursurile obtinute prin parse_tables.
+        Cursurile paginii sunt inserate printr-o singura instructiune INSERT, intr-o singura tranzactie.
+
+        Argumente:
+            groups: Lista de perechi (numar_grupa, randuri) intoarsa de parse_tables
+            study_year: Obiectul StudyYear pentru care se proceseaza cursurile
+            url: URL-ul paginii (folosit in mesajele de eroare)
+        """
+        study_year_id = study_year.study_year_id
+        page_courses = []
+        try:
+            for group_number, rows in groups:
+                try:
+                    group_id = self.parse_group(group_number, study_year)
+                    if not group_id:
+                        self.logger.warning(f"Nu s-a putut parsa grupa {group_number}, se omite.")
+                        continue
+                except Exception as e:
+                    error_msg = f"Eroare la parsarea grupei {group_number}: {e}"
+                    self.logger.error(error_msg)
+                    raise Exception(error_msg) from e
+
+                if rows is None:
+                    continue
+
+                for row_idx, row_dict in rows:
+                    try:
+                        professor_id = self.parse_professor_name(row_dict.get("Cadrul didactic"))
+                        if not professor_id:
                             self.logger.warning(
                                 f"Nu s-a putut parsa profesorul pentru randul {row_idx} din grupa {group_number}, se omite.")
                             continue
 
-                        room = self.parse_room(row_dict.get("Sala"))
-                        if not room:
+                        room_id = self.parse_room(row_dict.get("Sala"))
+                        if not room_id:
                             self.logger.warning(
                                 f"Nu s-a putut parsa sala pentru randul {row_idx} din grupa {group_number}, se omite.")
                             continue
@@ -140,47 +221,68 @@ class CourseScrapper:
 
                         course = Course(
                             name=row_dict.get("Disciplina"),
-                            professor_id=professor.professor_id,
+                            professor_id=professor_id,
                             course_type=row_dict.get("Tipul"),
-                            study_year_id=study_year.study_year_id,
-                            group_id=None if row_dict.get('Tipul') == 'Curs' else group.group_id,
+                            study_year_id=study_year_id,
+                            group_id=None if row_dict.get('Tipul') == 'Curs' else group_id,
                             subgroup_id=None if row_dict.get('Tipul') == 'Curs' else self.parse_subgroup(
-                                row_dict.get("Formatia"), group),
+                                row_dict.get("Formatia"), group_id),
                             day=row_dict.get("Ziua"),
                             start_time=start_time,
                             end_time=end_time,
-                            room_id=room.room_id,
+                            room_id=room_id,
                             frequency=self.parse_frequency(row_dict.get("Frecventa"))
                         )
 
-                        existing_course = self.courseRepository.get_course(course.name,
-                                                                           course.professor_id,
-                                                                           course.course_type,
-                                                                           course.study_year_id,
-                                                                           course.group_id,
-                                                                           course.subgroup_id,
-                                                                           course.day,
-                                                                           course.start_time,
-                                                                           course.end_time,
-                                                                           course.room_id,
-                                                                           course.frequency)
-                        if existing_course is None:
-                            self.courseRepository.add_course(course)
-                            self.logger.info(f"Curs adaugat: {course.name}")
+                        if not self.incremental and self.cache.is_known_course(course.identity_key()):
+                            self.logger.info(f"Cursul exista deja: {course.name}")
+                            self.course_counts["duplicates"] += 1
                         else:
-                            self.logger.info(f"Cursul exista deja: {existing_course.name}")
+                            page_courses.append(course)
 
                     except Exception as e:
                         error_msg = f"Eroare la procesarea randului {row_idx} din grupa {group_number}: {e}"
                         self.logger.error(error_msg)
                         raise Exception(error_msg) from e
 
+            if self.incremental:
+                self.scraped_courses.extend(page_courses)
+            else:
+                result = self.courseRepository.add_courses(page_courses)
+                self.course_counts["inserted"] += result["inserted"]
+                self.course_counts["duplicates"] += result["duplicates"]
+                self.logger.info(f"Cursuri adaugate din {url}: {result['inserted']} (duplicate: {result['duplicates']})")
+
         except Exception as e:
             if "raise Exception(error_msg) from e" in str(e):
                 raise
             error_msg = f"Eroare neasteptata la procesarea grupelor din {url}: {e}"
             self.logger.error(error_msg)
             raise Exception(error_msg) from e
+
+    def sync_scraped_courses(self) -> dict:
+        """
+        Aplica diferentele dintre cursurile colectate in modul incremental si tabela courses.
+        Sincronizarea cuprinde toti anii de studiu cunoscuti, mai putin cei ale caror pagini au fost omise
+        ca neschimbate: cursurile unui an a carui pagina a disparut din index sau nu mai are grupe sunt sterse.
+
+        Returneaza:
+            Dict cu numarul de cursuri inserate, actualizate, sterse si neschimbate
+        """
+        try:
+            study_year_ids = self.studyYearRepository.get_all_ids() - self.skipped_study_year_ids
+            changeset = self.courseRepository.sync_courses(self.scraped_courses, study_year_ids)
+        except Exception as e:
+            self.session.rollback()
+            error_msg = f"Eroare la sincronizarea cursurilor: {e}"
+            self.logger.error(error_msg)
+            raise Exception(error_msg) from e
+
+        self.logger.info(
+            f"Sincronizare cursuri: {changeset['inserted']} inserate, {changeset['updated']} actualizate, "
+            f"{changeset['deleted']} sterse, {changeset['unchanged']} neschimbate")
+        return changeset
+
     def parse_hours(self, hours: str) -> Tuple[time, time] | Tuple[None, None]:
         """
         Parseaza un string cu intervalul orar si returneaza obiectele time pentru inceput si sfarsit.
@@ -204,31 +306,36 @@ class CourseScrapper:
         except Exception as e:
             self.logger.error(f"Eroare la parsarea orelor '{hours}': {str(e)}")
             return None, None
-    def parse_room(self, sala: str) -> Room | None:
+    def parse_room(self, sala: str):
         """
-        Parseaza numele unei sali si returneaza obiectul Room corespunzator.
+        Parseaza numele unei sali si returneaza ID-ul salii corespunzatoare.
         Daca sala nu exista in baza de date, o creeaza.
 
         Argumente:
             sala: Numele salii de procesat
 
         Returneaza:
-            Obiectul Room sau None daca numele este invalid
+            ID-ul salii sau None daca numele este invalid
         """
         try:
             if not sala:
                 self.logger.warning("Numele salii este gol. Se returneaza None.")
                 return None
 
+            room_id = self.cache.get_room(sala)
+            if room_id:
+                return room_id
+
             room = self.roomRepository.get_room_by_name(sala)
 
             if room:
                 self.logger.debug(f"Sala gasita: {room.name}")
-                return room
+            else:
+                self.logger.info(f"Sala '{sala}' nu exista. Se adauga in baza de date.")
+                room = self.roomRepository.add_room(sala)
 
-            self.logger.info(f"Sala '{sala}' nu exista. Se adauga in baza de date.")
-            new_room = self.roomRepository.add_room(sala)
-            return new_room
+            self.cache.add_room(sala, room.room_id)
+            return room.room_id
 
         except Exception as e:
             error_msg = f"Eroare la parsarea/salvarea salii '{sala}': {e}"
@@ -262,14 +369,14 @@ class CourseScrapper:
             error_msg = f"Eroare la parsarea frecventei '{freq}': {e}"
             self.logger.error(error_msg)
             raise Exception(error_msg) from e
-    def parse_subgroup(self, subgroup: str, group: Group):
+    def parse_subgroup(self, subgroup: str, group_id):
         """
         Parseaza informatiile despre subgrupa si returneaza ID-ul subgrupei.
         Creeaza subgrupa daca nu exista in baza de date.
 
         Argumente:
             subgroup: String cu informatiile subgrupei (ex: 'Grupa/1')
-            group: Obiectul Group caruia ii apartine subgrupa
+            group_id: ID-ul grupei careia ii apartine subgrupa
 
         Returneaza:
             ID-ul subgrupei sau None daca parsarea esueaza
@@ -285,22 +392,29 @@ class CourseScrapper:
                 self.logger.warning(f"Subgrup invalid: {subgroup}")
                 return None
 
+            subgroup_id = self.cache.get_subgroup(group_id, subgroup_number)
+            if subgroup_id:
+                return subgroup_id
+
+            group = self.groupRepository.get_group_by_id(group_id)
             found_subgroup = self.subgroupRepository.get_subgroup(subgroup_number, group)
 
             if found_subgroup:
                 self.logger.info(f"Subgrupa {subgroup_number} exista deja pentru grupa {group.group_number}.")
-                return found_subgroup.subgroup_id
+            else:
+                self.logger.info(f"Se adauga subgrupa {subgroup_number} pentru grupa {group.group_number}.")
+                found_subgroup = self.subgroupRepository.add_subgroup(subgroup_number, group)
 
-            self.logger.info(f"Se adauga subgrupa {subgroup_number} pentru grupa {group.group_number}.")
-            return self.subgroupRepository.add_subgroup(subgroup_number, group).subgroup_id
+            self.cache.add_subgroup(group_id, subgroup_number, found_subgroup.subgroup_id)
+            return found_subgroup.subgroup_id
 
         except Exception as e:
             error_msg = f"Eroare la parsarea/salvarea subgrupei '{subgroup}': {e}"
             self.logger.error(error_msg)
             raise Exception(error_msg) from e
-    def parse_group(self, group: str, study_year: StudyYear) -> Group | None:
+    def parse_group(self, group: str, study_year: StudyYear):
         """
-        Parseaza numarul grupei si returneaza obiectul Group corespunzator.
+        Parseaza numarul grupei si returneaza ID-ul grupei corespunzatoare.
         Creeaza grupa daca nu exista in baza de date.
 
         Argumente:
@@ -308,7 +422,7 @@ class CourseScrapper:
             study_year: Obiectul StudyYear caruia ii apartine grupa
 
         Returneaza:
-            Obiectul Group sau None daca parsarea esueaza
+            ID-ul grupei sau None daca parsarea esueaza
         """
         try:
             try:
@@ -318,23 +432,30 @@ class CourseScrapper:
                 self.logger.error(f"Numarul grupei invalid: '{group}' nu este un numar intreg.")
                 return None
 
+            study_year_id = study_year.study_year_id
+            group_id = self.cache.get_group(study_year_id, group_number)
+            if group_id:
+                return group_id
+
             existing_group = self.groupRepository.get_group(group_number, study_year)
             if existing_group:
                 self.logger.info(f"Grupa {group_number} exista deja.")
-                return existing_group
+                group_id = existing_group.group_id
+            else:
+                self.logger.info(f"Grupa {group_number} nu a fost gasita. Se adauga grupa noua...")
+                group_id = self.groupRepository.add_group(group_number, study_year).group_id
+                self.logger.info(f"Grupa {group_number} a fost adaugata cu succes.")
 
-            self.logger.info(f"Grupa {group_number} nu a fost gasita. Se adauga grupa noua...")
-            new_group = self.groupRepository.add_group(group_number, study_year)
-            self.logger.info(f"Grupa {group_number} a fost adaugata cu succes.")
-            return new_group
+            self.cache.add_group(study_year_id, group_number, group_id)
+            return group_id
 
         except Exception as e:
             error_msg = f"Eroare la parsarea/salvarea grupei '{group}': {e}"
             self.logger.error(error_msg)
             raise Exception(error_msg) from e
-    def parse_professor_name(self, prof_name: str) -> Professor | None:
+    def parse_professor_name(self, prof_name: str):
         """
-        Parseaza numele complet al profesorului si returneaza obiectul Professor.
+        Parseaza numele complet al profesorului si returneaza ID-ul profesorului.
         Extrage titlul, prenumele si numele din stringul complet.
         Creeaza profesorul daca nu exista in baza de date.
 
@@ -342,7 +463,7 @@ class CourseScrapper:
             prof_name: Numele complet al profesorului (ex: "c.d. asociat SUCIU Dan Mircea")
 
         Returneaza:
-            Obiectul Professor sau None daca parsarea esueaza
+            ID-ul profesorului sau None daca parsarea esueaza
         """
         try:
             if not prof_name or not prof_name.strip():
@@ -384,6 +505,10 @@ class CourseScrapper:
 
             self.logger.info(f"Profesor parsat: {professor_data}")
 
+            professor_id = self.cache.get_professor(professor_data['first_name'], professor_data['last_name'])
+            if professor_id:
+                return professor_id
+
             existing_prof = self.professorRepository.get_professor_by_name(
                 first_name=professor_data['first_name'],
                 last_name=professor_data['last_name']
@@ -391,7 +516,9 @@ class CourseScrapper:
 
             if existing_prof:
                 self.logger.info("Profesorul exista deja in baza de date.")
-                return existing_prof
+                professor_id = existing_prof.professor_id
+                self.cache.add_professor(existing_prof.first_name, existing_prof.last_name, professor_id)
+                return professor_id
 
             new_prof = self.professorRepository.add_professor(
                 first_name=professor_data['first_name'],
@@ -399,7 +526,8 @@ class CourseScrapper:
                 title=professor_data['title']
             )
             self.logger.info("Profesor nou adaugat in baza de date.")
-            return new_prof
+            self.cache.add_professor(professor_data['first_name'], professor_data['last_name'], new_prof.professor_id)
+            return new_prof.professor_id
 
         except Exception as e:
             error_msg = f"Eroare la parsarea/salvarea profesorului '{prof_name}': {e}"
@@ -0,0 +1,46 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from server.common.common_constants import SCRAPER_MAX_WORKERS, SCRAPER_REQUEST_TIMEOUT
+
+
+def create_http_session(pool_size: int = SCRAPER_MAX_WORKERS) -> requests.Session:
+    """
+    Creeaza o sesiune HTTP partajata intre scrapper-e, cu un pool de conexiuni
+    dimensionat pentru descarcarile concurente (conexiunile TLS sunt refolosite).
+
+    Argumente:
+        pool_size: Numarul maxim de conexiuni pastrate deschise catre acelasi host
+
+    Returneaza:
+        Obiectul requests.Session configurat
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_text(url: str, http_session=None, page_cache=None) -> str:
+    """
+    Descarca o pagina si intoarce continutul ei decodat ca UTF-8.
+    Daca este primit un cache de pagini, descarcarea trece prin el (cerere conditionala).
+
+    Argumente:
+        url: URL-ul paginii
+        http_session: Sesiunea HTTP folosita (optional); implicit se foloseste requests direct
+        page_cache: Cache-ul de pagini al rularii curente (optional)
+
+    Returneaza:
+        Continutul HTML al paginii
+
+    Ridica:
+        requests.RequestException daca cererea esueaza
+    """
+    if page_cache is not None:
+        return page_cache.fetch_text(url)
+    response = (http_session or requests).get(url, timeout=SCRAPER_REQUEST_TIMEOUT)
+    response.encoding = 'utf-8'
+    response.raise_for_status()
+    return response.text
@@ -0,0 +1,86 @@
+from server.common.logger import setup_logger
+from server.repositories.course_repository import CourseRepository
+from server.repositories.group_repository import GroupRepository
+from server.repositories.professor_repository import ProfessorRepository
+from server.repositories.room_repository import RoomRepository
+from server.repositories.subgroup_repository import SubgroupRepository
+from server.scraper.professor_name_index import ProfessorNameIndex
+
+
+class LookupCache:
+    """
+    Cache de identitate pentru o rulare de scraping a cursurilor.
+    Se incarca o singura data la inceputul rularii (cate o interogare pe tabela) si se completeaza
+    pe masura ce se insereaza entitati noi, astfel incat doar ratarile reale ajung in baza de date.
+    Pastreaza doar ID-urile, nu obiecte ORM, ca sa nu fie reincarcate dupa fiecare commit.
+    """
+    logger = setup_logger(__name__)
+
+    KINDS = ("rooms", "professors", "groups", "subgroups")
+
+    def __init__(self):
+        self.rooms = {}
+        self.professors = ProfessorNameIndex()
+        self.groups = {}
+        self.subgroups = {}
+        self.course_keys = set()
+        self.stats = {kind: {"hits": 0, "misses": 0} for kind in self.KINDS}
+
+    def preload(self, session, include_courses=True):
+        """
+        Incarca in bloc salile, profesorii, grupele, subgrupele si cheile cursurilor existente.
+
+        Argumente:
+            session: Sesiunea SQLAlchemy pentru operatiuni cu baza de date
+            include_courses: Daca False, cheile cursurilor nu sunt incarcate (sincronizarea incrementala le compara separat)
+        """
+        self.rooms = RoomRepository(session).get_room_ids_by_name()
+        self.groups = GroupRepository(session).get_group_ids_by_number()
+        self.subgroups = SubgroupRepository(session).get_subgroup_ids_by_number()
+        self.course_keys = CourseRepository(session).get_course_keys() if include_courses else set()
+        self.professors = ProfessorNameIndex.load(ProfessorRepository(session))
+        self.stats = {kind: {"hits": 0, "misses": 0} for kind in self.KINDS}
+        self.logger.info(
+            f"Cache incarcat: {len(self.rooms)} sali, {len(self.professors)} profesori, "
+            f"{len(self.groups)} grupe, {len(self.subgroups)} subgrupe, {len(self.course_keys)} cursuri")
+
+    def _count(self, kind, value):
+        self.stats[kind]["hits" if value is not None else "misses"] += 1
+        return value
+
+    def get_room(self, name):
+        return self._count("rooms", self.rooms.get(name))
+
+    def add_room(self, name, room_id):
+        self.rooms[name] = room_id
+
+    def get_professor(self, first_name: str, last_name: str):
+        """
+        Cauta profesorul cu aceeasi semantica precum ProfessorRepository.get_professor_by_name:
+        numele de familie identic dupa unaccent, prenumele incepe (case-insensitive) cu cel cautat.
+        """
+        return self._count("professors", self.professors.get(first_name, last_name))
+
+    def add_professor(self, first_name: str, last_name: str, professor_id):
+        self.professors.add(first_name, last_name, professor_id)
+
+    def get_group(self, study_year_id, group_number: int):
+        return self._count("groups", self.groups.get((study_year_id, group_number)))
+
+    def add_group(self, study_year_id, group_number: int, group_id):
+        self.groups[(study_year_id, group_number)] = group_id
+
+    def get_subgroup(self, group_id, subgroup_number: int):
+        return self._count("subgroups", self.subgroups.get((group_id, subgroup_number)))
+
+    def add_subgroup(self, group_id, subgroup_number: int, subgroup_id):
+        self.subgroups[(group_id, subgroup_number)] = subgroup_id
+
+    def is_known_course(self, key: tuple) -> bool:
+        """
+        Verifica daca un curs cu aceeasi identitate (Course.identity_key) exista deja; daca nu, il marcheaza ca existent.
+        """
+        if key in self.course_keys:
+            return True
+        self.course_keys.add(key)
+        return False
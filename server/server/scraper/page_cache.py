@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import requests
+
+from server.common.common_constants import SCRAPER_MAX_WORKERS, SCRAPER_PAGE_CACHE_DIR, SCRAPER_REQUEST_TIMEOUT
+from server.common.logger import setup_logger
+from server.scraper.http_client import create_http_session
+
+HTTP_NOT_MODIFIED_CODE = 304
+FILE_KEY_PREFIX = "file://"
+
+
+class PageFetch(NamedTuple):
+    url: str
+    text: str
+    changed: bool
+
+
+class PageCache:
+    """
+    Cache persistent pentru paginile descarcate de scrapper-e.
+    Pentru fiecare URL pastreaza ETag, Last-Modified, hash-ul SHA-256 al continutului si continutul propriu-zis,
+    astfel incat cererile urmatoare sunt conditionale (If-None-Match / If-Modified-Since) si un raspuns 304
+    sau un continut cu acelasi hash este raportat ca neschimbat. Fisierele locale folosite la actualizare
+    (de exemplu ROOMS_MAPS_FILE) sunt urmarite doar dupa hash, prin track_file.
+
+    Intrarile noi raman in asteptare pana la commit(), apelat doar dupa ce datele paginilor au fost
+    scrise cu succes in baza de date; o rulare esuata nu marcheaza paginile ca procesate.
+    """
+    logger = setup_logger(__name__)
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory=SCRAPER_PAGE_CACHE_DIR, http_session=None):
+        """
+        Argumente:
+            directory: Directorul in care se salveaza paginile si indexul
+            http_session: Sesiunea HTTP folosita pentru descarcari (optional); implicit se creeaza una noua
+        """
+        self.directory = directory
+        self.http_session = http_session or create_http_session()
+        self.entries = self._load_index()
+        self.pending = {}
+        self.fetched = {}
+        self.lock = threading.Lock()
+
+    def _load_index(self) -> dict:
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, encoding="utf-8") as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Indexul cache-ului de pagini nu a putut fi citit, se porneste de la zero: {e}")
+            return {}
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".html")
+
+    def _read_body(self, url: str) -> str | None:
+        try:
+            with open(self._body_path(url), encoding="utf-8") as body_file:
+                return body_file.read()
+        except OSError:
+            return None
+
+    def fetch(self, url: str) -> PageFetch:
+        """
+        Descarca o pagina printr-o cerere conditionala. Rezultatul este memorat pentru restul rularii,
+        deci aceeasi pagina este descarcata o singura data chiar daca este ceruta de mai multe ori.
+        Poate fi apelata in paralel din mai multe thread-uri.
+
+        Argumente:
+            url: URL-ul paginii
+
+        Returneaza:
+            PageFetch cu continutul paginii si daca acesta s-a schimbat fata de ultima rulare reusita
+
+        Ridica:
+            requests.RequestException daca cererea esueaza
+        """
+        with self.lock:
+            if url in self.fetched:
+                return self.fetched[url]
+            entry = self.entries.get(url)
+
+        cached_body = self._read_body(url) if entry else None
+        headers = {}
+        if cached_body is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.http_session.get(url, headers=headers, timeout=SCRAPER_REQUEST_TIMEOUT)
+        if response.status_code == HTTP_NOT_MODIFIED_CODE and cached_body is not None:
+            result = PageFetch(url, cached_body, False)
+        else:
+            response.encoding = 'utf-8'
+            response.raise_for_status()
+            text = response.text
+            content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            result = PageFetch(url, text, entry is None or entry.get("sha256") != content_hash)
+            with self.lock:
+                self.pending[url] = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "sha256": content_hash,
+                    "text": text,
+                }
+
+        with self.lock:
+            self.fetched[url] = result
+        return result
+
+    def fetch_text(self, url: str) -> str:
+        return self.fetch(url).text
+
+    def track_file(self, path: str) -> bool:
+        """
+        Compara hash-ul unui fisier local cu cel de la ultima rulare reusita; noul hash este salvat la commit().
+
+        Returneaza:
+            True daca fisierul s-a schimbat sau este urmarit pentru prima data
+
+        Ridica:
+            OSError daca fisierul nu poate fi citit
+        """
+        key = FILE_KEY_PREFIX + os.path.abspath(path)
+        with open(path, "rb") as tracked_file:
+            content_hash = hashlib.sha256(tracked_file.read()).hexdigest()
+        with self.lock:
+            entry = self.entries.get(key)
+            self.pending[key] = {"sha256": content_hash}
+        return entry is None or entry.get("sha256") != content_hash
+
+    def is_unchanged(self, url: str) -> bool:
+        """
+        Verifica daca pagina a fost deja descarcata in aceasta rulare si are acelasi continut ca la ultima rulare reusita.
+        """
+        with self.lock:
+            result = self.fetched.get(url)
+        return result is not None and not result.changed
+
+    def all_unchanged(self, files=(), max_workers=SCRAPER_MAX_WORKERS) -> bool:
+        """
+        Verifica in paralel, prin cereri conditionale, toate paginile procesate la ultima rulare reusita,
+        impreuna cu fisierele locale primite. O pagina sau un fisier care nu poate fi verificat
+        este considerat modificat, ca actualizarea sa continue.
+
+        Argumente:
+            files: Caile fisierelor locale folosite la actualizare (vezi track_file)
+
+        Returneaza:
+            True daca exista o rulare anterioara si nici paginile, nici fisierele nu s-au schimbat
+        """
+        changed = []
+        for path in files:
+            try:
+                if self.track_file(path):
+                    changed.append(path)
+            except OSError as e:
+                self.logger.warning(f"Fisierul {path} nu a putut fi verificat, este considerat modificat: {e}")
+                changed.append(path)
+
+        urls = [url for url in self.entries if not url.startswith(FILE_KEY_PREFIX)]
+        if not urls:
+            return False
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            changed += [url for url, page_changed in zip(urls, executor.map(self._preflight_changed, urls))
+                        if page_changed]
+        if changed:
+            self.logger.info(f"Pagini si fisiere modificate de la ultima rulare: {changed}")
+        return not changed
+
+    def _preflight_changed(self, url: str) -> bool:
+        try:
+            return self.fetch(url).changed
+        except requests.RequestException as e:
+            self.logger.warning(f"Pagina {url} nu a putut fi verificata, este considerata modificata: {e}")
+            return True
+
+    def commit(self):
+        """
+        Salveaza pe disc intrarile descarcate in aceasta rulare. Se apeleaza dupa ce datele au fost scrise cu succes.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not pending:
+            return
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for url, entry in pending.items():
+                if "text" in entry:
+                    with open(self._body_path(url), "w", encoding="utf-8") as body_file:
+                        body_file.write(entry["text"])
+                self.entries[url] = {key: value for key, value in entry.items() if key != "text"}
+
+            index_path = os.path.join(self.directory, self.INDEX_FILE)
+            with open(index_path + ".tmp", "w", encoding="utf-8") as index_file:
+                json.dump(self.entries, index_file, indent=2)
+            os.replace(index_path + ".tmp", index_path)
+            self.logger.info(f"Cache-ul de pagini a fost actualizat ({len(pending)} pagini).")
+        except OSError as e:
+            self.logger.error(f"Eroare la salvarea cache-ului de pagini: {e}")
@@ -0,0 +1,111 @@
+import re
+import threading
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def like_regex(pattern: str) -> re.Pattern:
+    """
+    Traduce un sablon LIKE din PostgreSQL intr-o expresie regulata: '%' inseamna orice sir, '_' orice
+    caracter, iar '\\' face ca urmatorul caracter sa fie luat literal.
+    """
+    parts = []
+    escaped = False
+    for character in pattern:
+        if escaped:
+            parts.append(re.escape(character))
+            escaped = False
+        elif character == '\\':
+            escaped = True
+        elif character == '%':
+            parts.append('.*')
+        elif character == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(character))
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+class ProfessorNameIndex:
+    """
+    Index in memorie al profesorilor dupa numele normalizat, cu aceeasi semantica de potrivire ca
+    ProfessorRepository.get_professor_by_name: f_unaccent(last_name) egal cu numele cautat dupa f_unaccent,
+    iar f_unaccent(first_name) ILIKE f_unaccent(prenume || '%'), deci '%', '_' si '\\' din prenumele cautat
+    au sensul din ILIKE. Folosit de scrapper-e ca sa nu interogheze baza de date pentru fiecare profesor.
+
+    Numele existente sunt normalizate de Postgres la incarcare. Numele cautate si cele adaugate in timpul
+    rularii sunt traduse caracter cu caracter cu tabelele f_unaccent si lower citite tot din Postgres
+    (o singura data pe proces), ca ambele parti sa aiba exact normalizarea din interogarea originala.
+    """
+    _tables = None
+    _tables_lock = threading.Lock()
+
+    def __init__(self, rows=(), unaccent_table=None, lower_table=None):
+        """
+        Argumente:
+            rows: Tupluri (professor_id, lower(f_unaccent(first_name)), f_unaccent(last_name)),
+                de exemplu din ProfessorRepository.get_professor_name_keys
+            unaccent_table: Tabela str.translate cu rezultatul f_unaccent pentru fiecare caracter modificat
+            lower_table: Tabela str.translate cu rezultatul lower pentru fiecare caracter modificat
+        """
+        self.unaccent_table = unaccent_table or {}
+        self.lower_table = lower_table or {}
+        self.by_last_name = {}
+        for professor_id, first_name_key, last_name_key in rows:
+            if first_name_key is not None and last_name_key is not None:
+                self.by_last_name.setdefault(last_name_key, []).append((first_name_key, professor_id))
+
+    @classmethod
+    def load(cls, professor_repository) -> "ProfessorNameIndex":
+        """
+        Construieste indexul din baza de date.
+
+        Argumente:
+            professor_repository: ProfessorRepository legat de sesiunea rularii
+        """
+        with cls._tables_lock:
+            if cls._tables is None:
+                unaccent_table, lower_table = {}, {}
+                for character, unaccented, lowered in professor_repository.get_name_normalization_rows():
+                    if unaccented != character:
+                        unaccent_table[ord(character)] = unaccented
+                    if lowered != character:
+                        lower_table[ord(character)] = lowered
+                cls._tables = (unaccent_table, lower_table)
+        return cls(professor_repository.get_professor_name_keys(), *cls._tables)
+
+    def __len__(self):
+        return sum(len(candidates) for candidates in self.by_last_name.values())
+
+    def _last_name_key(self, last_name: str) -> str:
+        return last_name.translate(self.unaccent_table)
+
+    def _first_name_key(self, first_name: str) -> str:
+        return first_name.translate(self.unaccent_table).translate(self.lower_table)
+
+    def get(self, first_name: str, last_name: str):
+        """
+        Returneaza:
+            ID-ul primului profesor potrivit sau None
+        """
+        if last_name is None:
+            return None
+        candidates = self.by_last_name.get(self._last_name_key(last_name), [])
+        if not candidates:
+            return None
+
+        pattern = self._first_name_key(f"{first_name}%")
+        prefix = pattern[:-1]
+        # Fara caractere speciale LIKE, sablonul "prefix%" inseamna doar startswith
+        regex = like_regex(pattern) if any(character in prefix for character in '%_\\') else None
+
+        for candidate_first_name, professor_id in candidates:
+            if regex.fullmatch(candidate_first_name) if regex else candidate_first_name.startswith(prefix):
+                return professor_id
+        return None
+
+    def add(self, first_name: str, last_name: str, professor_id):
+        if first_name is None or last_name is None:
+            return
+        self.by_last_name.setdefault(self._last_name_key(last_name), []).append(
+            (self._first_name_key(first_name), professor_id))
@@ -1,5 +1,4 @@
 from typing import List, Optional
-import requests
 from bs4 import BeautifulSoup
 import re
 
@@ -8,6 +7,8 @@ from server.models.professor import Professor
 from server.repositories.domain_repository import DomainRepository
 from server.repositories.professor_repository import ProfessorRepository
 from server.repositories.professor_domains_repository import ProfessorDomainsRepository
+from server.scraper.professor_name_index import ProfessorNameIndex
+from server.scraper.http_client import fetch_text
 
 
 class ProfessorsScrapper:
@@ -17,19 +18,22 @@ class ProfessorsScrapper:
     """
     logger = setup_logger(__name__)
 
-    def __init__(self, session, urls):
+    def __init__(self, session, urls, page_cache=None):
         """
         Initializeaza obiectul ProfessorsScrapper cu sesiunea bazei de date si URL-urile.
 
         Argumente:
             session: Sesiunea SQLAlchemy pentru operatiuni cu baza de date
             urls: Lista URL-urilor de unde se extrag datele profesorilor
+            page_cache: Cache-ul de pagini al rularii curente (optional)
         """
         self.session = session
+        self.page_cache = page_cache
         self.professorRepository = ProfessorRepository(session)
         self.domainRepository = DomainRepository(session)
         self.professorDomainsRepository = ProfessorDomainsRepository(session)
         self.urls = urls
+        self.name_index = None
 
     def extract_domains(self, text_content: str) -> List[str]:
         """
@@ -192,12 +196,13 @@ class ProfessorsScrapper:
         """
         Extrage toti profesorii din toate URL-urile configurate.
         Proceseaza fiecare pagina si salveaza datele profesorilor in baza de date.
+        Profesorii existenti sunt incarcati o singura data intr-un index dupa nume.
         """
+        self.name_index = ProfessorNameIndex.load(self.professorRepository)
         for url in self.urls:
             try:
-                response = requests.get(url)
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.text, 'html.parser')
+                html = fetch_text(url, page_cache=self.page_cache)
+                soup = BeautifulSoup(html, 'html.parser')
 
                 content_div = soup.find("div", {"id": "content"})
                 if not content_div:
@@ -345,7 +350,7 @@ class ProfessorsScrapper:
                 existing_professor = self.professorRepository.get_professor_by_email(email)
 
             if not existing_professor and first_name and last_name:
-                existing_professor = self.professorRepository.get_professor_by_name(first_name, last_name)
+                existing_professor = self.find_professor_by_name(first_name, last_name)
 
             if existing_professor:
                 self.logger.info(
@@ -359,6 +364,8 @@ class ProfessorsScrapper:
                     'image_url': image_url,
                     'details': details
                 }, department)
+                if self.name_index is not None:
+                    self.name_index.add(first_name, last_name, existing_professor.professor_id)
 
                 if domains:
                     self.save_professor_domains(existing_professor.professor_id, domains)
@@ -376,6 +383,8 @@ class ProfessorsScrapper:
                 )
 
                 self.logger.info(f"S-a adaugat profesorul nou: {first_name} {last_name}")
+                if self.name_index is not None:
+                    self.name_index.add(first_name, last_name, added_professor.professor_id)
 
                 if domains and added_professor:
                     self.save_professor_domains(added_professor.professor_id, domains)
@@ -384,6 +393,16 @@ class ProfessorsScrapper:
             self.logger.error(
                 f"Eroare la salvarea profesorului {professor_data.get('first_name', '')} {professor_data.get('last_name', 'Necunoscut')}: {str(e)}")
 
+    def find_professor_by_name(self, first_name: str, last_name: str) -> Optional[Professor]:
+        """
+        Cauta profesorul dupa nume in indexul incarcat la inceputul rularii (daca exista),
+        altfel direct in baza de date.
+        """
+        if self.name_index is None:
+            return self.professorRepository.get_professor_by_name(first_name, last_name)
+        professor_id = self.name_index.get(first_name, last_name)
+        return self.session.get(Professor, professor_id) if professor_id else None
+
     def update_professor(self, existing_professor: Professor, new_data: dict, department_name: str):
         """
         Actualizeaza profesorul existent cu date noi.
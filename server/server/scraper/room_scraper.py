@@ -1,8 +1,10 @@
 import requests
 import pandas as pd
 from bs4 import BeautifulSoup
+from server.common.common_constants import ROOMS_MAPS_FILE, SCRAPER_TIMETABLE_URL
 from server.common.logger import setup_logger
 from server.repositories.room_repository import RoomRepository
+from server.scraper.http_client import fetch_text
 
 
 class RoomScrapper:
@@ -12,17 +14,19 @@ class RoomScrapper:
     """
     logger = setup_logger(__name__)
 
-    def __init__(self, session):
+    def __init__(self, session, page_cache=None):
         """
         Initializeaza obiectul RoomScrapper cu sesiunea bazei de date.
 
         Argumente:
             session: Sesiunea SQLAlchemy pentru operatiuni cu baza de date
+            page_cache: Cache-ul de pagini al rularii curente (optional)
         """
         self.session = session
+        self.page_cache = page_cache
         self.roomRepository = RoomRepository(session)
-        self.url = "https://www.cs.ubbcluj.ro/files/orar/2024-2/sali/legenda.html"
-        self.excel_file = "C://Users//peter//Desktop//planner4students//server//server//docs//RoomsMaps.xlsx"
+        self.url = f"{SCRAPER_TIMETABLE_URL}/sali/legenda.html"
+        self.excel_file = ROOMS_MAPS_FILE
 
     def scrape_rooms(self):
         """
@@ -32,13 +36,11 @@ class RoomScrapper:
         try:
             self.logger.info(f"Se incepe extragerea salilor din: {self.url}")
 
-            response = requests.get(self.url, timeout=30)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            html = fetch_text(self.url, page_cache=self.page_cache)
 
             self.logger.info("Continutul HTML a fost obtinut cu succes")
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
 
             table = soup.find('table')
             if not table:
@@ -1,12 +1,17 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from contextlib import contextmanager
 from datetime import date
 from sqlalchemy import text
+from server.common.common_constants import ROOMS_MAPS_FILE, SCRAPER_PROFESSORS_URLS
+from server.common.data_version import bump_data_version
 from server.common.logger import setup_logger
+from server.repositories.subgroup_schedule_repository import SubgroupScheduleRepository
+from server.scraper.page_cache import PageCache
 from server.scraper.professors_scrapper import ProfessorsScrapper
 from server.scraper.structure_of_schedule_scrapper import StructureOfScheduleScrapper
 from server.scraper.specializations_scrapper import SpecializationsScrapper
 from server.scraper.room_scraper import RoomScrapper
-from server.scraper.course_scrapper import CourseScrapper
 from server.services.academic_schedule_service import AcademicScheduleService
 
 
@@ -16,6 +21,24 @@ class ScrapperManager:
     Coordoneaza toate scrapper-urile si gestioneaza ciclul de actualizare in functie de calendar academic.
     """
 
+    STAGING_SCHEMA = "staging_refresh"
+
+    # Tabelele reconstruite la actualizarea completa, in ordinea in care pot fi inserate (parinti inaintea copiilor)
+    STAGED_TABLES = [
+        "rooms",
+        "domains",
+        "professors",
+        "professor_domains",
+        "specializations",
+        "study_years",
+        "groups",
+        "subgroups",
+        "courses",
+        "academic_schedule",
+        "academic_holidays",
+        "subgroup_schedules"
+    ]
+
     def __init__(self, SessionMaker):
         """
         Initializeaza obiectul ScrapperManager cu factory-ul de sesiuni.
@@ -25,6 +48,29 @@ class ScrapperManager:
         """
         self.SessionMaker = SessionMaker
         self.logger = setup_logger(__name__)
+        self.stage_timings = {}
+        self.critical_path = {}
+        # Apelat cu (nume_etapa, "start" / "end") din thread-ul etapei; folosit de benchmark-uri pentru masuratori per etapa
+        self.stage_listener = None
+
+    @contextmanager
+    def _stage(self, name):
+        """
+        Masoara durata unei etape a actualizarii si o salveaza in stage_timings.
+
+        Argumente:
+            name: Numele etapei
+        """
+        if self.stage_listener:
+            self.stage_listener(name, "start")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_timings[name] = round(time.perf_counter() - start, 3)
+            if self.stage_listener:
+                self.stage_listener(name, "end")
+            self.logger.info(f"Etapa '{name}' a durat {self.stage_timings[name]}s")
 
     @contextmanager
     def get_session(self):
@@ -46,6 +92,161 @@ class ScrapperManager:
         finally:
             session.close()
 
+    def _get_engine(self):
+        return self.SessionMaker.kw["bind"]
+
+    def _create_staging_tables(self):
+        """
+        Creeaza schema de staging cu cate o copie goala (coloane, valori implicite, indecsi) a fiecarei
+        tabele din STAGED_TABLES. Eventualele resturi ale unei rulari anterioare sunt sterse.
+        """
+        with self._get_engine().begin() as connection:
+            connection.execute(text(f"DROP SCHEMA IF EXISTS {self.STAGING_SCHEMA} CASCADE"))
+            connection.execute(text(f"CREATE SCHEMA {self.STAGING_SCHEMA}"))
+            for table in self.STAGED_TABLES:
+                connection.execute(text(
+                    f"CREATE TABLE {self.STAGING_SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)"))
+        self.logger.info(f"Schema de staging '{self.STAGING_SCHEMA}' a fost creata.")
+
+    def _drop_staging_tables(self):
+        try:
+            with self._get_engine().begin() as connection:
+                connection.execute(text(f"DROP SCHEMA IF EXISTS {self.STAGING_SCHEMA} CASCADE"))
+        except Exception as e:
+            self.logger.error(f"Eroare la stergerea schemei de staging: {e}")
+
+    @contextmanager
+    def get_staging_session(self):
+        """
+        Context manager pentru o sesiune care scrie in schema de staging.
+        Sesiunea foloseste o conexiune dedicata cu search_path setat pe schema de staging, astfel incat
+        scrapper-ele si repository-urile existente scriu in tabelele de staging fara nicio modificare.
+        Tabelele care nu exista in staging (de exemplu 'students') sunt rezolvate in continuare din 'public'.
+
+        Yields:
+            Session: Sesiunea SQLAlchemy legata de schema de staging
+        """
+        connection = self._get_engine().connect()
+        try:
+            connection.execute(text(f"SET search_path TO {self.STAGING_SCHEMA}, public"))
+            connection.commit()
+            with self.SessionMaker(bind=connection) as session:
+                try:
+                    yield session
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    self.logger.error(f"Eroare de sesiune (staging): {e}")
+                    raise
+        finally:
+            try:
+                connection.rollback()
+                connection.execute(text("RESET search_path"))
+                connection.commit()
+                connection.close()
+            except Exception as e:
+                self.logger.error(f"Eroare la resetarea conexiunii de staging: {e}")
+                connection.invalidate()
+
+    def _swap_staging_into_live(self):
+        """
+        Inlocuieste datele live cu cele din schema de staging intr-o singura tranzactie scurta.
+        Cititorii vad datele vechi pana la commit si pe cele noi imediat dupa; la eroare nu se modifica nimic.
+        Studentii sunt pastrati, dar subgroup_id si cursurile alese sunt resetate, ca la clear_db.
+        Versiunea datelor este incrementata in aceeasi tranzactie, deci toate procesele o vad odata cu datele noi.
+        """
+        with self._get_engine().begin() as connection:
+            self._reset_student_choices(connection)
+            for table in reversed(self.STAGED_TABLES):
+                connection.execute(text(f"DELETE FROM public.{table}"))
+            for table in self.STAGED_TABLES:
+                connection.execute(text(
+                    f"INSERT INTO public.{table} SELECT * FROM {self.STAGING_SCHEMA}.{table}"))
+            bump_data_version(connection)
+        self.logger.info("Datele din staging au fost mutate in tabelele live.")
+
+    @staticmethod
+    def _reset_student_choices(connection):
+        """
+        Resetarea de inceput de semestru: studentii isi aleg din nou subgrupa si cursurile.
+        """
+        connection.execute(text("UPDATE students SET subgroup_id = NULL"))
+        connection.execute(text("DELETE FROM public.student_courses"))
+
+    def _run_stage_graph(self, stages) -> dict:
+        """
+        Ruleaza etapele actualizarii complete in ordinea data de dependentele dintre ele; etapele ale caror
+        dependente s-au terminat ruleaza in paralel, fiecare intr-un thread propriu si cu propria sesiune
+        de staging (commit la finalul etapei, astfel incat etapele urmatoare vad datele scrise).
+        La prima eroare nu mai este pornita nicio etapa noua si exceptia este propagata.
+        Calea critica (lantul de etape dependente cu durata totala maxima) este salvata in critical_path.
+
+        Argumente:
+            stages: Dict nume_etapa -> (lista_dependente, functie(session)); dependentele trebuie sa fie tot chei ale dict-ului
+
+        Returneaza:
+            Dict nume_etapa -> valoarea intoarsa de functia etapei
+        """
+        def run(name):
+            with self._stage(name), self.get_staging_session() as session:
+                return stages[name][1](session)
+
+        results = {}
+        pending = dict(stages)
+        running = {}
+        with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+            try:
+                while pending or running:
+                    for name in [name for name, (dependencies, _) in pending.items()
+                                 if all(dependency in results for dependency in dependencies)]:
+                        running[executor.submit(run, name)] = name
+                        del pending[name]
+                    if not running:
+                        raise Exception(f"Etapele {list(pending)} au dependente care nu pot fi satisfacute")
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+            except Exception:
+                for future in running:
+                    future.cancel()
+                raise
+
+        finish = {}
+        for name in stages:
+            self._critical_finish(name, stages, finish)
+        last = max(finish, key=lambda name: finish[name][0])
+        self.critical_path = {"stages": finish[last][1], "seconds": round(finish[last][0], 3)}
+        self.logger.info(f"Calea critica a actualizarii: {' -> '.join(finish[last][1])} "
+                         f"({self.critical_path['seconds']}s)")
+        return results
+
+    def _critical_finish(self, name, stages, finish) -> tuple:
+        """
+        Calculeaza (durata_cumulata, lant_de_etape) pentru cel mai lung lant de dependente care se termina cu etapa data.
+        """
+        if name not in finish:
+            previous = max((self._critical_finish(dependency, stages, finish) for dependency in stages[name][0]),
+                           default=(0.0, []), key=lambda item: item[0])
+            finish[name] = (previous[0] + self.stage_timings.get(name, 0.0), previous[1] + [name])
+        return finish[name]
+
+    def _rebuild_subgroup_schedules(self, session) -> dict:
+        """
+        Recalculeaza orarul implicit precalculat al subgrupelor (tabela subgroup_schedules).
+
+        Argumente:
+            session: Sesiunea in care s-au scris cursurile
+
+        Returneaza:
+            Dict cu numarul de randuri generate si durata reconstruirii
+        """
+        start = time.perf_counter()
+        rows = SubgroupScheduleRepository(session).rebuild()
+        seconds = round(time.perf_counter() - start, 3)
+        self.logger.info(f"Orarul precalculat al subgrupelor a fost reconstruit: {rows} randuri in {seconds}s")
+        return {"rows": rows, "seconds": seconds}
+
     def clear_db(self, preserve_students=False):
         """
         Sterge toate datele din baza de date cu optiunea de a pastra studentii.
@@ -63,6 +264,7 @@ class ScrapperManager:
             "academic_holidays",
             "academic_schedule",
             "student_courses",
+            "subgroup_schedules",
             "courses",
             "subgroups",
             "groups",
@@ -96,6 +298,8 @@ class ScrapperManager:
                         session.rollback()
                         return {"status": "error", "error": f"Esec la stergerea din {table}: {str(e)}"}
 
+                bump_data_version(session)
+                session.commit()
                 return {"status": "success",
                         "message": "Baza de date a fost stearsa cu succes (fara a sterge studentii)."}
 
@@ -125,7 +329,7 @@ class ScrapperManager:
                 if semester_1 and today == semester_1:
                     self.logger.info(
                         f"Astazi ({today}) este inceputul semestrului 1. Se incepe actualizarea completa...")
-                    return self._full_semester_update(session)
+                    return self._full_semester_update()
 
                 elif semester_2 and today == semester_2:
                     self.logger.info(
@@ -140,58 +344,93 @@ class ScrapperManager:
             self.logger.error(f"Eroare la actualizare: {e}")
             return {"status": "error", "error": str(e)}
 
-    def _full_semester_update(self, session):
+    def _full_semester_update(self):
         """
         Executa actualizarea completa a bazei de date pentru inceputul semestrului 1.
         Include structura anului, sali, specializari, cursuri si profesori.
-
-        Argumente:
-            session: Sesiunea bazei de date activa
+        Datele noi sunt construite in schema de staging si abia apoi inlocuiesc datele live, intr-o singura
+        tranzactie; daca scraping-ul esueaza, datele live raman neatinse.
+        Structura anului, profesorii si salile sunt extrase in paralel (vezi _run_stage_graph).
+        Daca niciuna dintre paginile sursa (si nici ROOMS_MAPS_FILE) nu s-a schimbat de la ultima rulare reusita,
+        descarcarea si parsarea sunt omise, dar subgrupele si cursurile alese de studenti sunt resetate oricum.
 
         Returneaza:
             Dict cu status-ul operatiunii si detaliile actualizarii
         """
+        self.stage_timings = {}
+        self.critical_path = {}
         try:
-            self.logger.info("Se sterg toate datele existente din baza de date (se pastreaza studentii)...")
-            clear_result = self.clear_db(preserve_students=True)
-            if clear_result["status"] == "error":
-                self.logger.error(f"Eroare la stergerea bazei de date: {clear_result['error']}")
-                return {"status": "error", "error": clear_result["error"], "type": "full_update", "semester": 1}
-
-            self.logger.info("Se actualizeaza structura anului universitar...")
-            structure_scrapper = StructureOfScheduleScrapper(session)
-            structure_scrapper.scrape_schedule()
-
-            self.logger.info("Se actualizeaza profesorii...")
-            my_urls = [
-                "https://www.cs.ubbcluj.ro/despre-facultate/structura/departamentul-de-matematica/#",
-                "https://www.cs.ubbcluj.ro/despre-facultate/structura/departamentul-de-informatica/#",
-                "https://www.cs.ubbcluj.ro/departamentul-de-matematica-si-informatica-al-liniei-maghiare/#"
-            ]
-
-            professors_scrapper = ProfessorsScrapper(session, my_urls)
-            professors_scrapper.scrape_professors()
-            self.logger.info("Se actualizeaza salile...")
-            room_scrapper = RoomScrapper(session)
-            room_scrapper.scrape_and_update_complete()
-
-            self.logger.info("Se actualizeaza specializarile si cursurile...")
-            specializations_scrapper = SpecializationsScrapper(session)
-            specializations_scrapper.scrape_specializations()
-
-
+            page_cache = PageCache()
+            with self._stage("preflight"):
+                unchanged = page_cache.all_unchanged(files=[ROOMS_MAPS_FILE])
+            if unchanged:
+                self.logger.info("Paginile sursa nu s-au schimbat de la ultima actualizare, "
+                                 "se reseteaza doar alegerile studentilor.")
+                with self._stage("reset"):
+                    with self._get_engine().begin() as connection:
+                        self._reset_student_choices(connection)
+                        bump_data_version(connection)
+                return {"status": "unchanged", "type": "full_update", "semester": 1, "stages": self.stage_timings}
+
+            with self._stage("staging"):
+                self._create_staging_tables()
+
+            def scrape_structure(session):
+                self.logger.info("Se actualizeaza structura anului universitar...")
+                StructureOfScheduleScrapper(session, page_cache).scrape_schedule()
+
+            def scrape_professors(session):
+                self.logger.info("Se actualizeaza profesorii...")
+                ProfessorsScrapper(session, SCRAPER_PROFESSORS_URLS, page_cache).scrape_professors()
+
+            def scrape_rooms(session):
+                self.logger.info("Se actualizeaza salile...")
+                RoomScrapper(session, page_cache).scrape_and_update_complete()
+
+            def scrape_courses(session):
+                self.logger.info("Se actualizeaza specializarile si cursurile...")
+                specializations_scrapper = SpecializationsScrapper(session, page_cache.http_session,
+                                                                   page_cache=page_cache)
+                specializations_scrapper.scrape_specializations()
+                return specializations_scrapper
+
+            # Cursurile au nevoie de salile si profesorii deja scrisi; celelalte etape sunt independente
+            results = self._run_stage_graph({
+                "structure": ([], scrape_structure),
+                "professors": ([], scrape_professors),
+                "rooms": ([], scrape_rooms),
+                "courses": (["professors", "rooms"], scrape_courses),
+                "schedules": (["courses"], self._rebuild_subgroup_schedules),
+            })
+            specializations_scrapper = results["courses"]
+            schedules = results["schedules"]
+
+            self.logger.info("Se inlocuiesc datele live cu cele din staging...")
+            with self._stage("swap"):
+                self._swap_staging_into_live()
+            page_cache.commit()
 
             self.logger.info("Actualizarea completa pentru semestrul 1 a fost finalizata cu succes!")
-            return {"status": "updated", "type": "full_update", "semester": 1}
+            return {"status": "updated", "type": "full_update", "semester": 1,
+                    "stages": self.stage_timings,
+                    "critical_path": self.critical_path,
+                    "schedules": schedules,
+                    "timings": specializations_scrapper.timings,
+                    "cache": specializations_scrapper.cache_stats,
+                    "courses": specializations_scrapper.course_counts}
 
         except Exception as e:
             self.logger.error(f"Eroare la actualizarea completa: {e}")
             return {"status": "error", "error": str(e), "type": "full_update", "semester": 1}
 
+        finally:
+            self._drop_staging_tables()
+
     def _courses_only_update(self, session):
         """
         Executa actualizarea doar a cursurilor pentru inceputul semestrului 2.
-        Sterge cursurile existente si le re-extrage din surse.
+        Cursurile sunt re-extrase si sincronizate incremental: se insereaza, actualizeaza sau sterg doar
+        randurile modificate, astfel incat course_id-urile si alegerile studentilor raman valabile.
 
         Argumente:
             session: Sesiunea bazei de date activa
@@ -201,11 +440,23 @@ class ScrapperManager:
         """
         try:
             self.logger.info("Se actualizeaza doar cursurile pentru semestrul 2...")
-            CourseScrapper(session).clear_course_table()
-            SpecializationsScrapper(session).scrape_specializations()
+            page_cache = PageCache()
+            specializations_scrapper = SpecializationsScrapper(session, page_cache.http_session, incremental=True,
+                                                               page_cache=page_cache)
+            specializations_scrapper.scrape_specializations()
+            schedules = self._rebuild_subgroup_schedules(session)
+            # Versiunea noua este confirmata in aceeasi tranzactie cu cursurile
+            bump_data_version(session)
+            session.commit()
+            page_cache.commit()
             self.logger.info("Actualizarea cursurilor pentru semestrul 2 a fost finalizata cu succes!")
-            return {"status": "updated", "type": "courses_only", "semester": 2}
+            return {"status": "updated", "type": "courses_only", "semester": 2,
+                    "timings": specializations_scrapper.timings,
+                    "cache": specializations_scrapper.cache_stats,
+                    "changeset": specializations_scrapper.course_counts,
+                    "schedules": schedules}
 
         except Exception as e:
+            session.rollback()
             self.logger.error(f"Eroare la actualizarea cursurilor: {e}")
             return {"status": "error", "error": str(e), "type": "courses_only", "semester": 2}
\ No newline at end of file
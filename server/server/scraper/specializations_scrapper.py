@@ -1,5 +1,9 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
 from bs4 import BeautifulSoup
+from server.common.common_constants import SCRAPER_MAX_WORKERS, SCRAPER_TIMETABLE_URL
 from server.common.logger import setup_logger
 from server.repositories.course_repository import CourseRepository
 from server.repositories.group_repository import GroupRepository
@@ -9,6 +13,7 @@ from server.repositories.specialization_repository import SpecializationReposito
 from server.repositories.study_year_repository import StudyYearRepository
 from server.repositories.subgroup_repository import SubgroupRepository
 from server.scraper.course_scrapper import CourseScrapper
+from server.scraper.http_client import create_http_session, fetch_text
 
 
 class SpecializationsScrapper:
@@ -18,14 +23,23 @@ class SpecializationsScrapper:
     """
     logger = setup_logger(__name__)
 
-    def __init__(self, session):
+    def __init__(self, session, http_session=None, max_workers=SCRAPER_MAX_WORKERS, incremental=False,
+                 page_cache=None):
         """
         Initializeaza obiectul SpecializationsScrapper cu sesiunea bazei de date.
 
         Argumente:
             session: Sesiunea SQLAlchemy pentru operatiuni cu baza de date
+            http_session: Sesiunea HTTP partajata (optional); implicit se creeaza una noua
+            max_workers: Numarul maxim de pagini cu orare descarcate in paralel
+            incremental: Daca True, cursurile sunt sincronizate cu tabela courses dupa ce toate paginile au fost procesate
+            page_cache: Cache-ul de pagini al rularii curente (optional); in modul incremental paginile
+                neschimbate nu mai sunt parsate si nici scrise in baza de date
         """
         self.session = session
+        self.max_workers = max_workers
+        self.http_session = http_session or create_http_session(max_workers)
+        self.page_cache = page_cache
         self.professorRepository = ProfessorRepository(session)
         self.specializationRepository = SpecializationRepository(session)
         self.studyYearRepository = StudyYearRepository(session)
@@ -33,24 +47,27 @@ class SpecializationsScrapper:
         self.subgroupRepository = SubgroupRepository(session)
         self.roomRepository = RoomRepository(session)
         self.courseRepository = CourseRepository(session)
-        self.courseScraper = CourseScrapper(session)
-        self.url = "https://www.cs.ubbcluj.ro/files/orar/2024-2/tabelar/index.html"
+        self.courseScraper = CourseScrapper(session, self.http_session, incremental=incremental,
+                                            page_cache=page_cache)
+        self.url = f"{SCRAPER_TIMETABLE_URL}/tabelar/index.html"
+        self.timings = {}
+        self.cache_stats = {}
+        self.course_counts = {}
 
     def scrape_specializations(self):
         """
         Extrage specializarile din tabelul principal si proceseaza anii de studiu.
-        Pentru fiecare specializare si an de studiu gasit, extrage cursurile corespunzatoare.
+        Paginile cu orare ale tuturor anilor de studiu sunt descarcate in paralel, iar
+        parsarea si scrierea in baza de date se fac pe masura ce paginile sosesc.
         """
         try:
-            response = requests.get(self.url, timeout=30)
-            response.encoding = 'utf-8'
-            response.raise_for_status()
+            html = fetch_text(self.url, self.http_session, self.page_cache)
         except requests.RequestException as e:
             error_msg = f"Eroare la accesarea URL-ului {self.url}: {e}"
             self.logger.error(error_msg)
             raise Exception(error_msg) from e
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(html, 'html.parser')
 
         table = soup.find("table")
         if not table:
@@ -64,6 +81,7 @@ class SpecializationsScrapper:
             self.logger.error(error_msg)
             raise Exception(error_msg)
 
+        pages = []
         try:
             for row in rows[1:-1]:
                 cols = row.find_all("td")
@@ -101,15 +119,15 @@ class SpecializationsScrapper:
 
                             href = link.find("a")["href"] if link.find("a") else None
                             if href:
-                                url = f"https://www.cs.ubbcluj.ro/files/orar/2024-2/tabelar/{href}"
-                                self.logger.info(f"Specializare: '{specialization}' si anul {study_year_text}")
-
-                                try:
-                                    self.courseScraper.scrape_tables(url, study_year_item)
-                                except Exception as e:
-                                    error_msg = f"Eroare la extragerea cursurilor pentru '{specialization}' anul {study_year}: {e}"
-                                    self.logger.error(error_msg)
-                                    raise Exception(error_msg) from e
+                                url = f"{SCRAPER_TIMETABLE_URL}/tabelar/{href}"
+                                pages.append({
+                                    "url": url,
+                                    "study_year_item": study_year_item,
+                                    "study_year": study_year,
+                                    "study_year_text": study_year_text,
+                                    "specialization": specialization,
+                                    "specialization_text": specialization_text,
+                                })
 
                         except Exception as e:
                             if "raise Exception(error_msg) from e" in str(e):
@@ -118,6 +136,8 @@ class SpecializationsScrapper:
                             self.logger.error(error_msg)
                             raise Exception(error_msg) from e
 
+            self.scrape_course_pages(pages)
+
         except Exception as e:
             if "raise Exception(error_msg) from e" in str(e):
                 raise
@@ -125,6 +145,79 @@ class SpecializationsScrapper:
             self.logger.error(error_msg)
             raise Exception(error_msg) from e
 
+    def scrape_course_pages(self, pages):
+        """
+        Descarca in paralel paginile cu orare si le proceseaza secvential, in ordinea sosirii.
+        Sesiunea bazei de date este folosita doar din thread-ul curent; thread-urile din pool
+        fac exclusiv cereri HTTP prin sesiunea HTTP partajata.
+
+        Argumente:
+            pages: Lista de dict-uri cu URL-ul paginii, anul de studiu si textele pentru mesajele de eroare
+        """
+        self.courseScraper.timings = {"fetch": 0.0, "parse": 0.0, "write": 0.0}
+        self.courseScraper.course_counts = {"inserted": 0, "duplicates": 0}
+        self.courseScraper.scraped_courses = []
+        self.courseScraper.skipped_study_year_ids = set()
+        skipped_pages = 0
+        arrivals = []
+        stage_start = time.perf_counter()
+        self.courseScraper.preload_cache()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {}
+            for page in pages:
+                future = executor.submit(self.courseScraper.fetch_page, page["url"])
+                future.add_done_callback(lambda _: arrivals.append(time.perf_counter()))
+                futures[future] = page
+
+            for future in as_completed(futures):
+                page = futures[future]
+                specialization = page["specialization"]
+                study_year = page["study_year"]
+                self.logger.info(f"Specializare: '{specialization}' si anul {page['study_year_text']}")
+
+                try:
+                    try:
+                        html = future.result()
+                        if self.courseScraper.incremental and self.page_cache and self.page_cache.is_unchanged(page["url"]):
+                            self.logger.info(f"Pagina {page['url']} nu s-a schimbat, se omite.")
+                            skipped_pages += 1
+                            self.courseScraper.skipped_study_year_ids.add(page["study_year_item"].study_year_id)
+                            continue
+                        self.courseScraper.scrape_tables(page["url"], page["study_year_item"], html=html)
+                    except Exception as e:
+                        error_msg = f"Eroare la extragerea cursurilor pentru '{specialization}' anul {study_year}: {e}"
+                        self.logger.error(error_msg)
+                        raise Exception(error_msg) from e
+
+                except Exception as e:
+                    error_msg = f"Eroare la procesarea anului de studiu '{page['study_year_text']}' pentru specializarea '{page['specialization_text']}': {e}"
+                    self.logger.error(error_msg)
+                    raise Exception(error_msg) from e
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if self.courseScraper.incremental:
+            self.courseScraper.course_counts = self.courseScraper.sync_scraped_courses()
+
+        self.timings = {
+            "pages": len(pages),
+            "skipped": skipped_pages,
+            "fetch": round(max(arrivals, default=stage_start) - stage_start, 3),
+            "parse": round(self.courseScraper.timings["parse"], 3),
+            "write": round(self.courseScraper.timings["write"], 3),
+            "total": round(time.perf_counter() - stage_start, 3),
+        }
+        self.logger.info(
+            f"Au fost procesate {len(pages)} pagini cu orare: descarcare {self.timings['fetch']}s, "
+            f"parsare {self.timings['parse']}s, scriere {self.timings['write']}s, total {self.timings['total']}s")
+
+        self.cache_stats = self.courseScraper.cache.stats
+        self.course_counts = self.courseScraper.course_counts
+        self.logger.info(f"Modificari cursuri: {self.course_counts}")
+        self.logger.info(f"Statistici cache (hits/misses): {self.cache_stats}")
+
     def parse_specialization(self, specialization_name):
         """
         Parseaza un string de specializare pentru a extrage programul si limba.
@@ -214,4 +307,4 @@ class SpecializationsScrapper:
         except Exception as e:
             error_msg = f"Eroare la parsarea anului de studiu '{year_text}': {e}"
             self.logger.error(error_msg)
-            raise Exception(error_msg) from e
\ No newline at end of file
+            raise Exception(error_msg) from e
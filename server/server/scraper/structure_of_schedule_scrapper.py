@@ -1,27 +1,28 @@
 from datetime import datetime
 import re
+from server.common.common_constants import SCRAPER_BASE_URL
 from server.common.logger import setup_logger
-import requests
 from bs4 import BeautifulSoup
 from server.models.academic_holiday import AcademicHoliday
 from server.models.academic_schedule import AcademicSchedule
 from server.repositories.academic_holiday_repository import AcademicHolidayRepository
 from server.repositories.academic_schedule_repository import AcademicScheduleRepository
+from server.scraper.http_client import fetch_text
 
 
 class StructureOfScheduleScrapper:
     logger = setup_logger(__name__)
 
-    def __init__(self, session):
+    def __init__(self, session, page_cache=None):
         self.session = session
+        self.page_cache = page_cache
         self.academic_schedule_repository = AcademicScheduleRepository(session)
         self.academic_holiday_repository = AcademicHolidayRepository(session)
-        self.url = "https://www.cs.ubbcluj.ro/invatamant/structura-anului-universitar/"
+        self.url = f"{SCRAPER_BASE_URL}/invatamant/structura-anului-universitar/"
 
     def scrape_schedule(self):
-        response = requests.get(self.url)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        html = fetch_text(self.url, page_cache=self.page_cache)
+        soup = BeautifulSoup(html, 'html.parser')
 
 
         tables = soup.find_all("table")
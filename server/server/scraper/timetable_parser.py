@@ -0,0 +1,113 @@
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from server.common.common_constants import SCRAPER_HTML_PARSER
+from server.common.logger import setup_logger
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+GROUP_HEADER_PATTERN = re.compile(r'Grupa \d+')
+
+logger = setup_logger(__name__)
+
+
+class SoupTimetableParser:
+    """
+    Backend de parsare bazat pe BeautifulSoup. Construieste arborele doar pentru elementele
+    h1 si table (SoupStrainer), restul paginii este ignorat.
+    """
+    name = "html.parser"
+
+    def __init__(self, features='html.parser'):
+        self.features = features
+        self.strainer = SoupStrainer(['h1', 'table'])
+
+    def extract(self, html) -> tuple[bool, list[tuple[str, list[tuple[list[str], list[str]]] | None]]]:
+        """
+        Extrage headerele de grupa si tabelele care le urmeaza, ca text.
+
+        Argumente:
+            html: Continutul HTML al paginii
+
+        Returneaza:
+            Pereche (pagina_are_tabele, grupe), unde grupe este lista de (text_header, randuri) si
+            randuri este lista de (texte_th, texte_td) pentru fiecare tr din tabel, sau None daca nu exista tabel
+        """
+        soup = BeautifulSoup(html, self.features, parse_only=self.strainer)
+        has_tables = soup.find('table') is not None
+        groups = []
+        for group_header in soup.find_all('h1', string=GROUP_HEADER_PATTERN):
+            table = group_header.find_next('table')
+            if table is None:
+                groups.append((group_header.text.strip(), None))
+                continue
+            rows = [([th.text.strip() for th in row.find_all('th')], [td.text.strip() for td in row.find_all('td')])
+                    for row in table.find_all('tr')]
+            groups.append((group_header.text.strip(), rows))
+        return has_tables, groups
+
+
+class LxmlTimetableParser:
+    """
+    Backend de parsare bazat pe lxml (parser in C). Produce exact aceleasi date ca SoupTimetableParser.
+    """
+    name = "lxml"
+
+    def __init__(self):
+        self.parser = lxml.html.HTMLParser(encoding='utf-8')
+
+    @staticmethod
+    def _single_string(element):
+        # Echivalentul Tag.string din BeautifulSoup: textul unui element cu un singur copil text
+        children = list(element)
+        if not children:
+            return element.text
+        if len(children) == 1 and not (element.text or '') and not (children[0].tail or ''):
+            return LxmlTimetableParser._single_string(children[0])
+        return None
+
+    def extract(self, html) -> tuple[bool, list[tuple[str, list[tuple[list[str], list[str]]] | None]]]:
+        # lxml refuza un str care incepe cu o declaratie <?xml ... encoding=...?> (ValueError), asa ca textul
+        # deja decodat este trimis ca bytes UTF-8, cu encodarea impusa parserului
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+        try:
+            document = lxml.html.document_fromstring(html, parser=self.parser)
+        except (lxml.etree.ParserError, ValueError):
+            return False, []
+        has_tables = False
+        groups = []
+        pending_headers = []
+        for element in document.iter('h1', 'table'):
+            if element.tag == 'h1':
+                string = self._single_string(element)
+                if string is not None and GROUP_HEADER_PATTERN.search(string):
+                    pending_headers.append(element.text_content().strip())
+                continue
+
+            has_tables = True
+            if pending_headers:
+                rows = [([th.text_content().strip() for th in row.iter('th')],
+                         [td.text_content().strip() for td in row.iter('td')])
+                        for row in element.iter('tr')]
+                groups.extend((header, rows) for header in pending_headers)
+                pending_headers = []
+        groups.extend((header, None) for header in pending_headers)
+        return has_tables, groups
+
+
+def get_timetable_parser(name=SCRAPER_HTML_PARSER):
+    """
+    Intoarce backend-ul de parsare cerut ('lxml' sau 'html.parser').
+    Daca lxml nu este instalat, se foloseste html.parser.
+    """
+    if name == LxmlTimetableParser.name:
+        if lxml is not None:
+            return LxmlTimetableParser()
+        logger.warning("lxml nu este instalat, se foloseste html.parser pentru paginile cu orare.")
+    return SoupTimetableParser()
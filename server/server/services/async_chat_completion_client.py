@@ -0,0 +1,159 @@
+import asyncio
+
+import httpx
+
+from server.common.common_constants import CHATBOT_MAX_CONCURRENCY
+from server.common.logger import setup_logger
+from server.services.chat_completion_client import ChatCompletionClient, ChatUnavailableError, build_payload, \
+    completion_text, stream_delta
+
+
+class AsyncChatCompletionClient:
+    """
+    Varianta asincrona a ChatCompletionClient, folosita de modul ASGI (server/asgi.py): cererile catre
+    serviciul de chat sunt corutine, deci o cerere care asteapta modelul nu mai ocupa un fir de executie.
+    Foloseste monitorul clientului sincron primit (ChatServiceMonitor: circuit breaker, contoare, histograme),
+    astfel incat /chat/metrics raporteaza ambele moduri; limita de cereri simultane este aplicata separat,
+    cu un asyncio.Semaphore. Construirea cererii, interpretarea raspunsului, deciziile de reincercare si
+    contabilitatea din monitor sunt cele din chat_completion_client; aici ramane doar partea de I/O cu httpx.
+    """
+    logger = setup_logger(__name__)
+
+    def __init__(self, client: ChatCompletionClient, max_concurrency: int = CHATBOT_MAX_CONCURRENCY):
+        """
+        Argumente:
+            client: Clientul sincron ale carui configurari si monitor sunt refolosite
+            max_concurrency: Numarul maxim de cereri simultane catre serviciu din bucla de evenimente
+        """
+        self.client = client
+        self.monitor = client.monitor
+        self.max_concurrency = max_concurrency
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.http_client = None
+
+    async def start(self):
+        """
+        Deschide pool-ul de conexiuni HTTP; se apeleaza la pornirea aplicatiei ASGI, in bucla de evenimente.
+        """
+        connect_timeout, read_timeout = self.client.timeout
+        self.http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=self.max_concurrency,
+                                max_keepalive_connections=self.max_concurrency),
+            headers=dict(self.client.http_session.headers),
+        )
+
+    async def aclose(self):
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
+    async def complete(self, messages: list[dict], temperature: float = 0.7) -> str:
+        """
+        Trimite conversatia si intoarce textul raspunsului generat.
+
+        Argumente:
+            messages: Lista de mesaje in formatul {"role": ..., "content": ...}
+            temperature: Temperatura de esantionare
+
+        Returneaza:
+            Continutul mesajului intors de model
+
+        Ridica:
+            Aceleasi exceptii ca ChatCompletionClient.complete
+        """
+        start = await self._acquire()
+        settled = False
+        try:
+            try:
+                response = await self._post_with_retries(build_payload(self.client.model, messages, temperature))
+                reply = completion_text(response.json())
+            except Exception as e:
+                settled = True
+                raise self.monitor.fail(e) from e
+            settled = True
+            self.monitor.record_success()
+            return reply
+        finally:
+            self._release(start, settled)
+
+    async def stream(self, messages: list[dict], temperature: float = 0.7):
+        """
+        Varianta cu streaming a metodei complete; reincercarile se fac doar inainte de primul fragment.
+
+        Returneaza:
+            Generator asincron de fragmente (str) ale raspunsului
+        """
+        start = await self._acquire()
+        # Ramane False daca generatorul este inchis inainte de final (clientul s-a deconectat)
+        settled = False
+        try:
+            try:
+                response = await self._post_with_retries(
+                    build_payload(self.client.model, messages, temperature, stream=True), stream=True)
+            except Exception as e:
+                settled = True
+                raise self.monitor.fail(e) from e
+
+            try:
+                first_token = True
+                async for line in response.aiter_lines():
+                    delta = stream_delta(line)
+                    if delta is None:
+                        break
+                    if delta:
+                        if first_token:
+                            self.monitor.first_token(start)
+                            first_token = False
+                        yield delta
+            except (httpx.HTTPError, ValueError, KeyError, IndexError) as e:
+                settled = True
+                raise self.monitor.fail(e) from e
+            finally:
+                await response.aclose()
+            settled = True
+            self.monitor.record_success()
+        finally:
+            self._release(start, settled)
+
+    async def _acquire(self) -> float:
+        self.monitor.admit()
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.client.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self.monitor.reject_busy()
+        try:
+            return self.monitor.start()
+        except ChatUnavailableError:
+            self.slots.release()
+            raise
+
+    def _release(self, start: float, settled: bool = True):
+        self.slots.release()
+        self.monitor.finish(start, settled)
+
+    async def _post_with_retries(self, payload: dict, stream: bool = False) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                request = self.http_client.build_request("POST", self.client.api_url, json=payload)
+                response = await self.http_client.send(request, stream=stream)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                delay = self.client.retry_policy.delay(attempt)
+                if delay is None:
+                    raise
+                self.logger.warning(f"Eroare de conectare la serviciul de chat ({e}), reincercare in {delay:.2f}s")
+            else:
+                delay = self.client.retry_policy.delay(attempt, response.status_code,
+                                                       response.headers.get("Retry-After"))
+                if delay is None:
+                    if response.is_error:
+                        await response.aclose()
+                    response.raise_for_status()
+                    return response
+                await response.aclose()
+                self.logger.warning(f"Serviciul de chat a raspuns {response.status_code}, reincercare in {delay:.2f}s")
+
+            self.monitor.count("retries")
+            await asyncio.sleep(delay)
+            attempt += 1
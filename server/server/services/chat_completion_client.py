@@ -0,0 +1,409 @@
+import json
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from server.common.common_constants import CHATBOT_CONNECT_TIMEOUT, CHATBOT_READ_TIMEOUT, CHATBOT_MAX_CONCURRENCY, \
+    CHATBOT_QUEUE_TIMEOUT, CHATBOT_MAX_RETRIES, CHATBOT_RETRY_BACKOFF, CHATBOT_BREAKER_THRESHOLD, \
+    CHATBOT_BREAKER_COOLDOWN
+from server.common.latency_histogram import LatencyHistogram
+from server.common.logger import setup_logger
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 10.0
+UNAVAILABLE_MESSAGE = "Serviciul de chat este indisponibil temporar, incercati mai tarziu."
+BUSY_MESSAGE = "Prea multe cereri catre serviciul de chat, incercati mai tarziu."
+
+
+class ChatCompletionError(Exception):
+    pass
+
+
+class ChatUnavailableError(ChatCompletionError):
+    pass
+
+
+def is_service_failure(e: Exception) -> bool:
+    """
+    Un raspuns 4xx (in afara de 429) inseamna ca cererea este gresita (cheie invalida, mesaj prea lung),
+    nu ca serviciul are probleme, deci nu trebuie sa deschida circuitul.
+    """
+    status_code = getattr(getattr(e, "response", None), "status_code", None)
+    return status_code is None or status_code >= 500 or status_code == 429
+
+
+class CircuitBreaker:
+    """
+    Dupa `threshold` esecuri consecutive circuitul se deschide si cererile sunt refuzate imediat
+    timp de `cooldown` secunde; apoi este lasata sa treaca o singura cerere de proba, care
+    inchide circuitul daca reuseste sau il redeschide daca esueaza. O proba abandonata fara rezultat
+    (clientul s-a deconectat) readuce circuitul in starea OPEN, deci urmatoarea cerere devine noua proba.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def available(self) -> bool:
+        """
+        Verificare fara efecte: False daca allow() ar refuza acum cererea.
+        """
+        with self.lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self.opened_at >= self.cooldown
+            return self.state == self.CLOSED
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_abandoned(self):
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                # Pauza s-a terminat deja (opened_at ramane), deci urmatoarea cerere poate fi proba
+                self.state = self.OPEN
+
+
+class ChatServiceMonitor:
+    """
+    Starea comuna a clientilor de chat: circuit breaker-ul, contoarele si histogramele de latenta.
+    Clientul sincron si cel asincron (modul ASGI) folosesc acelasi monitor, deci un serviciu cazut
+    deschide circuitul pentru ambele, iar /chat/metrics raporteaza ambele moduri.
+
+    Un apel trece prin admit(), ocuparea unui loc (specifica fiecarui client), start(), apoi
+    record_success() sau fail(), iar la final finish().
+    """
+    logger = setup_logger(__name__)
+
+    def __init__(self, breaker: CircuitBreaker = None):
+        self.breaker = breaker or CircuitBreaker(CHATBOT_BREAKER_THRESHOLD, CHATBOT_BREAKER_COOLDOWN)
+        self.latency = LatencyHistogram()
+        self.first_token_latency = LatencyHistogram()
+        self.counters = {"requests": 0, "succeeded": 0, "failed": 0, "retries": 0, "rejected": 0, "in_flight": 0}
+        self.lock = threading.Lock()
+
+    def count(self, name: str, value: int = 1):
+        with self.lock:
+            self.counters[name] += value
+
+    def admit(self):
+        """
+        Numara cererea si o refuza imediat daca circuitul este deschis, fara sa astepte un loc liber.
+        """
+        self.count("requests")
+        if not self.breaker.available():
+            self.count("rejected")
+            raise ChatUnavailableError(UNAVAILABLE_MESSAGE)
+
+    def reject_busy(self) -> ChatUnavailableError:
+        """
+        Returneaza exceptia pentru o cerere care nu a gasit loc liber in timpul queue_timeout.
+        """
+        self.count("rejected")
+        return ChatUnavailableError(BUSY_MESSAGE)
+
+    def start(self) -> float:
+        """
+        Cere voie circuit breaker-ului dupa ce cererea are un loc, ca o cerere de proba (HALF_OPEN) sa nu ramana
+        fara rezultat pentru ca nu a gasit loc liber. Daca cererea este refuzata, clientul elibereaza locul.
+
+        Returneaza:
+            Momentul inceperii (time.perf_counter), pentru finish si first_token
+        """
+        if not self.breaker.allow():
+            self.count("rejected")
+            raise ChatUnavailableError(UNAVAILABLE_MESSAGE)
+        self.count("in_flight")
+        return time.perf_counter()
+
+    def first_token(self, start: float):
+        self.first_token_latency.observe(time.perf_counter() - start)
+
+    def finish(self, start: float, settled: bool = True):
+        """
+        Argumente:
+            start: Valoarea intoarsa de start
+            settled: False daca apelul s-a incheiat fara rezultat (clientul s-a deconectat in timpul streaming-ului)
+        """
+        if not settled:
+            self.breaker.record_abandoned()
+        self.count("in_flight", -1)
+        self.latency.observe(time.perf_counter() - start)
+
+    def record_success(self):
+        self.breaker.record_success()
+        self.count("succeeded")
+
+    def record_failure(self, e: Exception):
+        if is_service_failure(e):
+            self.breaker.record_failure()
+        else:
+            # Serviciul a raspuns, deci functioneaza; o proba cu raspuns 4xx inchide circuitul
+            self.breaker.record_success()
+        self.count("failed")
+
+    def fail(self, e: Exception) -> ChatCompletionError:
+        """
+        Inregistreaza esecul si returneaza exceptia pe care clientul o ridica (raise monitor.fail(e) from e).
+        """
+        self.record_failure(e)
+        error_msg = f"Cererea catre serviciul de chat a esuat: {e}"
+        self.logger.error(error_msg)
+        return ChatCompletionError(error_msg)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            counters = dict(self.counters)
+        return {**counters, "circuit": self.breaker.state, "latency": self.latency.snapshot(),
+                "first_token_latency": self.first_token_latency.snapshot()}
+
+
+class RetryPolicy:
+    """
+    Decide daca o cerere esuata se reincearca: erorile de conectare si raspunsurile RETRY_STATUS_CODES,
+    de cel mult max_retries ori, cu interval exponential si jitter complet.
+    """
+
+    def __init__(self, max_retries: int, retry_backoff: float):
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def delay(self, attempt: int, status_code: int = None, retry_after: str = None) -> float | None:
+        """
+        Argumente:
+            attempt: Numarul incercarii care a esuat (0 pentru prima)
+            status_code: Codul HTTP primit; None pentru o eroare de conectare
+            retry_after: Header-ul Retry-After al raspunsului; o valoare numerica are prioritate
+                (limitata la MAX_RETRY_AFTER)
+
+        Returneaza:
+            Cat se asteapta inainte de reincercare (s) sau None daca rezultatul este final
+        """
+        if attempt >= self.max_retries:
+            return None
+        if status_code is not None and status_code not in RETRY_STATUS_CODES:
+            return None
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_AFTER)
+            except ValueError:
+                pass
+        return random.uniform(0, self.retry_backoff * 2 ** attempt)
+
+
+def build_payload(model: str, messages: list[dict], temperature: float, stream: bool = False) -> dict:
+    payload = {"model": model, "messages": messages, "temperature": temperature}
+    if stream:
+        payload["stream"] = True
+    return payload
+
+
+def completion_text(body: dict) -> str:
+    return body["choices"][0]["message"]["content"].strip()
+
+
+def stream_delta(line: str) -> str | None:
+    """
+    Interpreteaza o linie dintr-un raspuns cu streaming (Server-Sent Events).
+
+    Returneaza:
+            None la finalul raspunsului ("data: [DONE]"), "" pentru liniile fara text, altfel fragmentul de text
+
+    Ridica:
+        ValueError, KeyError sau IndexError daca linia nu are formatul asteptat
+    """
+    if not line or not line.startswith("data:"):
+        return ""
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return None
+    return json.loads(data)["choices"][0].get("delta", {}).get("content") or ""
+
+
+class ChatCompletionClient:
+    """
+    Client partajat pentru API-ul de chat completions (compatibil OpenAI).
+    Refoloseste conexiunile printr-o sesiune HTTP cu pool, limiteaza durata fiecarei cereri
+    (timeout de conectare si de citire) si numarul de cereri simultane, reincearca cu jitter
+    raspunsurile 429/5xx si erorile de conectare si opreste temporar apelurile cand serviciul
+    esueaza in mod repetat (circuit breaker). Circuit breaker-ul, contoarele si latentele sunt
+    pastrate intr-un ChatServiceMonitor, impartit cu AsyncChatCompletionClient.
+    """
+    logger = setup_logger(__name__)
+
+    def __init__(self, api_url: str, api_key: str, model: str,
+                 connect_timeout: float = CHATBOT_CONNECT_TIMEOUT, read_timeout: float = CHATBOT_READ_TIMEOUT,
+                 max_concurrency: int = CHATBOT_MAX_CONCURRENCY, queue_timeout: float = CHATBOT_QUEUE_TIMEOUT,
+                 max_retries: int = CHATBOT_MAX_RETRIES, retry_backoff: float = CHATBOT_RETRY_BACKOFF,
+                 monitor: ChatServiceMonitor = None):
+        """
+        Argumente:
+            api_url: URL-ul endpoint-ului de chat completions
+            api_key: Cheia API trimisa in header-ul Authorization
+            model: Modelul cerut
+            connect_timeout: Timpul maxim pentru stabilirea conexiunii (s)
+            read_timeout: Timpul maxim de asteptare a raspunsului (s)
+            max_concurrency: Numarul maxim de cereri simultane catre serviciu
+            queue_timeout: Cat asteapta o cerere un loc liber inainte de a fi refuzata (s)
+            max_retries: Numarul maxim de reincercari pentru 429/5xx si erori de conectare
+            retry_backoff: Baza intervalului de asteptare exponential dintre reincercari (s)
+            monitor: Monitorul folosit (optional); implicit se creeaza unul, cu circuit breaker-ul din constante
+        """
+        self.api_url = api_url
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+        self.queue_timeout = queue_timeout
+        self.retry_policy = RetryPolicy(max_retries, retry_backoff)
+        self.monitor = monitor or ChatServiceMonitor()
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+
+        self.http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.http_session.mount("http://", adapter)
+        self.http_session.mount("https://", adapter)
+        self.http_session.headers.update({"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"})
+
+    def complete(self, messages: list[dict], temperature: float = 0.7) -> str:
+        """
+        Trimite conversatia si intoarce textul raspunsului generat.
+
+        Argumente:
+            messages: Lista de mesaje in formatul {"role": ..., "content": ...}
+            temperature: Temperatura de esantionare
+
+        Returneaza:
+            Continutul mesajului intors de model
+
+        Ridica:
+            ChatUnavailableError daca circuitul este deschis sau nu exista loc liber in timpul queue_timeout
+            ChatCompletionError daca cererea esueaza dupa toate reincercarile
+        """
+        start = self._acquire()
+        settled = False
+        try:
+            try:
+                response = self._post_with_retries(build_payload(self.model, messages, temperature))
+                reply = completion_text(response.json())
+            except Exception as e:
+                settled = True
+                raise self.monitor.fail(e) from e
+            settled = True
+            self.monitor.record_success()
+            return reply
+        finally:
+            self._release(start, settled)
+
+    def stream(self, messages: list[dict], temperature: float = 0.7):
+        """
+        Varianta cu streaming a metodei complete: cere raspunsul cu "stream": true si intoarce
+        fragmentele de text pe masura ce sosesc. Reincercarile se fac doar inainte de primul fragment.
+
+        Argumente:
+            messages: Lista de mesaje in formatul {"role": ..., "content": ...}
+            temperature: Temperatura de esantionare
+
+        Returneaza:
+            Generator de fragmente (str) ale raspunsului
+
+        Ridica:
+            Aceleasi exceptii ca metoda complete, in momentul iterarii
+        """
+        start = self._acquire()
+        # Ramane False daca generatorul este inchis inainte de final (GeneratorExit la deconectarea clientului)
+        settled = False
+        try:
+            try:
+                response = self._post_with_retries(build_payload(self.model, messages, temperature, stream=True),
+                                                   stream=True)
+            except Exception as e:
+                settled = True
+                raise self.monitor.fail(e) from e
+
+            with response:
+                response.encoding = "utf-8"
+                first_token = True
+                try:
+                    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                        delta = stream_delta(line)
+                        if delta is None:
+                            break
+                        if delta:
+                            if first_token:
+                                self.monitor.first_token(start)
+                                first_token = False
+                            yield delta
+                except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+                    settled = True
+                    raise self.monitor.fail(e) from e
+            settled = True
+            self.monitor.record_success()
+        finally:
+            self._release(start, settled)
+
+    def _acquire(self) -> float:
+        self.monitor.admit()
+        if not self.slots.acquire(timeout=self.queue_timeout):
+            raise self.monitor.reject_busy()
+        try:
+            return self.monitor.start()
+        except ChatUnavailableError:
+            self.slots.release()
+            raise
+
+    def _release(self, start: float, settled: bool = True):
+        self.slots.release()
+        self.monitor.finish(start, settled)
+
+    def _post_with_retries(self, payload: dict, stream: bool = False) -> requests.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self.http_session.post(self.api_url, json=payload, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.ConnectTimeout) as e:
+                delay = self.retry_policy.delay(attempt)
+                if delay is None:
+                    raise
+                self.logger.warning(f"Eroare de conectare la serviciul de chat ({e}), reincercare in {delay:.2f}s")
+            else:
+                delay = self.retry_policy.delay(attempt, response.status_code, response.headers.get("Retry-After"))
+                if delay is None:
+                    if not response.ok:
+                        response.close()
+                    response.raise_for_status()
+                    return response
+                response.close()
+                self.logger.warning(f"Serviciul de chat a raspuns {response.status_code}, reincercare in {delay:.2f}s")
+
+            self.monitor.count("retries")
+            time.sleep(delay)
+            attempt += 1
+
+    def metrics(self) -> dict:
+        return self.monitor.snapshot()
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+
+from server.common.common_constants import CHATBOT_CACHE_SIZE, CHATBOT_CACHE_TTL, CHATBOT_CACHE_SIMILARITY, \
+    CHATBOT_CACHE_SIMILAR_MATCH
+from server.common.data_version import get_data_version, on_data_version_bump
+from server.common.logger import setup_logger
+from server.services.professor_retrieval import tokenize
+
+
+class ChatResponseCache:
+    """
+    Cache LRU cu expirare pentru raspunsurile chatbot-ului.
+    Cheia este mesajul normalizat (termenii folositi si de ProfessorIndex) impreuna cu versiunea datelor,
+    deci intrebarile formulate aproape identic primesc acelasi raspuns fara un nou apel catre model.
+    Implicit se refolosesc doar raspunsurile cu exact aceeasi cheie normalizata. Cu similar_match
+    (CHATBOT_CACHE_SIMILAR_MATCH), o intrebare noua poate refolosi si raspunsul unei intrebari cu termeni
+    suficient de asemanatori (similaritate Jaccard cel putin `similarity_threshold`).
+    Cache-ul se goleste cand scraper-ul actualizeaza datele.
+    """
+    logger = setup_logger(__name__)
+
+    def __init__(self, max_entries: int = CHATBOT_CACHE_SIZE, ttl: float = CHATBOT_CACHE_TTL,
+                 similar_match: bool = CHATBOT_CACHE_SIMILAR_MATCH,
+                 similarity_threshold: float = CHATBOT_CACHE_SIMILARITY):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similar_match = similar_match
+        self.similarity_threshold = similarity_threshold
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "similar_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    @staticmethod
+    def normalize(message: str) -> tuple:
+        return tuple(sorted(set(tokenize(message))))
+
+    def get(self, message: str) -> str | None:
+        """
+        Intoarce raspunsul memorat pentru mesaj (cu similar_match, si pentru cel mai asemanator mesaj memorat), daca exista.
+        """
+        terms = self.normalize(message)
+        if not terms:
+            return None
+        version = get_data_version()
+        now = time.monotonic()
+
+        with self.lock:
+            key = (version, terms)
+            entry = self.entries.get(key)
+            if entry and now - entry[0] > self.ttl:
+                del self.entries[key]
+                self.stats["expired"] += 1
+                entry = None
+            if entry:
+                self.entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+
+            if self.similar_match:
+                similar_key = self._most_similar(version, set(terms), now)
+                if similar_key:
+                    self.entries.move_to_end(similar_key)
+                    self.stats["similar_hits"] += 1
+                    return self.entries[similar_key][1]
+
+            self.stats["misses"] += 1
+            return None
+
+    def _most_similar(self, version: str, terms: set, now: float):
+        best_key, best_score = None, self.similarity_threshold
+        for key, (created_at, _) in self.entries.items():
+            if key[0] != version or now - created_at > self.ttl:
+                continue
+            candidate = set(key[1])
+            score = len(terms & candidate) / len(terms | candidate)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def put(self, message: str, reply: str):
+        terms = self.normalize(message)
+        if not terms or not reply:
+            return
+        with self.lock:
+            key = (get_data_version(), terms)
+            self.entries[key] = (time.monotonic(), reply)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self, version: str = None):
+        with self.lock:
+            self.entries.clear()
+        self.logger.info(f"Cache-ul de raspunsuri al chatbot-ului a fost golit (versiunea datelor {version})")
+
+    def metrics(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self.entries)
+        lookups = stats["hits"] + stats["similar_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["similar_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+chat_response_cache = ChatResponseCache()
+on_data_version_bump(chat_response_cache.clear)
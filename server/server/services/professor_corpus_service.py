@@ -0,0 +1,74 @@
+import threading
+from typing import NamedTuple
+
+from server.common.data_version import get_data_version
+from server.common.logger import setup_logger
+from server.repositories.professor_repository import ProfessorRepository
+from server.services.professor_retrieval import ProfessorIndex
+
+
+class ProfessorCorpusEntry(NamedTuple):
+    professor_id: str
+    name: str
+    domains: list[str]
+    subjects: list[str]
+    line: str
+
+
+class ProfessorCorpus:
+    """
+    Lista profesorilor folosita in prompt-ul chatbot-ului, in formatul "Nume | Domenii | Materii".
+    Se construieste dintr-o singura interogare agregata si se pastreaza in memorie pana cand
+    scraper-ul modifica datele (versiunea din server.common.data_version se schimba).
+    """
+    logger = setup_logger(__name__)
+
+    def __init__(self):
+        self.version = None
+        self.entries = []
+        self.index = ProfessorIndex([])
+        self.lock = threading.Lock()
+
+    def get(self, Session) -> list[ProfessorCorpusEntry]:
+        """
+        Intoarce intrarile corpusului, reconstruindu-le daca datele au fost actualizate de la ultima incarcare.
+
+        Argumente:
+            Session: Fabrica de sesiuni SQLAlchemy, folosita doar cand corpusul trebuie reconstruit
+        """
+        version = get_data_version()
+        if self.version == version:
+            return self.entries
+
+        with self.lock:
+            if self.version != version:
+                session = Session()
+                try:
+                    rows = ProfessorRepository(session).get_professor_corpus_rows()
+                finally:
+                    session.close()
+                entries = [self.build_entry(*row) for row in rows]
+                self.index = ProfessorIndex(entries)
+                self.entries = entries
+                self.version = version
+                self.logger.info(f"Corpusul de profesori a fost reconstruit: {len(self.entries)} profesori "
+                                 f"(versiunea {version})")
+            return self.entries
+
+    def search(self, Session, message: str, top_k: int) -> list[ProfessorCorpusEntry]:
+        """
+        Intoarce profesorii cei mai apropiati de mesajul studentului (vezi ProfessorIndex.search).
+        """
+        self.get(Session)
+        return self.index.search(message, top_k)
+
+    @staticmethod
+    def build_entry(professor_id, first_name, last_name, domains, subjects) -> ProfessorCorpusEntry:
+        domains = list(domains or [])
+        subjects = list(subjects or [])
+        name = f"{first_name} {last_name}"
+        line = f"{name} | {', '.join(domains) or 'N/A'} | {', '.join(subjects) or 'N/A'}"
+        return ProfessorCorpusEntry(str(professor_id), name, domains, subjects, line)
+
+
+professor_corpus = ProfessorCorpus()
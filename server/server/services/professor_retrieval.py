@@ -0,0 +1,71 @@
+import math
+import re
+from collections import Counter
+
+from server.utils.text_utils import unaccent
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STEM_LENGTH = 6
+STOP_WORDS = {
+    "si", "sau", "de", "la", "in", "cu", "pe", "din", "pentru", "care", "ce", "un", "o", "al", "ale", "ai",
+    "lui", "unei", "unui", "este", "sunt", "vreau", "as", "doresc", "imi", "mi", "ma", "eu", "despre",
+    "lucrare", "lucrarea", "licenta", "profesor", "profesori", "coordonator", "the", "and", "of", "for",
+    "in", "to", "a", "an", "with", "on", "my", "i", "want", "about", "thesis",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Imparte textul in termeni: fara diacritice, litere mici, fara cuvinte de legatura,
+    trunchiati la STEM_LENGTH caractere ca formele flexionate ("retele", "retelelor") sa coincida.
+    """
+    words = TOKEN_PATTERN.findall(unaccent(text or "").lower())
+    return [word[:STEM_LENGTH] for word in words if len(word) > 1 and word not in STOP_WORDS]
+
+
+class ProfessorIndex:
+    """
+    Index TF-IDF in memorie peste domeniile, materiile si numele profesorilor.
+    Se construieste o data cu corpusul si permite alegerea celor mai relevanti profesori
+    pentru mesajul unui student, astfel incat in prompt sa ajunga doar acestia.
+    """
+
+    def __init__(self, entries):
+        """
+        Argumente:
+            entries: Lista de ProfessorCorpusEntry
+        """
+        self.entries = entries
+        documents = [tokenize(" ".join([entry.name, *entry.domains, *entry.subjects])) for entry in entries]
+
+        document_frequency = Counter(term for terms in documents for term in set(terms))
+        total = len(documents)
+        self.idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in document_frequency.items()}
+
+        self.postings = {}
+        for position, terms in enumerate(documents):
+            for term, weight in self._vector(terms).items():
+                self.postings.setdefault(term, []).append((position, weight))
+
+    def _vector(self, terms) -> dict:
+        counts = Counter(term for term in terms if term in self.idf)
+        vector = {term: (1 + math.log(count)) * self.idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+    def search(self, query: str, top_k: int) -> list:
+        """
+        Intoarce cel mult top_k profesori ordonati dupa similaritatea cosinus cu mesajul.
+
+        Argumente:
+            query: Mesajul studentului
+            top_k: Numarul maxim de profesori intorsi
+
+        Returneaza:
+            Lista de ProfessorCorpusEntry cu scor pozitiv; lista goala daca mesajul nu are niciun termen comun cu corpusul
+        """
+        scores = Counter()
+        for term, query_weight in self._vector(tokenize(query)).items():
+            for position, weight in self.postings[term]:
+                scores[position] += query_weight * weight
+        return [self.entries[position] for position, _ in scores.most_common(top_k)]
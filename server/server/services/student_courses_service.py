@@ -23,7 +23,7 @@ class StudentCoursesService:
     def update_student_courses(self, student_id: UUID, new_courses) -> bool:
         """
         Actualizează lista de cursuri pentru un anumit student.
-        Șterge toate înregistrările existente și adaugă noile cursuri.
+        Sunt șterse doar cursurile scoase din listă și adăugate doar cele noi.
 
         Args:
             student_id: UUID-ul studentului
@@ -33,10 +33,12 @@ class StudentCoursesService:
             bool: True dacă actualizarea a reușit, False în caz contrar
         """
         try:
-            # Șterge toate înregistrările existente pentru acest student
-            self.studentCourses.update_student_courses(student_id,new_courses)
-            self.logger.info("Update cu succes")
-            return True;
+            updated = self.studentCourses.update_student_courses(student_id, new_courses)
+            if updated:
+                self.logger.info("Update cu succes")
+            else:
+                self.logger.error("Actualizarea cursurilor studentului a esuat")
+            return updated
         except Exception as e:
             self.logger.error(f"Eroare la actualizarea cursurilor studentului: {str(e)}")
             return False
@@ -45,4 +47,16 @@ class StudentCoursesService:
         return self.studentCourses.get_all_courses_for_a_student(student_id)
 
     def get_no_students(self,course_id):
-        return self.studentCourses.get_no_students_for_course(course_id)
\ No newline at end of file
+        return self.studentCourses.get_no_students_for_course(course_id)
+
+    def get_no_students_for_courses(self, course_ids) -> dict:
+        """
+        Numarul de studenti inscrisi la fiecare curs, obtinut printr-o singura interogare grupata.
+
+        Args:
+            course_ids: ID-urile cursurilor
+
+        Returns:
+            dict: course_id -> numar de studenti (0 pentru cursurile fara studenti)
+        """
+        return self.studentCourses.get_no_students_for_courses(course_ids)
\ No newline at end of file
@@ -0,0 +1,24 @@
+from server.repositories.student_hierarchy_repository import StudentHierarchy, StudentHierarchyRepository
+
+
+class StudentHierarchyService:
+    """
+    Service pentru rezolvarea ierarhiei student -> subgrupa -> grupa -> an de studiu -> specializare
+    """
+
+    def __init__(self, session):
+        self.studentHierarchyRepository = StudentHierarchyRepository(session)
+
+    def get_by_student_id(self, student_id) -> StudentHierarchy | None:
+        return self.studentHierarchyRepository.get_by_student_id(student_id)
+
+    def get_by_student_email(self, email: str) -> StudentHierarchy | None:
+        return self.studentHierarchyRepository.get_by_student_email(email)
+
+    def get_by_subgroup_id(self, subgroup_id) -> StudentHierarchy | None:
+        return self.studentHierarchyRepository.get_by_subgroup_id(subgroup_id)
+
+    def get_by_numbers(self, specialization_name, specialization_language, year, group_number,
+                       subgroup_number) -> StudentHierarchy | None:
+        return self.studentHierarchyRepository.get_by_numbers(specialization_name, specialization_language, year,
+                                                              group_number, subgroup_number)
@@ -1,5 +1,10 @@
-from flask import jsonify
-from server.common.common_constants import HTTP_OK_CODE
+import hashlib
+from datetime import date
+from functools import wraps
+
+from flask import jsonify, current_app, request
+from server.common.common_constants import HTTP_OK_CODE, REFERENCE_DATA_MAX_AGE
+from server.common.data_version import get_data_version
 
 def handle_response(message, data=None, status_code=HTTP_OK_CODE):
     response = {
@@ -7,4 +12,39 @@ def handle_response(message, data=None, status_code=HTTP_OK_CODE):
         'data': data,
         'status': status_code
     }
-    return jsonify(response)
+    response = jsonify(response)
+    response.payload_status = status_code
+    return response
+
+
+def handle_cached_response(body: bytes):
+    response = current_app.response_class(body, mimetype=current_app.json.mimetype)
+    response.payload_status = HTTP_OK_CODE
+    return response
+
+
+def versioned_response(view):
+    """
+    Decorator pentru rutele GET care depind doar de datele de referinta (actualizate de scraper)
+    si de parametrii cererii. Raspunsul primeste un ETag puternic construit din versiunea datelor,
+    data curenta si calea completa a cererii; daca clientul trimite acelasi ETag in If-None-Match,
+    se raspunde 304 Not Modified fara a apela ruta si fara a accesa baza de date.
+    Doar raspunsurile reusite (status 200 in corpul raspunsului) sunt marcate ca reutilizabile.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = f"{get_data_version()}|{date.today().isoformat()}|{request.full_path}"
+        etag = hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+        if etag in request.if_none_match:
+            response = current_app.response_class(status=304)
+        else:
+            response = view(*args, **kwargs)
+            if getattr(response, "payload_status", None) != HTTP_OK_CODE:
+                return response
+
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = f"private, max-age={REFERENCE_DATA_MAX_AGE}, must-revalidate"
+        return response
+
+    return wrapper
@@ -0,0 +1,70 @@
+import threading
+
+from flask import current_app
+
+from server.common.common_constants import DATA_MESSAGE, HTTP_OK_CODE
+from server.common.data_version import get_data_version
+from server.common.logger import setup_logger
+
+
+class ReferenceDataCache:
+    """
+    Cache in memorie, comun pentru tot procesul, pentru listele de date de referinta.
+    Fiecare lista este pastrata direct ca raspuns JSON serializat (bytes), impreuna cu versiunea
+    datelor din care a fost construita; la schimbarea versiunii este reincarcata la prima cerere.
+    """
+    logger = setup_logger(__name__)
+
+    def __init__(self):
+        self.loaders = {}
+        self.entries = {}
+        self.locks = {}
+
+    def register(self, name, loader):
+        """
+        Argumente:
+            name: Numele listei (de exemplu 'groups')
+            loader: Functie (session) -> lista serializabila intoarsa in campul 'data' al raspunsului
+        """
+        self.loaders[name] = loader
+        self.locks[name] = threading.Lock()
+
+    def get(self, name, Session) -> bytes:
+        """
+        Intoarce raspunsul JSON pentru lista ceruta, incarcand-o din baza de date doar daca lipseste
+        sau a fost construita pentru o versiune mai veche a datelor. Trebuie apelata in contextul aplicatiei.
+        """
+        version = get_data_version()
+        entry = self.entries.get(name)
+        if entry and entry[0] == version:
+            return entry[1]
+
+        with self.locks[name]:
+            entry = self.entries.get(name)
+            if entry and entry[0] == version:
+                return entry[1]
+
+            session = Session()
+            try:
+                data = self.loaders[name](session)
+            finally:
+                session.close()
+
+            body = current_app.json.response(
+                {'message': DATA_MESSAGE, 'data': data, 'status': HTTP_OK_CODE}).get_data()
+            self.entries[name] = (version, body)
+            self.logger.info(f"Lista '{name}' a fost incarcata in cache ({len(data)} elemente, versiunea {version})")
+            return body
+
+    def warm(self, Session):
+        """
+        Incarca toate listele inregistrate; se apeleaza la pornirea aplicatiei.
+        """
+        for name in self.loaders:
+            try:
+                self.get(name, Session)
+            except Exception as e:
+                self.logger.error(f"Lista '{name}' nu a putut fi incarcata in cache: {e}")
+
+
+reference_data_cache = ReferenceDataCache()
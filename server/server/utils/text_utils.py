@@ -0,0 +1,13 @@
+import unicodedata
+
+
+def unaccent(value: str) -> str:
+    """
+    Elimina diacriticele dintr-un text (ă, â, î, ș, ț, á, é, ö etc.) prin descompunere NFKD.
+    Nu este identica cu unaccent din PostgreSQL (de exemplu pentru ł, ø, ß); potrivirea numelor
+    de profesori din scraper foloseste normalizarea din baza de date (ProfessorNameIndex).
+    """
+    if not value:
+        return value
+    decomposed = unicodedata.normalize('NFKD', value)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
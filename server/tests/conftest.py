@@ -0,0 +1,116 @@
+"""
+Fixture-uri comune pentru teste.
+Testele care au nevoie de Postgres folosesc baza de date din TEST_DATABASE_URL (de exemplu
+postgresql+psycopg2://postgres@localhost:5432/planner4students_test), cu extensia unaccent disponibila;
+schema este recreata la inceputul rularii. Fara TEST_DATABASE_URL, aceste teste sunt omise.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from server.benchmarks.scraper_benchmark import prepare_database
+
+
+@pytest.fixture(scope="session")
+def engine():
+    database_url = os.getenv("TEST_DATABASE_URL")
+    if not database_url:
+        pytest.skip("TEST_DATABASE_URL nu este setat")
+    engine = create_engine(database_url)
+    prepare_database(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """
+    Sesiune intr-o tranzactie anulata la finalul testului; commit-urile din cod devin savepoint-uri.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def timetable(session):
+    """
+    Un an de studiu cu o grupa si o subgrupa, trei profesori si o sala, pentru testele pe cursuri.
+    """
+    from types import SimpleNamespace
+
+    from server.repositories.group_repository import GroupRepository
+    from server.repositories.professor_repository import ProfessorRepository
+    from server.repositories.room_repository import RoomRepository
+    from server.repositories.specialization_repository import SpecializationRepository
+    from server.repositories.study_year_repository import StudyYearRepository
+    from server.repositories.subgroup_repository import SubgroupRepository
+
+    specialization = SpecializationRepository(session).add_specialization("Informatica", "romana")
+    study_year = StudyYearRepository(session).add_study_year(1, specialization)
+    group = GroupRepository(session).add_group(211, study_year)
+    subgroup = SubgroupRepository(session).add_subgroup(1, group)
+    professors = [ProfessorRepository(session).add_professor(f"Prenume{index}", f"Nume{index}", "Lect.")
+                  for index in range(3)]
+    room = RoomRepository(session).add_room("C310")
+    return SimpleNamespace(study_year=study_year, group=group, subgroup=subgroup, professors=professors, room=room)
+
+
+def make_course(timetable, professor, name="Algoritmi", **overrides):
+    from datetime import time
+
+    from server.models.course import Course
+
+    values = dict(name=name, professor_id=professor.professor_id, course_type="Curs",
+                  study_year_id=timetable.study_year.study_year_id, group_id=None, subgroup_id=None,
+                  day="Luni", start_time=time(8, 0), end_time=time(10, 0), room_id=timetable.room.room_id,
+                  frequency=None)
+    values.update(overrides)
+    return Course(**values)
+
+
+@pytest.fixture
+def chat_stub():
+    """
+    chat_stub_server pornit pe un port liber. Testul poate modifica atributele handler-ului intors
+    (latency, error_rate, ...); cererile primite sunt in handler.received, iar URL-ul in handler.url.
+    """
+    import threading
+    from http.server import ThreadingHTTPServer
+
+    from server.benchmarks.chat_stub_server import ChatStubHandler
+
+    handler = type("ChatStubTestHandler", (ChatStubHandler,), {"received": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    handler.url = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+    try:
+        yield handler
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope="session")
+def chat_app():
+    """
+    Aplicatie Flask doar cu rutele chatbot-ului. Testele inlocuiesc chat_client si professor_corpus si
+    leaga fabrica de sesiuni app.Session de conexiunea testului (app.Session.configure(bind=...)).
+    """
+    from flask import Flask
+    from sqlalchemy.orm import sessionmaker
+
+    from server.routes.chatbot_routes import register_routes_chatbot
+
+    app = Flask(__name__)
+    app.Session = sessionmaker(join_transaction_mode="create_savepoint")
+    register_routes_chatbot(app, app.Session)
+    return app
@@ -0,0 +1,243 @@
+import threading
+import time
+
+import pytest
+
+from server.services.chat_completion_client import ChatCompletionClient, ChatCompletionError, \
+    ChatServiceMonitor, ChatUnavailableError, CircuitBreaker, MAX_RETRY_AFTER, RetryPolicy, stream_delta
+
+MESSAGES = [{"role": "user", "content": "Profesori disponibili:\nAndrei MARCUS | Retele | Retele\n"}]
+
+
+def make_client(chat_stub, threshold=5, cooldown=30.0, **options) -> ChatCompletionClient:
+    options = {"max_retries": 2, "retry_backoff": 0.01, "queue_timeout": 1.0, **options}
+    return ChatCompletionClient(chat_stub.url, "test", "stub", monitor=ChatServiceMonitor(CircuitBreaker(threshold, cooldown)),
+                                **options)
+
+
+def open_breaker(client):
+    for _ in range(client.monitor.breaker.threshold):
+        client.monitor.breaker.record_failure()
+
+
+def test_retries_5xx_until_success(chat_stub):
+    chat_stub.error_count = 2
+    client = make_client(chat_stub)
+
+    assert client.complete(MESSAGES).startswith("Andrei MARCUS")
+    assert len(chat_stub.received) == 3
+    assert client.metrics()["retries"] == 2
+    assert client.monitor.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_gives_up_after_max_retries(chat_stub):
+    chat_stub.error_count = 10
+    client = make_client(chat_stub, max_retries=1)
+
+    with pytest.raises(ChatCompletionError):
+        client.complete(MESSAGES)
+    assert len(chat_stub.received) == 2
+    assert client.monitor.breaker.failures == 1
+
+
+def test_retry_after_header_sets_the_delay(chat_stub):
+    chat_stub.error_count = 1
+    chat_stub.retry_after = "0.3"
+    client = make_client(chat_stub)
+
+    start = time.perf_counter()
+    client.complete(MESSAGES)
+
+    assert time.perf_counter() - start >= 0.3
+
+
+def test_client_errors_are_not_retried_nor_breaker_failures(chat_stub):
+    chat_stub.error_count = 1
+    chat_stub.error_status = 400
+    client = make_client(chat_stub, threshold=1)
+
+    with pytest.raises(ChatCompletionError):
+        client.complete(MESSAGES)
+    assert len(chat_stub.received) == 1
+    assert client.monitor.breaker.state == CircuitBreaker.CLOSED
+    assert client.monitor.breaker.failures == 0
+
+
+def test_breaker_opens_rejects_and_closes_after_successful_probe(chat_stub):
+    chat_stub.error_count = 2
+    client = make_client(chat_stub, threshold=2, cooldown=0.2, max_retries=0)
+
+    for _ in range(2):
+        with pytest.raises(ChatCompletionError):
+            client.complete(MESSAGES)
+    assert client.monitor.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(ChatUnavailableError):
+        client.complete(MESSAGES)
+    assert len(chat_stub.received) == 2
+
+    time.sleep(0.25)
+    client.complete(MESSAGES)
+    assert client.monitor.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens_breaker(chat_stub):
+    chat_stub.error_count = 1
+    client = make_client(chat_stub, threshold=1, cooldown=0.1, max_retries=0)
+    open_breaker(client)
+    time.sleep(0.15)
+
+    with pytest.raises(ChatCompletionError):
+        client.complete(MESSAGES)
+
+    assert client.monitor.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(ChatUnavailableError):
+        client.complete(MESSAGES)
+
+
+def test_queue_timeout_rejects_when_all_slots_are_busy(chat_stub):
+    chat_stub.latency = 0.5
+    client = make_client(chat_stub, max_concurrency=1, queue_timeout=0.1)
+    busy = threading.Thread(target=client.complete, args=(MESSAGES,))
+    busy.start()
+    time.sleep(0.1)
+
+    with pytest.raises(ChatUnavailableError):
+        client.complete(MESSAGES)
+    busy.join()
+
+    metrics = client.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["in_flight"] == 0
+    assert client.monitor.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_probe_without_a_free_slot_does_not_lock_the_breaker(chat_stub):
+    client = make_client(chat_stub, threshold=1, cooldown=0.1, max_concurrency=1, queue_timeout=0.1)
+    open_breaker(client)
+    time.sleep(0.15)
+    client.slots.acquire()
+
+    with pytest.raises(ChatUnavailableError):
+        client.complete(MESSAGES)
+    assert client.monitor.breaker.state == CircuitBreaker.OPEN
+
+    client.slots.release()
+    client.complete(MESSAGES)
+    assert client.monitor.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_abandoned_stream_probe_does_not_lock_the_breaker(chat_stub):
+    client = make_client(chat_stub, threshold=1, cooldown=0.1, max_concurrency=1)
+    open_breaker(client)
+    time.sleep(0.15)
+
+    stream = client.stream(MESSAGES)
+    next(stream)
+    assert client.monitor.breaker.state == CircuitBreaker.HALF_OPEN
+    stream.close()
+
+    assert client.monitor.breaker.state == CircuitBreaker.OPEN
+    assert client.metrics()["in_flight"] == 0
+    client.complete(MESSAGES)
+    assert client.monitor.breaker.state == CircuitBreaker.CLOSED
+
+
+def run_async(client, scenario):
+    import asyncio
+
+    from server.services.async_chat_completion_client import AsyncChatCompletionClient
+
+    async def main():
+        async_client = AsyncChatCompletionClient(client, max_concurrency=1)
+        await async_client.start()
+        try:
+            return await scenario(async_client)
+        finally:
+            await async_client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_async_probe_without_a_free_slot_does_not_lock_the_breaker(chat_stub):
+    pytest.importorskip("httpx")
+    client = make_client(chat_stub, threshold=1, cooldown=0.1, queue_timeout=0.1)
+    open_breaker(client)
+    time.sleep(0.15)
+
+    async def scenario(async_client):
+        await async_client.slots.acquire()
+        with pytest.raises(ChatUnavailableError):
+            await async_client.complete(MESSAGES)
+        assert client.monitor.breaker.state == CircuitBreaker.OPEN
+        async_client.slots.release()
+        return await async_client.complete(MESSAGES)
+
+    assert run_async(client, scenario).startswith("Andrei MARCUS")
+    assert client.monitor.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_async_abandoned_stream_probe_does_not_lock_the_breaker(chat_stub):
+    pytest.importorskip("httpx")
+    client = make_client(chat_stub, threshold=1, cooldown=0.1)
+    open_breaker(client)
+    time.sleep(0.15)
+
+    async def scenario(async_client):
+        stream = async_client.stream(MESSAGES)
+        await stream.__anext__()
+        assert client.monitor.breaker.state == CircuitBreaker.HALF_OPEN
+        await stream.aclose()
+        assert client.monitor.breaker.state == CircuitBreaker.OPEN
+        assert async_client.slots.locked() is False
+        return await async_client.complete(MESSAGES)
+
+    run_async(client, scenario)
+    assert client.monitor.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_async_client_shares_the_monitor_of_the_sync_client(chat_stub):
+    pytest.importorskip("httpx")
+    chat_stub.error_count = 2
+    client = make_client(chat_stub, threshold=2, max_retries=0)
+
+    with pytest.raises(ChatCompletionError):
+        client.complete(MESSAGES)
+
+    async def scenario(async_client):
+        with pytest.raises(ChatCompletionError):
+            await async_client.complete(MESSAGES)
+
+    run_async(client, scenario)
+    # Un esec din fiecare client deschide circuitul comun
+    assert client.monitor.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(ChatUnavailableError):
+        client.complete(MESSAGES)
+    metrics = client.metrics()
+    assert metrics["requests"] == 3
+    assert metrics["failed"] == 2
+    assert metrics["rejected"] == 1
+    assert metrics["latency"]["count"] == 2
+
+
+def test_retry_policy_decisions():
+    policy = RetryPolicy(max_retries=2, retry_backoff=0.5)
+
+    assert 0 <= policy.delay(0) <= 0.5
+    assert 0 <= policy.delay(1, 503) <= 1.0
+    assert policy.delay(0, 429, "3") == 3.0
+    assert policy.delay(0, 429, "600") == MAX_RETRY_AFTER
+    assert policy.delay(0, 400) is None
+    assert policy.delay(0, 200) is None
+    assert policy.delay(2, 503) is None
+    assert policy.delay(2) is None
+
+
+def test_stream_delta_parsing():
+    assert stream_delta('data: {"choices": [{"delta": {"content": "Ana"}}]}') == "Ana"
+    assert stream_delta('data: {"choices": [{"delta": {"role": "assistant"}}]}') == ""
+    assert stream_delta("") == ""
+    assert stream_delta(": keep-alive") == ""
+    assert stream_delta("data: [DONE]") is None
+    with pytest.raises(ValueError):
+        stream_delta("data: {trunchiat")
@@ -0,0 +1,22 @@
+from server.services.chat_response_cache import ChatResponseCache
+
+QUESTION = "Caut o tema despre retele de calculatoare si securitate"
+SIMILAR_QUESTION = "Caut o tema despre retele de calculatoare si securitate wireless"
+
+
+def test_only_exact_normalized_messages_hit_by_default():
+    cache = ChatResponseCache()
+    cache.put(QUESTION, "Andrei MARCUS")
+
+    assert cache.get("caut tema despre securitate si retele de calculatoare") == "Andrei MARCUS"
+    assert cache.get(SIMILAR_QUESTION) is None
+    assert cache.metrics()["similar_hits"] == 0
+
+
+def test_similar_messages_hit_when_enabled():
+    cache = ChatResponseCache(similar_match=True, similarity_threshold=0.75)
+    cache.put(QUESTION, "Andrei MARCUS")
+
+    assert cache.get(SIMILAR_QUESTION) == "Andrei MARCUS"
+    assert cache.get("retele neuronale") is None
+    assert cache.metrics()["similar_hits"] == 1
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from server.routes import chatbot_routes
+from server.services.chat_completion_client import ChatCompletionClient, ChatServiceMonitor, CircuitBreaker
+from server.services.chat_response_cache import chat_response_cache
+
+MESSAGES = [{"role": "user", "content": "Profesori disponibili:\nAndrei MARCUS | Retele | Retele\n"}]
+REPLY = "Andrei MARCUS - potrivire dupa domenii si materii"
+
+
+@pytest.fixture
+def stream_client(chat_app, chat_stub, monkeypatch):
+    client = ChatCompletionClient(chat_stub.url, "test", "stub", max_concurrency=1, queue_timeout=0.1,
+                                  max_retries=0, monitor=ChatServiceMonitor(CircuitBreaker(1, 30)))
+    monkeypatch.setattr(chatbot_routes, "chat_client", client)
+    monkeypatch.setattr(chatbot_routes, "build_chat_messages", lambda message, Session: MESSAGES)
+    chat_response_cache.clear()
+    return client
+
+
+def parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.split("\n\n"):
+        if not frame:
+            continue
+        fields = dict(line.split(": ", 1) for line in frame.split("\n"))
+        events.append((fields.get("event", "message"), json.loads(fields["data"])))
+    return events
+
+
+def test_stream_is_framed_as_server_sent_events(chat_app, stream_client):
+    response = chat_app.test_client().post("/chat/stream", json={"message": "retele"})
+
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    body = response.get_data(as_text=True)
+    assert body.endswith("\n\n")
+    events = parse_events(body)
+    assert [name for name, _ in events] == ["message"] * len(REPLY.split(" ")) + ["done"]
+    assert "".join(payload["delta"] for name, payload in events if name == "message") == REPLY
+
+
+def test_done_marker_ends_the_stream_successfully(chat_app, stream_client):
+    chat_app.test_client().post("/chat/stream", json={"message": "retele"}).get_data()
+
+    metrics = stream_client.metrics()
+    assert (metrics["succeeded"], metrics["failed"], metrics["in_flight"]) == (1, 0, 0)
+    assert chat_response_cache.get("retele") == REPLY
+    assert metrics["first_token_latency"]["count"] == 1
+
+
+def test_error_event_after_partial_stream(chat_app, chat_stub, stream_client):
+    chat_stub.stream_abort_after = 2
+
+    events = parse_events(chat_app.test_client().post("/chat/stream", json={"message": "retele"}).get_data(as_text=True))
+
+    assert [name for name, _ in events] == ["message", "message", "error"]
+    assert "".join(payload["delta"] for name, payload in events[:2]) == "Andrei MARCUS"
+    metrics = stream_client.metrics()
+    assert (metrics["failed"], metrics["in_flight"]) == (1, 0)
+    assert stream_client.monitor.breaker.state == CircuitBreaker.OPEN
+    assert chat_response_cache.get("retele") is None
+
+
+def test_client_disconnect_releases_the_slot(chat_app, chat_stub, stream_client):
+    chat_stub.token_delay = 0.05
+    response = chat_app.test_client().post("/chat/stream", json={"message": "retele"}, buffered=False)
+    first = next(iter(response.response))
+    assert b"Andrei" in first
+    assert stream_client.metrics()["in_flight"] == 1
+
+    response.close()
+
+    assert stream_client.metrics()["in_flight"] == 0
+    assert stream_client.slots.acquire(timeout=0)
+    stream_client.slots.release()
+    assert stream_client.monitor.breaker.state == CircuitBreaker.CLOSED
+    assert chat_response_cache.get("retele") is None
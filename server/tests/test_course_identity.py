@@ -0,0 +1,85 @@
+import psycopg2.extras
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from server.database_connection.migrations import add_course_natural_key
+from server.models.course import Course
+from server.models.student import Student
+from server.models.student_courses import StudentCourses
+from server.repositories.course_repository import CourseRepository
+from tests.conftest import make_course
+
+
+def insert_rows(session, courses):
+    rows = [CourseRepository._course_row(course) for course in courses]
+    return [session.execute(postgresql.insert(Course).values(row).returning(Course.course_id)).scalar()
+            for row in rows]
+
+
+def test_get_course_matches_null_columns(session, timetable):
+    course = make_course(timetable, timetable.professors[0])
+    CourseRepository(session).add_course(course)
+
+    found = CourseRepository(session).get_course(
+        course.name, course.professor_id, course.course_type, course.study_year_id, None, None,
+        course.day, course.start_time, course.end_time, course.room_id, None)
+    assert found.course_id == course.course_id
+
+    other_professor = CourseRepository(session).get_course(
+        course.name, timetable.professors[1].professor_id, course.course_type, course.study_year_id, None, None,
+        course.day, course.start_time, course.end_time, course.room_id, None)
+    assert other_professor is None
+
+
+def test_get_course_is_served_by_identity_index(session, timetable):
+    course = make_course(timetable, timetable.professors[0])
+    query = session.query(Course).filter(*Course.identity_filter(
+        name=course.name, professor_id=course.professor_id, course_type=course.course_type,
+        study_year_id=course.study_year_id, group_id=None, subgroup_id=None, day=course.day,
+        start_time=course.start_time, end_time=course.end_time, room_id=course.room_id, frequency=None))
+    compiled = query.statement.compile(dialect=postgresql.psycopg2.dialect())
+
+    connection = session.connection().connection.dbapi_connection
+    psycopg2.extras.register_uuid(conn_or_curs=connection)
+    # Doar indexul unic poate servi interogarea; indecsii pe o singura coloana sunt stersi in tranzactia testului
+    session.execute(text("DROP INDEX ix_courses_professor_id, ix_courses_study_year_id"))
+    session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(row[0] for row in session.connection().exec_driver_sql(
+        f"EXPLAIN {compiled}", compiled.params))
+    assert "uq_courses_identity" in plan
+
+
+def test_migration_merges_only_identical_courses(session, timetable, caplog):
+    first, second, _ = timetable.professors
+    session.execute(text("DROP INDEX uq_courses_identity"))
+    kept_id, duplicate_id, co_taught_id = sorted(insert_rows(session, [
+        make_course(timetable, first), make_course(timetable, first)]))[:2] + insert_rows(
+        session, [make_course(timetable, second)])
+
+    student = Student("Ana", "Pop", "ana.pop@stud.ubbcluj.ro", "parola", timetable.subgroup.subgroup_id)
+    session.add(student)
+    session.flush()
+    session.add(StudentCourses(student_id=student.student_id, course_id=duplicate_id))
+    session.flush()
+
+    add_course_natural_key(session.connection())
+
+    remaining = {row[0] for row in session.execute(text("SELECT course_id FROM courses"))}
+    assert remaining == {kept_id, co_taught_id}
+    selections = [row[0] for row in session.execute(
+        text("SELECT course_id FROM student_courses WHERE student_id = :id"), {"id": student.student_id})]
+    assert selections == [kept_id]
+    assert str(duplicate_id) in caplog.text
+    assert str(co_taught_id) not in caplog.text
+
+
+def test_migration_creates_identity_index_with_professor(session, timetable):
+    session.execute(text("DROP INDEX uq_courses_identity"))
+
+    add_course_natural_key(session.connection())
+
+    indexes = {row[0] for row in session.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'courses'"))}
+    assert "uq_courses_identity" in indexes
+    first, second, _ = timetable.professors
+    insert_rows(session, [make_course(timetable, first), make_course(timetable, second)])
+    assert session.execute(text("SELECT count(*) FROM courses")).scalar() == 2
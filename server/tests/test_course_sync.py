@@ -0,0 +1,81 @@
+from server.models.course import Course
+from server.repositories.course_repository import CourseRepository
+from server.scraper.lookup_cache import LookupCache
+from tests.conftest import make_course
+
+
+def professors_by_course(session, timetable) -> dict:
+    rows = session.query(Course.course_id, Course.professor_id).filter(
+        Course.study_year_id == timetable.study_year.study_year_id)
+    return {course_id: professor_id for course_id, professor_id in rows}
+
+
+def sync(session, timetable, courses) -> dict:
+    return CourseRepository(session).sync_courses(courses, [timetable.study_year.study_year_id])
+
+
+def test_full_refresh_keeps_co_taught_slot(session, timetable):
+    first, second, _ = timetable.professors
+    result = CourseRepository(session).add_courses([
+        make_course(timetable, first), make_course(timetable, second), make_course(timetable, first)])
+    assert result == {"inserted": 2, "duplicates": 1}
+
+
+def test_lookup_cache_tells_co_taught_courses_apart(timetable):
+    first, second, _ = timetable.professors
+    cache = LookupCache()
+    assert not cache.is_known_course(make_course(timetable, first).identity_key())
+    assert not cache.is_known_course(make_course(timetable, second).identity_key())
+    assert cache.is_known_course(make_course(timetable, first).identity_key())
+
+
+def test_sync_updates_professor_in_place(session, timetable):
+    first, second, _ = timetable.professors
+    CourseRepository(session).add_courses([make_course(timetable, first)])
+    (course_id,) = professors_by_course(session, timetable)
+
+    result = sync(session, timetable, [make_course(timetable, second)])
+
+    assert result == {"inserted": 0, "updated": 1, "deleted": 0, "unchanged": 0}
+    assert professors_by_course(session, timetable) == {course_id: second.professor_id}
+
+
+def test_sync_replaces_one_professor_of_co_taught_slot(session, timetable):
+    first, second, third = timetable.professors
+    CourseRepository(session).add_courses([make_course(timetable, first), make_course(timetable, second)])
+    before = {professor_id: course_id for course_id, professor_id in professors_by_course(session, timetable).items()}
+
+    result = sync(session, timetable, [make_course(timetable, second), make_course(timetable, third)])
+
+    assert result == {"inserted": 0, "updated": 1, "deleted": 0, "unchanged": 1}
+    assert professors_by_course(session, timetable) == {
+        before[first.professor_id]: third.professor_id, before[second.professor_id]: second.professor_id}
+
+
+def test_sync_adds_and_removes_co_teachers(session, timetable):
+    first, second, _ = timetable.professors
+    CourseRepository(session).add_courses([make_course(timetable, first)])
+
+    assert sync(session, timetable, [make_course(timetable, first), make_course(timetable, second)]) == \
+        {"inserted": 1, "updated": 0, "deleted": 0, "unchanged": 1}
+    assert sync(session, timetable, [make_course(timetable, second)]) == \
+        {"inserted": 0, "updated": 0, "deleted": 1, "unchanged": 1}
+    assert set(professors_by_course(session, timetable).values()) == {second.professor_id}
+
+
+def test_incremental_sync_covers_every_known_study_year(session, timetable):
+    from server.repositories.study_year_repository import StudyYearRepository
+    from server.scraper.course_scrapper import CourseScrapper
+
+    first, second, _ = timetable.professors
+    unchanged_year = StudyYearRepository(session).add_study_year(2, timetable.study_year.specialization)
+    CourseRepository(session).add_courses([
+        make_course(timetable, first), make_course(timetable, second, study_year_id=unchanged_year.study_year_id)])
+
+    scraper = CourseScrapper(session, incremental=True)
+    scraper.skipped_study_year_ids = {unchanged_year.study_year_id}
+    result = scraper.sync_scraped_courses()
+
+    assert result == {"inserted": 0, "updated": 0, "deleted": 1, "unchanged": 0}
+    assert professors_by_course(session, timetable) == {}
+    assert session.query(Course).filter(Course.study_year_id == unchanged_year.study_year_id).count() == 1
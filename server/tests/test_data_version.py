@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from server.common import data_version
+from server.common.data_version import bump_data_version, configure_data_version, get_data_version
+
+
+@pytest.fixture
+def shared_version(engine):
+    configure_data_version(engine, ttl=0)
+    yield engine
+    configure_data_version(None)
+
+
+def test_version_bumped_by_another_process_is_seen(shared_version):
+    before = get_data_version()
+    # Alt worker: alta conexiune, aceeasi tabela data_version
+    with shared_version.begin() as connection:
+        bumped = bump_data_version(connection)
+
+    assert bumped == str(int(before) + 1)
+    assert get_data_version() == bumped
+
+
+def test_rolled_back_bump_keeps_version(shared_version):
+    before = get_data_version()
+    with shared_version.connect() as connection:
+        transaction = connection.begin()
+        bump_data_version(connection)
+        transaction.rollback()
+
+    assert get_data_version() == before
+
+
+def test_listeners_are_notified_when_the_shared_version_changes(shared_version, monkeypatch):
+    seen = []
+    monkeypatch.setattr(data_version, "_listeners", [seen.append])
+    get_data_version()
+    with shared_version.begin() as connection:
+        bumped = bump_data_version(connection)
+
+    get_data_version()
+
+    assert seen == [bumped]
+
+
+def test_cached_version_is_reused_within_ttl(shared_version):
+    configure_data_version(shared_version, ttl=60)
+    before = get_data_version()
+    with shared_version.begin() as connection:
+        bump_data_version(connection)
+    # bump_data_version invalideaza doar cache-ul procesului care a scris; alt proces il pastreaza pana la TTL
+    data_version._checked_at = time.monotonic()
+
+    assert get_data_version() == before
@@ -0,0 +1,37 @@
+from flask import Flask
+from sqlalchemy import text
+
+from server.database_connection.db_connection import create_db_engine
+from server.routes.database_routes import register_routes_database
+
+
+def statement_timeout(engine) -> str:
+    with engine.connect() as connection:
+        return connection.execute(text("SHOW statement_timeout")).scalar_one()
+
+
+def test_statement_timeout_is_set_per_engine(engine):
+    app_engine = create_db_engine(engine.url, statement_timeout=60000)
+    scraper_engine = create_db_engine(engine.url, statement_timeout=0)
+    try:
+        assert statement_timeout(app_engine) == "1min"
+        assert statement_timeout(scraper_engine) == "0"
+    finally:
+        app_engine.dispose()
+        scraper_engine.dispose()
+
+
+def test_db_metrics_route_is_bound_only_when_enabled(engine):
+    disabled_app = Flask(__name__)
+    register_routes_database(disabled_app, engine, enabled=False)
+    assert disabled_app.test_client().get("/db/metrics").status_code == 404
+
+    app_engine = create_db_engine(engine.url)
+    try:
+        enabled_app = Flask(__name__)
+        register_routes_database(enabled_app, app_engine, enabled=True)
+        response = enabled_app.test_client().get("/db/metrics")
+        assert response.status_code == 200
+        assert "pool" in response.get_json()["data"]
+    finally:
+        app_engine.dispose()
@@ -0,0 +1,74 @@
+from sqlalchemy.orm import sessionmaker
+
+from server.benchmarks.scraper_benchmark import start_fixture_server
+from server.common.common_constants import ROOMS_MAPS_FILE
+from server.common.data_version import SELECT_VERSION
+from server.scraper import scrapper_manager
+from server.scraper.page_cache import PageCache
+
+
+def site(tmp_path):
+    pages = tmp_path / "site"
+    pages.mkdir()
+    (pages / "index.html").write_text("<table></table>", encoding="utf-8")
+    rooms_file = tmp_path / "RoomsMaps.xlsx"
+    rooms_file.write_bytes(b"C310;https://maps")
+    return pages, rooms_file
+
+
+def preflight(cache_dir, url, rooms_file) -> bool:
+    page_cache = PageCache(str(cache_dir))
+    if not page_cache.entries:
+        page_cache.fetch(url)
+    unchanged = page_cache.all_unchanged(files=[str(rooms_file)])
+    page_cache.commit()
+    return unchanged
+
+
+def test_preflight_tracks_pages_and_rooms_file(tmp_path):
+    pages, rooms_file = site(tmp_path)
+    server = start_fixture_server(str(pages))
+    url = f"http://127.0.0.1:{server.server_port}/index.html"
+    try:
+        assert preflight(tmp_path / "cache", url, rooms_file) is False
+        assert preflight(tmp_path / "cache", url, rooms_file) is True
+
+        rooms_file.write_bytes(b"C310;https://maps/nou")
+        assert preflight(tmp_path / "cache", url, rooms_file) is False
+        assert preflight(tmp_path / "cache", url, rooms_file) is True
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_preflight_failures_count_as_changed(tmp_path):
+    pages, rooms_file = site(tmp_path)
+    server = start_fixture_server(str(pages))
+    url = f"http://127.0.0.1:{server.server_port}/index.html"
+    preflight(tmp_path / "cache", url, rooms_file)
+    server.shutdown()
+    server.server_close()
+
+    assert PageCache(str(tmp_path / "cache")).all_unchanged(files=[str(rooms_file)]) is False
+    assert PageCache(str(tmp_path / "cache")).all_unchanged(files=[str(tmp_path / "lipsa.xlsx")]) is False
+
+
+def test_unchanged_sources_still_reset_the_semester(engine, monkeypatch):
+    checked_files = []
+
+    class UnchangedPageCache:
+        def all_unchanged(self, files=()):
+            checked_files.append(list(files))
+            return True
+
+    monkeypatch.setattr(scrapper_manager, "PageCache", UnchangedPageCache)
+    with engine.connect() as connection:
+        before = connection.execute(SELECT_VERSION).scalar_one()
+
+    result = scrapper_manager.ScrapperManager(sessionmaker(bind=engine))._full_semester_update()
+
+    assert result["status"] == "unchanged"
+    assert "reset" in result["stages"]
+    assert checked_files == [[ROOMS_MAPS_FILE]]
+    with engine.connect() as connection:
+        assert connection.execute(SELECT_VERSION).scalar_one() == before + 1
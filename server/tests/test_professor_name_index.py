@@ -0,0 +1,42 @@
+from server.repositories.professor_repository import ProfessorRepository
+from server.scraper.professor_name_index import ProfessorNameIndex
+
+LOADED = [
+    ("Łukasz", "BRZĘCZYSZCZYKIEWICZ"),
+    ("Søren", "KIERKEGAARD"),
+    ("Ægidius", "STRAß"),
+    ("Ştefan", "ŞERBAN"),
+    ("Ana_Maria", "POPESCU"),
+]
+# Adaugati dupa incarcarea indexului, ca in scrapper-e (ProfessorNameIndex.add)
+ADDED = [
+    ("Đorđe", "ĐOKOVIĆ"),
+    ("100%", "PROCENT"),
+    ("Ion", "ionescu"),
+]
+
+QUERIES = [
+    ("Lukasz", "BRZECZYSZCZYKIEWICZ"), ("łuk", "BRZĘCZYSZCZYKIEWICZ"), ("LUKASZ", "BRZECZYSZCZYKIEWICZ"),
+    ("Lukasz", "Brzeczyszczykiewicz"), ("Soren", "KIERKEGAARD"), ("SØ", "KIERKEGAARD"),
+    ("Aegidius", "STRASS"), ("ae", "STRAß"), ("Ægidius", "STRAB"), ("Stefan", "SERBAN"), ("ştefan", "ŞERBAN"),
+    ("Ana_", "POPESCU"), ("A_a", "POPESCU"), ("Ana\\_M", "POPESCU"), ("Ana\\%", "POPESCU"),
+    ("%Maria", "POPESCU"), ("Maria", "POPESCU"), (None, "POPESCU"),
+    ("Dorde", "DOKOVIC"), ("đor", "ĐOKOVIĆ"), ("1__\\%", "PROCENT"), ("10%", "PROCENT"), ("", "PROCENT"),
+    ("Ion", "IONESCU"), ("ION", "ionescu"), ("Ion", None),
+]
+
+
+def test_index_matches_the_database_query(session):
+    repository = ProfessorRepository(session)
+    for first_name, last_name in LOADED:
+        repository.add_professor(first_name, last_name, "Lect.")
+    index = ProfessorNameIndex.load(repository)
+    for first_name, last_name in ADDED:
+        professor = repository.add_professor(first_name, last_name, "Lect.")
+        index.add(first_name, last_name, professor.professor_id)
+
+    assert len(index) == len(LOADED) + len(ADDED)
+    for first_name, last_name in QUERIES:
+        professor = repository.get_professor_by_name(first_name, last_name)
+        expected = professor.professor_id if professor else None
+        assert index.get(first_name, last_name) == expected, (first_name, last_name)
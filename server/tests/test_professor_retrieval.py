@@ -0,0 +1,103 @@
+import pytest
+
+from server.routes import chatbot_routes
+from server.services.chat_completion_client import ChatCompletionClient
+from server.services.chat_response_cache import chat_response_cache
+from server.services.professor_corpus_service import ProfessorCorpus
+from server.services.professor_retrieval import ProfessorIndex, tokenize
+
+PROFESSORS = [
+    ("Andrei", "MARCUS", ["Retele de calculatoare", "Securitate"], ["Retele de calculatoare"]),
+    ("Ioana", "POP", ["Rețele neuronale", "Învățare automată"], ["Inteligenta artificiala"]),
+    ("Camelia", "ŞERBAN", ["Baze de date"], ["Baze de date", "Inginerie software"]),
+    ("Istvan", "CZIBULA", ["Sisteme de operare"], ["Arhitectura sistemelor de calcul"]),
+    ("Radu", "MUNTEANU", ["Retele wireless"], ["Retele de calculatoare"]),
+    ("Anca", "BOTIS", ["Geometrie"], ["Algebra"]),
+]
+
+
+def build_index():
+    entries = [ProfessorCorpus.build_entry(str(position), *professor) for position, professor in enumerate(PROFESSORS)]
+    return ProfessorIndex(entries)
+
+
+def names(entries) -> list[str]:
+    return [entry.name for entry in entries]
+
+
+def test_tokenize_drops_diacritics_stop_words_and_inflection():
+    assert tokenize("Vreau o lucrare despre Rețele neuronale și învățare automată") == \
+        ["retele", "neuron", "invata", "automa"]
+    assert tokenize("retelelor") == tokenize("Rețele") == ["retele"]
+    assert tokenize("") == tokenize(None) == []
+
+
+def test_search_matches_without_diacritics():
+    assert names(build_index().search("invatare automata", 5)) == ["Ioana POP"]
+
+
+def test_search_matches_inflected_forms():
+    assert names(build_index().search("bazelor de date", 5)) == ["Camelia ŞERBAN"]
+
+
+def test_search_without_common_terms_returns_nothing():
+    assert build_index().search("astronomie si muzica", 5) == []
+
+
+def test_search_keeps_only_top_k_by_relevance():
+    index = build_index()
+    everyone = index.search("retele de calculatoare", 10)
+
+    assert names(everyone)[0] == "Andrei MARCUS"
+    # "calculatoare" si "calcul" au aceeasi radacina de STEM_LENGTH caractere
+    assert set(names(everyone)) == {"Andrei MARCUS", "Radu MUNTEANU", "Ioana POP", "Istvan CZIBULA"}
+    assert index.search("retele de calculatoare", 2) == everyone[:2]
+
+
+@pytest.fixture
+def chat(chat_app, chat_stub, session, monkeypatch):
+    from server.repositories.domain_repository import DomainRepository
+    from server.repositories.professor_domains_repository import ProfessorDomainsRepository
+    from server.repositories.professor_repository import ProfessorRepository
+
+    for first_name, last_name, domains, _ in PROFESSORS:
+        professor = ProfessorRepository(session).add_professor(first_name, last_name, "Lect.")
+        for domain in domains:
+            domain_id = DomainRepository(session).add_domain(domain).domain_id
+            ProfessorDomainsRepository(session).add(professor.professor_id, domain_id)
+
+    chat_app.Session.configure(bind=session.connection())
+    monkeypatch.setattr(chatbot_routes, "professor_corpus", ProfessorCorpus())
+    monkeypatch.setattr(chatbot_routes, "chat_client", ChatCompletionClient(chat_stub.url, "test", "stub"))
+    chat_response_cache.clear()
+    return chat_app.test_client()
+
+
+def prompt_professors(payload) -> list[str]:
+    prompt = payload["messages"][-1]["content"]
+    listing = prompt.split("Profesori disponibili:", 1)[1].split("Mesajul studentului:", 1)[0]
+    return [line.split("|")[0].strip() for line in listing.strip().splitlines() if "|" in line]
+
+
+def test_chat_sends_only_top_k_professors(chat, chat_stub, monkeypatch):
+    monkeypatch.setattr(chatbot_routes, "CHATBOT_TOP_K", 2)
+
+    response = chat.post("/chat", json={"message": "Caut o tema despre retele de calculatoare"})
+
+    assert response.get_json()["status"] == 200
+    (payload,) = chat_stub.received
+    assert prompt_professors(payload) == ["Andrei MARCUS", "Radu MUNTEANU"]
+    assert response.get_json()["data"]["reply"].startswith("Andrei MARCUS")
+
+
+def test_chat_without_matches_sends_no_professor_list(chat, chat_stub, monkeypatch):
+    monkeypatch.setattr(chatbot_routes, "CHATBOT_TOP_K", 2)
+
+    response = chat.post("/chat", json={"message": "astronomie si muzica"})
+
+    assert response.get_json()["status"] == 200
+    (payload,) = chat_stub.received
+    prompt = payload["messages"][-1]["content"]
+    assert "Profesori disponibili:" not in prompt
+    assert not any(last_name in prompt for _, last_name, _, _ in PROFESSORS)
+    assert "astronomie si muzica" in prompt
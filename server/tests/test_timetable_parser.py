@@ -0,0 +1,39 @@
+import pytest
+
+from server.benchmarks.parser_benchmark import DEFAULT_FIXTURES_DIR, load_pages
+from server.scraper.course_scrapper import CourseScrapper
+from server.scraper.timetable_parser import LxmlTimetableParser, SoupTimetableParser
+
+pytest.importorskip("lxml")
+
+PAGES = load_pages(DEFAULT_FIXTURES_DIR)
+
+
+@pytest.mark.parametrize("page_name", sorted(PAGES))
+def test_lxml_parser_matches_html_parser(page_name):
+    html = PAGES[page_name]
+    expected = CourseScrapper(None, parser=SoupTimetableParser()).parse_tables(html, page_name)
+    actual = CourseScrapper(None, parser=LxmlTimetableParser()).parse_tables(html, page_name)
+    assert actual == expected
+
+
+def test_page_with_xml_encoding_declaration_is_parsed():
+    html = PAGES["IE2.html"]
+    assert html.startswith('<?xml version="1.0" encoding="utf-8"?>')
+
+    has_tables, groups = LxmlTimetableParser().extract(html)
+
+    assert has_tables
+    assert [header for header, _ in groups] == ["Grupa 921", "Grupa 922", "Grupa 923"]
+    assert LxmlTimetableParser().extract(html.encode("utf-8")) == (has_tables, groups)
+
+
+def test_group_rows_keep_diacritics():
+    groups = dict(CourseScrapper(None, parser=LxmlTimetableParser()).parse_tables(PAGES["IE2.html"], "IE2.html"))
+    professors = {row["Cadrul didactic"] for _, row in groups["921"]}
+    assert any("Ş" in name or "Ţ" in name or "Ă" in name for name in professors)
+
+
+def test_page_without_tables_is_skipped():
+    for parser in (SoupTimetableParser(), LxmlTimetableParser()):
+        assert CourseScrapper(None, parser=parser).parse_tables(PAGES["unpublished.html"], "unpublished.html") == []